@@ -2,8 +2,11 @@
 Advanced usage example for the IMAP Client Library
 """
 import logging
+import re
 from datetime import datetime
-from imap_client_lib import ImapClient, Account, EmailMessage
+from imap_client_lib import (
+    ImapClient, Account, EmailMessage, EmailHeader, attachment_hint_criteria,
+)
 
 # Set up logging
 logging.basicConfig(
@@ -11,6 +14,29 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# Keyword matchers are compiled once at import; each subject is then
+# checked with a single regex scan instead of one substring search per
+# keyword.
+INVOICE_KEYWORDS = re.compile(
+    '|'.join(map(re.escape, ['invoice', 'bill', 'payment', 'receipt']))
+)
+REPORT_KEYWORDS = re.compile('report')
+
+
+def is_invoice(header: EmailHeader) -> bool:
+    """
+    Cheap pre-filter on the envelope; bodies of other messages are never
+    downloaded.
+    """
+    return bool(INVOICE_KEYWORDS.search(header.subject_lower))
+
+
+def is_report(header: EmailHeader) -> bool:
+    """
+    Cheap pre-filter on the envelope for report messages.
+    """
+    return bool(REPORT_KEYWORDS.search(header.subject_lower))
+
 
 def invoice_processor(email_message: EmailMessage) -> bool:
     """
@@ -19,10 +45,7 @@ def invoice_processor(email_message: EmailMessage) -> bool:
     Returns True if the email was processed, False otherwise.
     """
     # Check if email might contain an invoice
-    keywords = ['invoice', 'bill', 'payment', 'receipt']
-    subject_lower = email_message.subject.lower()
-
-    if not any(keyword in subject_lower for keyword in keywords):
+    if not INVOICE_KEYWORDS.search(email_message.subject_lower):
         return False
 
     print(f"\nProcessing potential invoice from: {email_message.from_address}")
@@ -42,7 +65,7 @@ def report_processor(email_message: EmailMessage) -> bool:
     """
     Process emails containing reports.
     """
-    if 'report' not in email_message.subject.lower():
+    if not REPORT_KEYWORDS.search(email_message.subject_lower):
         return False
 
     print(f"\nProcessing report from: {email_message.from_address}")
@@ -69,82 +92,85 @@ def main():
         use_ssl=True
     )
 
-    # Create client with custom logger
+    # Create client with custom logger. The with-block keeps a single
+    # session open for every call below and disconnects on exit.
     logger = logging.getLogger('imap_processor')
-    client = ImapClient(account, logger=logger)
-
-    if not client.connect():
-        print("Failed to connect to IMAP server")
-        return
-
-    try:
-        # Example 1: List all folders
-        print("Available folders:")
-        folders = client.list_folders()
-        for folder in folders:
-            print(f"  - {folder}")
-        print()
-
-        # Example 2: Search for specific messages
-        print("Searching for messages from the last 7 days...")
-        # Note: IMAP search doesn't support relative dates directly
-        # You would need to use SINCE with a specific date
-        from_date = datetime(2024, 1, 1)  # Adjust as needed
-        messages = client.get_messages(
-            ['SINCE', from_date.strftime('%d-%b-%Y')],
-            'INBOX'
-        )
-        print(f"Found {len(messages)} messages since {from_date}")
-
-        # Example 3: Process invoices with callback
-        print("\nProcessing invoices...")
-        invoice_count = client.process_messages_with_callback(
-            callback=invoice_processor,
-            search_criteria=['SUBJECT', 'invoice', 'UNSEEN'],
-            mark_as_read=True,
-            move_to_folder='Invoices'
-        )
-        print(f"Processed {invoice_count} invoices")
-
-        # Example 4: Process reports with callback
-        print("\nProcessing reports...")
-        report_count = client.process_messages_with_callback(
-            callback=report_processor,
-            search_criteria=['SUBJECT', 'report', 'UNSEEN'],
-            mark_as_read=True,
-            move_to_folder='Reports'
-        )
-        print(f"Processed {report_count} reports")
-
-        # Example 5: Complex search with multiple criteria
-        print("\nSearching for important unread messages...")
-        messages = client.get_messages([
-            'OR',
-            'FROM', 'boss@example.com',
-            'SUBJECT', 'urgent',
-            'UNSEEN'
-        ])
-
-        for message_id, email_message in messages:
-            print("\nImportant message:")
-            print(f"  From: {email_message.from_address}")
-            print(f"  Subject: {email_message.subject}")
-
-            # Save all attachments from important messages
-            for attachment in email_message.attachments:
-                saved_path = client.save_attachment(
-                    attachment,
-                    f"important_attachments/{email_message.from_address.split('@')[0]}"
-                )
-                if saved_path:
-                    print(f"  Saved attachment: {saved_path}")
-
-    except Exception as e:
-        logger.error(f"Error during processing: {e}")
-
-    finally:
-        client.disconnect()
-        print("\nProcessing complete!")
+    with ImapClient(account, logger=logger) as client:
+        if not client.client:
+            print("Failed to connect to IMAP server")
+            return
+
+        try:
+            # Example 1: List all folders
+            print("Available folders:")
+            folders = client.list_folders()
+            for folder in folders:
+                print(f"  - {folder}")
+            print()
+
+            # Example 2: Search for specific messages
+            print("Searching for messages from the last 7 days...")
+            # Note: IMAP search doesn't support relative dates directly
+            # You would need to use SINCE with a specific date
+            from_date = datetime(2024, 1, 1)  # Adjust as needed
+            messages = client.get_messages(
+                ['SINCE', from_date.strftime('%d-%b-%Y')],
+                'INBOX'
+            )
+            print(f"Found {len(messages)} messages since {from_date}")
+
+            # Example 3: Process invoices with callback. The server only
+            # returns unread invoice messages that mention a .pdf part.
+            print("\nProcessing invoices...")
+            invoice_count = client.process_messages_with_callback(
+                callback=invoice_processor,
+                search_criteria=attachment_hint_criteria(
+                    'invoice', ['pdf']
+                ),
+                mark_as_read=True,
+                move_to_folder='Invoices',
+                header_filter=is_invoice,
+            )
+            print(f"Processed {invoice_count} invoices")
+
+            # Example 4: Process reports with callback
+            print("\nProcessing reports...")
+            report_count = client.process_messages_with_callback(
+                callback=report_processor,
+                search_criteria=['SUBJECT', 'report', 'UNSEEN'],
+                mark_as_read=True,
+                move_to_folder='Reports',
+                header_filter=is_report,
+            )
+            print(f"Processed {report_count} reports")
+
+            # Example 5: Complex search with multiple criteria
+            print("\nSearching for important unread messages...")
+            messages = client.get_messages([
+                'OR',
+                'FROM', 'boss@example.com',
+                'SUBJECT', 'urgent',
+                'UNSEEN'
+            ])
+
+            for message_id, email_message in messages:
+                print("\nImportant message:")
+                print(f"  From: {email_message.from_address}")
+                print(f"  Subject: {email_message.subject}")
+
+                # Save all attachments from important messages
+                for attachment in email_message.attachments:
+                    saved_path = client.save_attachment(
+                        attachment,
+                        f"important_attachments/{email_message.from_address.split('@')[0]}"
+                    )
+                    if saved_path:
+                        print(f"  Saved attachment: {saved_path}")
+
+        except Exception as e:
+            logger.error(f"Error during processing: {e}")
+
+    print("\nProcessing complete!")
 
 
 if __name__ == "__main__":
@@ -65,7 +65,7 @@ def main():
                             print(f"     Saved to: {saved_path}")
 
             # Example: Mark specific messages as read based on criteria
-            if "important" in email_message.subject.lower():
+            if "important" in email_message.subject_lower:
                 if client.mark_as_read(message_id):
                     print("\nMarked as read (contains 'important' in subject)")
 
@@ -4,7 +4,21 @@ A simple and reusable IMAP client library for Python.
 
 from .client import ImapClient
 from .account import Account
-from .email_message import EmailMessage, Attachment
+from .email_message import EmailMessage, EmailHeader, Attachment
+from .search_mixin import attachment_hint_criteria
+from .pool import ImapConnectionPool
 
 __version__ = "0.1.0"
-__all__ = ["ImapClient", "Account", "EmailMessage", "Attachment"]
+__all__ = [
+    "ImapClient", "Account", "EmailMessage", "EmailHeader", "Attachment",
+    "attachment_hint_criteria", "AsyncImapClient", "ImapConnectionPool",
+]
+
+
+def __getattr__(name):
+    # AsyncImapClient pulls in asyncio, so it is only imported when
+    # used; sync-only callers skip that cost at startup.
+    if name == "AsyncImapClient":
+        from .async_client import AsyncImapClient
+        return AsyncImapClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
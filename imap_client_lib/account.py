@@ -8,6 +8,10 @@ from dataclasses import dataclass
 class Account:
     """
     Represents an IMAP email account configuration.
+
+    ``max_connections`` caps the number of simultaneous sessions
+    the library opens for this account; providers typically allow
+    10-16 per account.
     """
     name: str
     server: str
@@ -15,6 +19,7 @@ class Account:
     password: str
     port: int = 993
     use_ssl: bool = True
+    max_connections: int = 10
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Account':
@@ -33,5 +38,6 @@ class Account:
             username=data.get('username', ''),
             password=data.get('password', ''),
             port=data.get('port', 993),
-            use_ssl=data.get('use_ssl', True)
+            use_ssl=data.get('use_ssl', True),
+            max_connections=data.get('max_connections', 10)
         )
@@ -0,0 +1,432 @@
+"""
+Asynchronous IMAP client built on aioimaplib.
+
+aioimaplib is an optional dependency; install it with
+``pip install imap-client-lib[async]``.
+"""
+import asyncio
+import inspect
+import logging
+import re
+from typing import (
+    AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple,
+    Union,
+)
+
+from .account import Account
+from .email_message import EmailMessage
+from .async_local_mixin import AsyncLocalMixin
+from .async_ops_mixin import AsyncMessageOpsMixin, _uid_set
+from .message_ops_mixin import _batched, _extract_keywords
+
+_FLAGS_RE = re.compile(rb'FLAGS \(([^)]*)\)')
+_UID_RE = re.compile(rb'UID (\d+)')
+
+MessageCallback = Callable[
+    [EmailMessage], Union[bool, Awaitable[bool]]
+]
+
+
+def _import_aioimaplib():
+    """Import aioimaplib, raising a helpful error if missing."""
+    try:
+        import aioimaplib
+    except ImportError as e:
+        raise ImportError(
+            "AsyncImapClient requires aioimaplib; install it with "
+            "'pip install imap-client-lib[async]'"
+        ) from e
+    return aioimaplib
+
+
+def _parse_fetch_lines(lines: list) -> Dict[int, Tuple[bytes, tuple]]:
+    """Split a multi-message FETCH response into per-UID entries.
+
+    Each message arrives as a ``* n FETCH (UID u FLAGS (...)
+    BODY[] {size}`` line followed by the literal as a bytearray.
+
+    Args:
+        lines: Response.lines from an aioimaplib UID FETCH
+
+    Returns:
+        Dict mapping UID to (message bytes, flags tuple)
+    """
+    messages = {}
+    uid = None
+    flags: tuple = ()
+    for line in lines:
+        if isinstance(line, bytearray):
+            if uid is not None:
+                messages[uid] = (bytes(line), flags)
+                uid = None
+        elif isinstance(line, bytes) and b'FETCH' in line:
+            match = _UID_RE.search(line)
+            uid = int(match.group(1)) if match else None
+            match = _FLAGS_RE.search(line)
+            flags = tuple(match.group(1).split()) if match else ()
+    return messages
+
+
+class AsyncImapClient(AsyncMessageOpsMixin, AsyncLocalMixin):
+    """
+    Asynchronous counterpart of ImapClient for batch workflows.
+
+    Message bodies are fetched one batch at a time and handed to
+    the caller as soon as each batch arrives, with the next batch
+    already requested, so parsing or callback work on one batch
+    overlaps the download of the next.
+    """
+
+    def __init__(
+        self,
+        account: Account,
+        logger: Optional[logging.Logger] = None,
+        fetch_batch_size: int = 10,
+    ):
+        """
+        Initialize the async IMAP client.
+
+        Args:
+            account: The account configuration to use
+            logger: Optional logger for debug information
+            fetch_batch_size: Messages per UID FETCH; smaller
+                batches reach the callback sooner and larger ones
+                save round trips
+        """
+        self.account = account
+        self.client = None
+        self.logger = logger or logging.getLogger(__name__)
+        self.fetch_batch_size = fetch_batch_size
+        self._local = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
+        return False
+
+    async def connect(self) -> bool:
+        """
+        Connect to the IMAP server.
+
+        Returns:
+            bool: True if connection successful, False otherwise
+        """
+        try:
+            aioimaplib = _import_aioimaplib()
+            factory = (
+                aioimaplib.IMAP4_SSL if self.account.use_ssl
+                else aioimaplib.IMAP4
+            )
+            session = factory(
+                host=self.account.server,
+                port=self.account.port,
+                timeout=300,
+            )
+            await session.wait_hello_from_server()
+            response = await session.login(
+                self.account.username,
+                self.account.password,
+            )
+            if response.result != 'OK':
+                raise ConnectionError(f"login failed: {response.lines}")
+            self.client = session
+            self.logger.info(
+                f"Connected to {self.account.server}"
+            )
+            return True
+        except Exception as e:
+            self.logger.error(
+                f"Failed to connect to "
+                f"{self.account.server}: {e}"
+            )
+            return False
+
+    async def disconnect(self):
+        """Disconnect from the IMAP server."""
+        if self.client:
+            try:
+                await self.client.logout()
+                self.logger.info(
+                    f"Disconnected from {self.account.server}"
+                )
+            except Exception as e:
+                self.logger.error(f"Error during disconnect: {e}")
+            finally:
+                self.client = None
+
+    async def search(
+        self,
+        search_criteria: List[str] = None,
+        folder: str = 'INBOX',
+        limit: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Select a folder and search it for message UIDs.
+
+        Args:
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+            limit: Maximum number of UIDs to return
+
+        Returns:
+            UIDs sorted newest first, empty on error
+        """
+        if not self.client:
+            self.logger.error("Not connected to IMAP server")
+            return []
+
+        try:
+            await self.client.select(folder)
+            response = await self.client.uid_search(
+                *(search_criteria or ['ALL'])
+            )
+            if response.result != 'OK':
+                raise RuntimeError(response.lines)
+            uids = [
+                int(uid) for uid in response.lines[0].split()
+            ] if response.lines else []
+            uids.sort(reverse=True)
+            if limit:
+                uids = uids[:limit]
+            self.logger.info(
+                f"Found {len(uids)} messages in {folder}"
+            )
+            return uids
+        except Exception as e:
+            self.logger.error(f"Error searching {folder}: {e}")
+            return []
+
+    async def fetch_message(
+        self,
+        message_id: int,
+        include_attachments: bool = True,
+    ) -> Optional[EmailMessage]:
+        """
+        Fetch and parse one message from the selected folder.
+
+        Args:
+            message_id: The UID of the message
+            include_attachments: Whether to include attachments
+
+        Returns:
+            EmailMessage, or None if not found or on error
+        """
+        messages = await self.fetch_messages(
+            [message_id], include_attachments,
+        )
+        if not messages:
+            self.logger.info(f"Message {message_id} not found")
+            return None
+        return messages[0][1]
+
+    async def fetch_messages(
+        self,
+        message_ids: List[int],
+        include_attachments: bool = True,
+    ) -> List[Tuple[int, EmailMessage]]:
+        """
+        Fetch and parse several messages with one UID FETCH.
+
+        Args:
+            message_ids: UIDs of the messages
+            include_attachments: Whether to include attachments
+
+        Returns:
+            List of (message_id, EmailMessage) tuples in the
+            order given; missing or broken messages are skipped
+        """
+        try:
+            response = await self.client.uid(
+                'fetch', _uid_set(message_ids),
+                '(UID FLAGS BODY.PEEK[])',
+            )
+            if response.result != 'OK':
+                raise RuntimeError(response.lines)
+            raw = _parse_fetch_lines(response.lines)
+        except Exception as e:
+            self.logger.error(
+                f"Error fetching {len(message_ids)} messages: {e}"
+            )
+            return []
+
+        messages = []
+        for message_id in message_ids:
+            if message_id not in raw:
+                continue
+            body, flags = raw[message_id]
+            try:
+                messages.append((message_id, EmailMessage.from_bytes(
+                    str(message_id), body, self.logger,
+                    include_attachments,
+                    keywords=_extract_keywords(flags),
+                )))
+            except Exception as e:
+                self.logger.error(
+                    f"Error parsing message {message_id}: {e}"
+                )
+        return messages
+
+    async def iter_messages(
+        self,
+        search_criteria: List[str] = None,
+        folder: str = 'INBOX',
+        limit: Optional[int] = None,
+        include_attachments: bool = True,
+    ) -> AsyncIterator[Tuple[int, EmailMessage]]:
+        """
+        Yield messages batch by batch, newest first.
+
+        UIDs are fetched ``fetch_batch_size`` at a time. aioimaplib
+        does not support concurrent FETCHes on one connection, so
+        only one batch is outstanding; it is requested while the
+        caller is still working on the previous one. Messages that
+        fail to fetch are logged and skipped.
+
+        Args:
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+            limit: Maximum number of messages to fetch
+            include_attachments: Whether to include attachments
+
+        Yields:
+            Tuple of (message_id, EmailMessage)
+        """
+        uids = await self.search(search_criteria, folder, limit)
+        if not uids:
+            return
+
+        batches = [
+            list(batch)
+            for batch in _batched(uids, self.fetch_batch_size)
+        ]
+        pending = asyncio.ensure_future(
+            self.fetch_messages(batches[0], include_attachments)
+        )
+        try:
+            for batch in batches[1:]:
+                messages = await pending
+                pending = asyncio.ensure_future(
+                    self.fetch_messages(batch, include_attachments)
+                )
+                for item in messages:
+                    yield item
+            for item in await pending:
+                yield item
+        finally:
+            pending.cancel()
+
+    async def get_messages(
+        self,
+        search_criteria: List[str] = None,
+        folder: str = 'INBOX',
+        limit: Optional[int] = None,
+        include_attachments: bool = True,
+    ) -> List[Tuple[int, EmailMessage]]:
+        """
+        Get messages from a folder based on search criteria.
+
+        Args:
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+            limit: Maximum number of messages to fetch
+            include_attachments: Whether to include attachments
+
+        Returns:
+            List of (message_id, EmailMessage) tuples, newest first
+        """
+        messages = [
+            item async for item in self.iter_messages(
+                search_criteria, folder, limit, include_attachments,
+            )
+        ]
+        messages.sort(key=lambda item: item[0], reverse=True)
+        return messages
+
+    async def process_messages_with_callback(
+        self,
+        callback: MessageCallback,
+        search_criteria: List[str] = None,
+        folder: str = 'INBOX',
+        mark_as_read: bool = True,
+        move_to_folder: Optional[str] = None,
+        callback_concurrency: int = 1,
+    ) -> int:
+        """
+        Process messages with a custom callback as they arrive.
+
+        Coroutine callbacks are awaited; plain callables run in
+        the default executor so they don't block further fetches.
+        Connects for the duration of the call if not connected.
+
+        Args:
+            callback: Function taking an EmailMessage,
+                returns True to continue processing
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+            mark_as_read: Mark processed messages as read
+            move_to_folder: Folder to move processed msgs
+            callback_concurrency: Callbacks allowed to run at
+                once; raise it when callbacks wait on the network,
+                e.g. by awaiting forward_email
+
+        Returns:
+            int: Number of messages processed
+        """
+        opened = False
+        if not self.client:
+            if not await self.connect():
+                return 0
+            opened = True
+
+        loop = asyncio.get_running_loop()
+        is_coroutine = inspect.iscoroutinefunction(callback)
+        semaphore = asyncio.Semaphore(max(1, callback_concurrency))
+
+        async def run(message_id: int, email_message: EmailMessage):
+            try:
+                if is_coroutine:
+                    result = await callback(email_message)
+                else:
+                    result = await loop.run_in_executor(
+                        None, callback, email_message,
+                    )
+                return message_id if result else None
+            except Exception as e:
+                self.logger.error(
+                    f"Error processing message "
+                    f"{message_id}: {e}"
+                )
+                return None
+            finally:
+                semaphore.release()
+
+        try:
+            tasks = []
+            try:
+                async for message_id, email_message in self.iter_messages(
+                    search_criteria, folder,
+                ):
+                    # Wait for a free slot before taking the next
+                    # message, so fetched messages don't pile up.
+                    await semaphore.acquire()
+                    tasks.append(asyncio.ensure_future(
+                        run(message_id, email_message)
+                    ))
+            finally:
+                results = await asyncio.gather(*tasks)
+            processed_ids = [
+                message_id for message_id in results
+                if message_id is not None
+            ]
+
+            if processed_ids and mark_as_read:
+                await self.mark_many_as_read(processed_ids)
+            if processed_ids and move_to_folder:
+                await self.move_many(processed_ids, move_to_folder)
+            return len(processed_ids)
+        finally:
+            if opened:
+                await self.disconnect()
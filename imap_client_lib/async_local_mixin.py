@@ -0,0 +1,81 @@
+"""
+Mixin running ImapClient's SMTP and disk helpers off the event loop.
+"""
+import asyncio
+import functools
+from typing import List
+
+from .email_message import Attachment, EmailMessage
+
+
+class AsyncLocalMixin:
+    """Executor-backed forwarding and saving for AsyncImapClient."""
+
+    def _local_client(self):
+        """
+        Return an unconnected ImapClient for SMTP and disk work.
+
+        Its SMTP and attachment helpers never touch the IMAP
+        session, so they are reused here and run in the default
+        executor to keep blocking I/O off the event loop.
+        """
+        if self._local is None:
+            from .client import ImapClient
+            self._local = ImapClient(self.account, self.logger)
+        return self._local
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking call in the default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(func, *args, **kwargs),
+        )
+
+    async def forward_email(
+        self,
+        email_message: EmailMessage,
+        to_addresses: List[str],
+        **kwargs,
+    ) -> bool:
+        """
+        Forward an email without blocking the event loop.
+
+        Takes the same keyword arguments as ImapClient.forward_email;
+        the SMTP exchange runs in the default executor, so forwards
+        started from concurrent callbacks overlap their network
+        round trips.
+
+        Args:
+            email_message: The message to forward
+            to_addresses: Recipient addresses
+            **kwargs: Passed on to ImapClient.forward_email
+
+        Returns:
+            bool: True if the email was forwarded
+        """
+        return await self._run_blocking(
+            self._local_client().forward_email,
+            email_message, to_addresses, **kwargs,
+        )
+
+    async def save_attachments(
+        self,
+        attachments: List[Attachment],
+        target_dir: str,
+        sanitize_filename: bool = True,
+    ) -> List[str]:
+        """
+        Save attachments to a directory without blocking the loop.
+
+        Args:
+            attachments: The attachments to save
+            target_dir: Directory to save into
+            sanitize_filename: Whether to sanitize filenames
+
+        Returns:
+            List[str]: Saved path per attachment, empty on failure
+        """
+        return await self._run_blocking(
+            self._local_client().save_attachments,
+            attachments, target_dir, sanitize_filename,
+        )
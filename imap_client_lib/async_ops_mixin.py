@@ -0,0 +1,123 @@
+"""
+Mixin providing flag and move operations for AsyncImapClient.
+"""
+from typing import List
+
+from .message_ops_mixin import _UID_CHUNK_SIZE, _batched
+
+
+def _uid_set(uids: List[int]) -> str:
+    """Format UIDs as an IMAP sequence set."""
+    return ','.join(str(uid) for uid in uids)
+
+
+def _is_trycreate(response) -> bool:
+    """Tell whether a NO response carries a [TRYCREATE] code."""
+    return any(
+        b'[TRYCREATE]' in (
+            line if isinstance(line, (bytes, bytearray))
+            else str(line).encode()
+        )
+        for line in response.lines
+    )
+
+
+class AsyncMessageOpsMixin:
+    """Batched STORE and MOVE operations for AsyncImapClient."""
+
+    async def mark_many_as_read(self, message_ids: List[int]) -> bool:
+        """
+        Mark several messages as read, one STORE per 1000 UIDs.
+
+        Args:
+            message_ids: UIDs of the messages
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not message_ids:
+            return True
+        try:
+            for chunk in _batched(message_ids, _UID_CHUNK_SIZE):
+                await self._uid_checked(
+                    'store', _uid_set(chunk), '+FLAGS', '(\\Seen)',
+                )
+            self.logger.info(
+                f"Marked {len(message_ids)} messages as read"
+            )
+            return True
+        except Exception as e:
+            self.logger.error(
+                f"Error marking {len(message_ids)} "
+                f"messages as read: {e}"
+            )
+            return False
+
+    async def move_many(self, message_ids: List[int], folder: str) -> bool:
+        """
+        Move several messages to a folder, creating it if needed.
+
+        Uses UID MOVE when the server supports it; otherwise
+        COPY, STORE \\Deleted and an expunge limited to the moved
+        UIDs where UIDPLUS allows. UIDs are sent 1000 at a time.
+
+        Args:
+            message_ids: UIDs of the messages
+            folder: The destination folder
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not message_ids:
+            return True
+        try:
+            has_move = self.client.has_capability('MOVE')
+            for chunk in _batched(message_ids, _UID_CHUNK_SIZE):
+                uid_set = _uid_set(chunk)
+                await self._transfer(
+                    'move' if has_move else 'copy', uid_set, folder,
+                )
+                if not has_move:
+                    await self._uid_checked(
+                        'store', uid_set, '+FLAGS', '(\\Deleted)',
+                    )
+                    await self._expunge_uids(uid_set)
+            self.logger.info(
+                f"Moved {len(message_ids)} messages to {folder}"
+            )
+            return True
+        except Exception as e:
+            self.logger.error(
+                f"Error moving {len(message_ids)} messages "
+                f"to {folder}: {e}"
+            )
+            return False
+
+    async def _uid_checked(self, command: str, *args: str):
+        """Run a UID command, raising unless the server says OK."""
+        response = await self.client.uid(command, *args)
+        if response.result != 'OK':
+            raise RuntimeError(response.lines)
+        return response
+
+    async def _transfer(
+        self, command: str, uid_set: str, folder: str,
+    ) -> None:
+        """COPY or MOVE a UID set, creating the folder on TRYCREATE."""
+        response = await self.client.uid(command, uid_set, folder)
+        if response.result != 'OK' and _is_trycreate(response):
+            await self.client.create(folder)
+            response = await self.client.uid(command, uid_set, folder)
+        if response.result != 'OK':
+            raise RuntimeError(response.lines)
+
+    async def _expunge_uids(self, uid_set: str) -> None:
+        """Expunge deleted messages, limited to uid_set if possible.
+
+        Without UIDPLUS (RFC 4315) a plain EXPUNGE also removes
+        any other message already flagged \\Deleted.
+        """
+        if self.client.has_capability('UIDPLUS'):
+            await self._uid_checked('expunge', uid_set)
+        else:
+            await self.client.expunge()
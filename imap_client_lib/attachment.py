@@ -0,0 +1,114 @@
+"""
+Attachment model for email attachment data.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional, Tuple
+
+# Default chunk size for streaming attachment data to disk.
+STREAM_CHUNK_SIZE = 2 * 1024 * 1024
+
+
+class _DeferredData:
+    """
+    Descriptor-typed field behind ``Attachment.data``.
+
+    Stores the bytes in ``_data`` and runs ``_loader`` on the first
+    read, so parsed attachments defer the base64 decode until
+    something uses them. Reading through ``__get__`` keeps repr,
+    eq and asdict() working on the real bytes.
+    """
+
+    def __get__(self, obj, objtype=None) -> bytes:
+        if obj is None:
+            # No class-level default: keep ``data`` a required field.
+            raise AttributeError('data')
+        loader = obj._loader
+        if loader is not None:
+            obj._data = loader() or b''
+            obj._loader = None
+        return obj._data
+
+    def __set__(self, obj, value: bytes) -> None:
+        obj._data = value
+        obj._loader = None
+
+
+@dataclass
+class Attachment:
+    """
+    Represents an email attachment.
+    """
+    filename: str
+    content_type: str
+    data: bytes = _DeferredData()
+    content_id: Optional[str] = None
+    is_inline: bool = False
+    main_type: str = field(init=False, repr=False, compare=False)
+    sub_type: str = field(init=False, repr=False, compare=False)
+    # (data, base64 text) of the last encoding; reused while
+    # ``data`` is still the same object.
+    _encoded: Optional[Tuple[bytes, str]] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    # Storage for ``data`` and the pending decode; both are set
+    # whenever ``data`` is assigned.
+    _data: Optional[bytes] = field(
+        init=False, repr=False, compare=False,
+    )
+    _loader: Optional[Callable[[], bytes]] = field(
+        init=False, repr=False, compare=False,
+    )
+
+    def __post_init__(self):
+        """Split the content type and normalise the Content-ID."""
+        main_type, _, sub_type = self.content_type.partition('/')
+        if not sub_type:
+            main_type, sub_type = 'application', 'octet-stream'
+        self.main_type = main_type
+        self.sub_type = sub_type
+        if self.content_id:
+            cid = self.content_id.strip().strip('<>')
+            self.content_id = f"<{cid}>"
+
+    @classmethod
+    def deferred(
+        cls, loader: Callable[[], bytes], filename: str,
+        content_type: str, content_id: Optional[str] = None,
+        is_inline: bool = False,
+    ) -> 'Attachment':
+        """
+        Create an attachment whose data is produced on first use.
+
+        Args:
+            loader: Called once to produce the data
+            filename: The attachment filename
+            content_type: The MIME type
+            content_id: Optional Content-ID
+            is_inline: Whether the attachment is inline
+
+        Returns:
+            Attachment: The attachment, with data not yet loaded
+        """
+        attachment = cls(
+            filename, content_type, None, content_id, is_inline,
+        )
+        attachment._loader = loader
+        return attachment
+
+    def stream(
+        self, chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[memoryview]:
+        """
+        Iterate over the attachment data in chunks.
+
+        The chunks are views into ``data``, so no copies are made.
+
+        Args:
+            chunk_size: Maximum size of each chunk in bytes
+
+        Yields:
+            memoryview: The next chunk of data
+        """
+        view = memoryview(self.data)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
@@ -0,0 +1,268 @@
+"""
+Mixin providing attachment storage operations.
+"""
+import os
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from .email_message import Attachment
+
+# Largest single write() issued when saving an attachment.
+_MAX_WRITE_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Path separators plus characters Windows does not allow in names.
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '/\\:*?"<>|\0'})
+
+# Create-only open flags; O_BINARY only exists (and matters) on Windows.
+_EXCL_FLAGS = (
+    os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+)
+
+
+class AttachmentMixin:
+    """Attachment storage operations for ImapClient."""
+
+    def save_attachment(
+        self,
+        attachment: Attachment,
+        target_path: str,
+        sanitize_filename: bool = True,
+    ) -> str:
+        """Save an attachment to disk.
+
+        Args:
+            attachment: The attachment to save
+            target_path: Directory or full file path
+            sanitize_filename: Whether to sanitize filename
+
+        Returns:
+            str: Path where file was saved, or empty string
+        """
+        try:
+            is_dir, target = self._resolve_target(target_path)
+            if is_dir:
+                self._ensure_dir(target)
+                filename = self._clean_filename(
+                    attachment, sanitize_filename,
+                )
+                directory = os.fspath(target)
+            else:
+                self._ensure_dir(target.parent)
+                directory, filename = os.path.split(
+                    os.fspath(target)
+                )
+
+            file_path = self._write_unique(
+                directory, filename, attachment,
+            )
+
+            self.logger.info(
+                f"Saved attachment to {file_path}"
+            )
+            return file_path
+
+        except Exception as e:
+            self.logger.error(
+                f"Error saving attachment "
+                f"{attachment.filename}: {e}"
+            )
+            return ""
+
+    def save_attachments(
+        self,
+        attachments: List[Attachment],
+        target_dir: str,
+        sanitize_filename: bool = True,
+    ) -> List[str]:
+        """Save several attachments into one directory.
+
+        The directory is created and listed once, so name clashes
+        are resolved against an in-memory set of names instead of
+        a stat call per file.
+
+        Args:
+            attachments: The attachments to save
+            target_dir: Directory to save into
+            sanitize_filename: Whether to sanitize filenames
+
+        Returns:
+            List[str]: Saved path per attachment, in order, with an
+            empty string for each attachment that failed
+        """
+        try:
+            target = Path(target_dir)
+            self._ensure_dir(target)
+            directory = os.fspath(target)
+            taken = set(os.listdir(directory))
+        except Exception as e:
+            self.logger.error(
+                f"Error preparing {target_dir} for attachments: {e}"
+            )
+            return [""] * len(attachments)
+
+        saved = []
+        for attachment in attachments:
+            try:
+                filename = self._clean_filename(
+                    attachment, sanitize_filename,
+                )
+                saved.append(self._write_unique(
+                    directory, filename, attachment, taken,
+                ))
+            except Exception as e:
+                self.logger.error(
+                    f"Error saving attachment "
+                    f"{attachment.filename}: {e}"
+                )
+                saved.append("")
+
+        self.logger.info(
+            f"Saved {sum(1 for p in saved if p)} attachment(s) "
+            f"to {directory}"
+        )
+        return saved
+
+    def _clean_filename(
+        self, attachment: Attachment, sanitize: bool,
+    ) -> str:
+        """Return the name to save an attachment under.
+
+        Args:
+            attachment: The attachment being saved
+            sanitize: Whether to replace unsafe characters
+
+        Returns:
+            str: The file name to use
+        """
+        filename = attachment.filename
+        if sanitize:
+            filename = filename.translate(_SANITIZE_TABLE)
+            if self._debug and filename != attachment.filename:
+                self.logger.debug(
+                    "Sanitized filename: '%s' -> '%s'",
+                    attachment.filename, filename,
+                )
+        return filename
+
+    def _resolve_target(self, target_path: str) -> Tuple[bool, Path]:
+        """Classify a save target as directory or file.
+
+        Extension-less targets are always directories, so only
+        that answer is cached. Targets with an extension are
+        checked on disk each time, since they can change between
+        file and directory.
+
+        Args:
+            target_path: Directory or full file path
+
+        Returns:
+            Tuple of (is_dir, Path) for the target
+        """
+        resolved = self._target_cache.get(target_path)
+        if resolved is not None:
+            return resolved
+        target = Path(target_path)
+        if os.path.splitext(target_path)[1]:
+            return target.is_dir(), target
+        resolved = (True, target)
+        self._target_cache[target_path] = resolved
+        return resolved
+
+    def _ensure_dir(self, directory: Path) -> None:
+        """Create a directory unless this client already did.
+
+        The cache is not checked against the disk; _write_unique
+        drops the entry and calls this again if the directory has
+        gone missing since.
+
+        Args:
+            directory: The directory to create
+        """
+        if directory not in self._dir_cache:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._dir_cache.add(directory)
+
+    def _write_unique(
+        self,
+        directory: str,
+        filename: str,
+        attachment: Attachment,
+        taken: Optional[Set[str]] = None,
+    ) -> str:
+        """Write an attachment under a name that is not taken yet.
+
+        The plain name is always tried first, so it is reused once
+        the file is gone. Clashes get a ``_N`` suffix; the last
+        suffix used per name is remembered as a hint, so saving
+        many files with the same name does not probe every earlier
+        suffix again. Unlike a scan from ``_1``, suffixes below the
+        hint that were freed later are not filled in. Each
+        candidate is opened with O_EXCL, which checks and creates
+        the file in one call and never overwrites a file written by
+        someone else. A failed write removes the file again, so no
+        truncated file keeps the name. Paths are built as strings
+        to keep pathlib out of the per-file loop.
+
+        Args:
+            directory: The directory to save into
+            filename: The preferred file name
+            attachment: The attachment to write
+            taken: Optional set of names known to exist in the
+                directory; skipped without a syscall and updated
+                with the name written
+
+        Returns:
+            str: The path the attachment was written to
+        """
+        stem, ext = os.path.splitext(filename)
+        key = (directory, stem, ext)
+        prefix = os.path.join(directory, '')
+        counter = self._used_names.get(key, 0)
+        name = filename
+        # Decode deferred data before any file exists, so a failing
+        # decode leaves nothing behind on disk.
+        attachment.data
+        recreated = False
+
+        while True:
+            if taken is None or name not in taken:
+                try:
+                    fd = os.open(prefix + name, _EXCL_FLAGS, 0o666)
+                    break
+                except FileExistsError:
+                    pass
+                except FileNotFoundError:
+                    if recreated:
+                        raise
+                    # The cached directory was removed behind our
+                    # back; create it again and retry once.
+                    self._dir_cache.discard(Path(directory))
+                    self._ensure_dir(Path(directory))
+                    recreated = True
+                    continue
+            counter += 1
+            name = f"{stem}_{counter}{ext}"
+
+        path = prefix + name
+        # The data is in memory by now, so write views of it
+        # straight to the descriptor instead of copying it through
+        # a userspace buffer first.
+        try:
+            try:
+                for chunk in attachment.stream(_MAX_WRITE_CHUNK_SIZE):
+                    while chunk:
+                        chunk = chunk[os.write(fd, chunk):]
+            finally:
+                os.close(fd)
+        except BaseException:
+            # Don't leave a truncated file holding the name.
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            raise
+
+        self._used_names[key] = counter
+        if taken is not None:
+            taken.add(name)
+        return path
@@ -0,0 +1,163 @@
+"""
+Helpers for locating attachment parts in IMAP BODYSTRUCTURE responses.
+"""
+import base64
+import quopri
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import unquote
+
+from .email_message import _decode_header_value
+
+
+@dataclass
+class PartInfo:
+    """
+    Describes one leaf MIME part found in a BODYSTRUCTURE.
+    """
+    section: str
+    content_type: str
+    encoding: str
+    size: int
+    filename: Optional[str] = None
+    disposition: Optional[str] = None
+    content_id: Optional[str] = None
+
+
+def _text(value) -> str:
+    """Convert a BODYSTRUCTURE atom to lowercase-safe text."""
+    if isinstance(value, bytes):
+        return value.decode('ascii', errors='replace')
+    return '' if value is None else str(value)
+
+
+def _params(values) -> dict:
+    """Turn a flat (key, value, ...) parameter list into a dict."""
+    if not isinstance(values, (tuple, list)):
+        return {}
+    return {
+        _text(values[i]).lower(): values[i + 1]
+        for i in range(0, len(values) - 1, 2)
+    }
+
+
+def _disposition_index(main_type: str, sub_type: str) -> int:
+    """Return where the disposition sits in a single-part body.
+
+    Text parts carry an extra line count; message/rfc822 parts
+    carry an envelope, a nested body and a line count.
+    """
+    if main_type == 'text':
+        return 9
+    if main_type == 'message' and sub_type == 'rfc822':
+        return 11
+    return 8
+
+
+def _leaf_info(part, section: str) -> PartInfo:
+    """Build PartInfo for a single-part BODYSTRUCTURE entry."""
+    main_type = _text(part[0]).lower()
+    sub_type = _text(part[1]).lower()
+    type_params = _params(part[2])
+
+    disposition = None
+    disp_params = {}
+    index = _disposition_index(main_type, sub_type)
+    if len(part) > index and isinstance(part[index], (tuple, list)):
+        disposition = _text(part[index][0]).lower()
+        disp_params = _params(part[index][1])
+
+    raw_name = (
+        disp_params.get('filename') or disp_params.get('filename*')
+        or type_params.get('name') or type_params.get('name*')
+    )
+    filename = _decode_header_value(raw_name) if raw_name else None
+    if filename and filename.lower().startswith("utf-8''"):
+        # RFC 2231 form as sent by some servers: utf-8''name
+        filename = unquote(filename[7:])
+
+    return PartInfo(
+        section=section,
+        content_type=f"{main_type}/{sub_type}",
+        encoding=_text(part[5]).lower(),
+        size=part[6] if isinstance(part[6], int) else 0,
+        filename=filename,
+        disposition=disposition,
+        content_id=_text(part[3]) or None,
+    )
+
+
+def iter_parts(bodystructure, prefix: str = '') -> Iterator[PartInfo]:
+    """
+    Walk a BODYSTRUCTURE and yield every leaf part with its section.
+
+    Section numbers follow RFC 3501: ``"1"``, ``"2"``, ``"3.1"`` and
+    so on. A single-part message is section ``"1"``. Multipart
+    bodies are recognised the way imapclient's ``BodyData`` does:
+    the first element is a list of child parts. Encapsulated
+    message/rfc822 parts are reported as leaves.
+
+    Args:
+        bodystructure: BODYSTRUCTURE value from imapclient
+
+    Yields:
+        PartInfo: One entry per leaf part
+    """
+    if not isinstance(bodystructure[0], list):
+        yield _leaf_info(bodystructure, prefix or '1')
+        return
+
+    for i, child in enumerate(bodystructure[0], start=1):
+        section = f"{prefix}.{i}" if prefix else str(i)
+        yield from iter_parts(child, section)
+
+
+def find_attachment_parts(
+    bodystructure,
+    extensions: Optional[Sequence[str]] = None,
+) -> List[PartInfo]:
+    """
+    Find attachment parts, optionally filtered by file extension.
+
+    Args:
+        bodystructure: BODYSTRUCTURE value from imapclient
+        extensions: Extensions to keep (e.g. ``['pdf']``), or None
+            for all attachments
+
+    Returns:
+        PartInfo entries for the matching parts
+    """
+    suffixes: Optional[Tuple[str, ...]] = None
+    if extensions:
+        suffixes = tuple(
+            f".{ext.lstrip('.').lower()}" for ext in extensions
+        )
+
+    found = []
+    for part in iter_parts(bodystructure):
+        if not part.filename and part.disposition != 'attachment':
+            continue
+        if suffixes and not (
+            part.filename and part.filename.lower().endswith(suffixes)
+        ):
+            continue
+        found.append(part)
+    return found
+
+
+def decode_part(data: bytes, encoding: str) -> bytes:
+    """
+    Decode a fetched part body according to its transfer encoding.
+
+    Args:
+        data: The raw part bytes as returned by BODY[section]
+        encoding: The Content-Transfer-Encoding from BODYSTRUCTURE
+
+    Returns:
+        bytes: The decoded payload
+    """
+    if encoding == 'base64':
+        return base64.decodebytes(data)
+    if encoding == 'quoted-printable':
+        return quopri.decodestring(data)
+    return data
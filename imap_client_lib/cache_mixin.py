@@ -0,0 +1,142 @@
+"""
+Mixin providing an in-memory cache of parsed messages.
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+from .email_message import EmailMessage
+from .message_ops_mixin import (
+    _batched, _extract_keywords, _UID_CHUNK_SIZE,
+)
+
+
+class MessageCacheMixin:
+    """Parsed-message cache for ImapClient.
+
+    Entries are keyed by ``(folder, UIDVALIDITY, uid)``. A UID
+    only names the same message while the folder's UIDVALIDITY is
+    unchanged, which makes this key safe across reconnects and
+    different search criteria.
+    """
+
+    def _cache_get(
+        self,
+        folder: str,
+        uidvalidity,
+        message_ids: List[int],
+        include_attachments: bool,
+    ) -> Dict[int, EmailMessage]:
+        """Look up cached messages for a list of UIDs.
+
+        Args:
+            folder: The folder the UIDs belong to
+            uidvalidity: The folder's current UIDVALIDITY
+            message_ids: UIDs to look up
+            include_attachments: Whether attachments are needed
+
+        Returns:
+            Dict mapping cached UIDs to their messages
+        """
+        if not self.message_cache_size or uidvalidity is None:
+            return {}
+
+        if self._cache_validity.get(folder) != uidvalidity:
+            self._cache_drop_folder(folder)
+            self._cache_validity[folder] = uidvalidity
+            return {}
+
+        hits = {}
+        for uid in message_ids:
+            key = (folder, uidvalidity, uid)
+            entry = self._message_cache.get(key)
+            if entry is None:
+                continue
+            has_attachments, email_message = entry
+            if has_attachments or not include_attachments:
+                self._message_cache.move_to_end(key)
+                hits[uid] = email_message
+
+        if hits:
+            self.logger.debug(
+                f"Message cache hits: {len(hits)} "
+                f"of {len(message_ids)}"
+            )
+            self._refresh_keywords(hits)
+        return hits
+
+    def _cache_put(
+        self,
+        folder: str,
+        uidvalidity,
+        messages: List[Tuple[int, EmailMessage]],
+        include_attachments: bool,
+    ) -> None:
+        """Store freshly fetched messages, evicting the oldest.
+
+        Args:
+            folder: The folder the messages belong to
+            uidvalidity: The folder's current UIDVALIDITY
+            messages: (message_id, EmailMessage) tuples to store
+            include_attachments: Whether attachments were parsed
+        """
+        if not self.message_cache_size or uidvalidity is None:
+            return
+
+        for message_id, email_message in messages:
+            key = (folder, uidvalidity, message_id)
+            self._message_cache[key] = (
+                include_attachments, email_message,
+            )
+            self._message_cache.move_to_end(key)
+
+        while len(self._message_cache) > self.message_cache_size:
+            self._message_cache.popitem(last=False)
+
+    def _cache_drop_folder(self, folder: str) -> None:
+        """Drop every cached message of a folder.
+
+        Args:
+            folder: The folder to drop
+        """
+        for key in [k for k in self._message_cache if k[0] == folder]:
+            del self._message_cache[key]
+
+    def _cache_discard(self, uids: Iterable[int]) -> None:
+        """Drop cached messages that were moved or deleted.
+
+        Message operations act on whichever folder is selected,
+        which the cache does not track, so the UIDs are dropped
+        from every folder. An unrelated message sharing a UID in
+        another folder then only costs a refetch.
+
+        Args:
+            uids: UIDs that no longer exist in their folder
+        """
+        if not self._message_cache:
+            return
+        gone = set(uids)
+        for key in [k for k in self._message_cache if k[2] in gone]:
+            del self._message_cache[key]
+
+    def _refresh_keywords(
+        self, messages: Dict[int, EmailMessage],
+    ) -> None:
+        """Update keywords of cached messages from current FLAGS.
+
+        Flags can change while a message sits in the cache; a
+        FLAGS-only FETCH is small compared to the body.
+
+        Args:
+            messages: Dict mapping UIDs to cached messages
+        """
+        for chunk in _batched(list(messages), _UID_CHUNK_SIZE):
+            flags = self.client.fetch(chunk, ['FLAGS'])
+            for uid in chunk:
+                messages[uid].keywords = _extract_keywords(
+                    flags.get(uid, {}).get(b'FLAGS', ())
+                )
+
+    def clear_message_cache(self) -> None:
+        """Drop all cached messages."""
+        self._message_cache = OrderedDict()
+        self._cache_validity = {}
@@ -0,0 +1,167 @@
+"""
+Mixin providing callback-driven processing of fetched messages.
+"""
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
+
+from .email_message import EmailHeader, EmailMessage
+
+
+class CallbackMixin:
+    """Callback-driven message processing for ImapClient."""
+
+    def process_messages_with_callback(
+        self,
+        callback: Callable[[EmailMessage], bool],
+        search_criteria: List[str] = None,
+        folder: str = 'INBOX',
+        mark_as_read: bool = True,
+        move_to_folder: Optional[str] = None,
+        header_filter: Optional[
+            Callable[[EmailHeader], bool]
+        ] = None,
+        headers_only: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> int:
+        """Process messages with a custom callback.
+
+        Reuses an existing connection if there is one and
+        leaves it open; otherwise connects for the duration
+        of the call.
+
+        With a header_filter, only envelopes are fetched first;
+        full bodies are downloaded just for the messages the
+        filter accepts. With headers_only, the callback gets
+        messages carrying just their header block (no body or
+        attachments).
+
+        With max_workers, callbacks run on a thread pool while
+        the next messages are fetched, which helps callbacks
+        that wait on I/O. The callback must then be thread-safe.
+
+        Args:
+            callback: Function taking an EmailMessage,
+                returns True to continue processing
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+            mark_as_read: Mark processed messages as read
+            move_to_folder: Folder to move processed msgs
+            header_filter: Optional function taking an
+                EmailHeader, returns True if the full message
+                should be fetched and passed to callback
+            headers_only: Fetch only message headers
+            max_workers: Threads to run callbacks on; None or 1
+                runs them one by one in the calling thread
+
+        Returns:
+            int: Number of messages processed
+        """
+        opened = False
+        if not self.client:
+            if not self.connect():
+                return 0
+            opened = True
+        elif not self._ensure_alive():
+            return 0
+
+        try:
+            # Iterate lazily so each message can be freed once
+            # its callback returns.
+            if header_filter is None:
+                messages = self._iter_messages(
+                    search_criteria, folder, None, True,
+                    headers_only,
+                )
+            else:
+                messages = self._get_filtered_messages(
+                    header_filter, search_criteria, folder,
+                )
+            processed_ids = []
+
+            try:
+                if max_workers and max_workers > 1:
+                    self._run_callbacks_parallel(
+                        callback, messages, max_workers,
+                        processed_ids,
+                    )
+                else:
+                    for message_id, email_message in messages:
+                        if self._run_callback(
+                            callback, message_id, email_message,
+                        ):
+                            processed_ids.append(message_id)
+            except Exception as e:
+                # Still flag and move what was already processed.
+                self.logger.error("Error getting messages: %s", e)
+
+            # Flag and move all processed messages at once rather
+            # than issuing a STORE and a MOVE per message.
+            if processed_ids and mark_as_read:
+                self.mark_many_as_read(processed_ids)
+
+            if processed_ids and move_to_folder:
+                self.move_many(processed_ids, move_to_folder)
+
+            processed_count = len(processed_ids)
+            return processed_count
+
+        finally:
+            if opened:
+                self.disconnect()
+
+    def _run_callback(
+        self,
+        callback: Callable[[EmailMessage], bool],
+        message_id: int,
+        email_message: EmailMessage,
+    ) -> bool:
+        """Run a callback for one message, logging its errors."""
+        try:
+            return bool(callback(email_message))
+        except Exception as e:
+            self.logger.error(
+                "Error processing message %s: %s", message_id, e,
+            )
+            return False
+
+    def _run_callbacks_parallel(
+        self,
+        callback: Callable[[EmailMessage], bool],
+        messages: Iterator[Tuple[int, EmailMessage]],
+        max_workers: int,
+        processed_ids: List[int],
+    ) -> None:
+        """Run callbacks on a thread pool while messages are fetched.
+
+        At most two messages per worker are in flight, so a slow
+        callback holds back fetching instead of letting parsed
+        messages pile up. Accepted IDs are appended to
+        processed_ids in message order, including when fetching
+        fails part way through.
+
+        Args:
+            callback: Function taking an EmailMessage
+            messages: Iterator of (uid, EmailMessage) tuples
+            max_workers: Number of callback threads
+            processed_ids: List collecting accepted UIDs
+        """
+        pending: Deque[Tuple[int, Future]] = deque()
+
+        def collect() -> None:
+            message_id, future = pending.popleft()
+            if future.result():
+                processed_ids.append(message_id)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                for message_id, email_message in messages:
+                    pending.append((message_id, executor.submit(
+                        self._run_callback,
+                        callback, message_id, email_message,
+                    )))
+                    if len(pending) >= 2 * max_workers:
+                        collect()
+            finally:
+                while pending:
+                    collect()
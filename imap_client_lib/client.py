@@ -1,21 +1,48 @@
 """
 IMAP client for connecting to email servers and retrieving messages.
 """
-from typing import List, Optional, Tuple, Callable
-import os
-from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
 import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
 
 from imapclient import IMAPClient
+from imapclient.exceptions import IMAPClientError
 
 from .account import Account
-from .email_message import EmailMessage, Attachment
+from .email_message import EmailMessage
 from .smtp_mixin import SmtpMixin
 from .draft_mixin import DraftMixin
-from .message_ops_mixin import MessageOpsMixin, _extract_keywords
-
-
-class ImapClient(SmtpMixin, DraftMixin, MessageOpsMixin):
+from .message_ops_mixin import (
+    MessageId, MessageOpsMixin, _to_uid,
+)
+from .header_rewrite_mixin import HeaderRewriteMixin
+from .fetch_mixin import _BODY_FIELDS, FetchMixin
+from .parallel_mixin import ParallelFetchMixin
+from .folder_mixin import FolderMixin
+from .attachment_mixin import AttachmentMixin
+from .search_mixin import SearchMixin
+from .cache_mixin import MessageCacheMixin
+from .header_mixin import HeaderFetchMixin
+from .watch_mixin import WatchMixin
+from .callback_mixin import CallbackMixin
+from .pool import ImapConnectionPool
+
+# Default number of messages per body FETCH. Besides keeping the
+# command line short (RFC 2683 section 3.2.1.5), smaller batches
+# stay under the response-size limits some servers enforce
+# ("maximum request size exceeded"); around 100 is where larger
+# batches stop paying off.
+_DEFAULT_FETCH_BATCH_SIZE = 100
+
+
+class ImapClient(
+    SmtpMixin, DraftMixin, MessageOpsMixin, HeaderRewriteMixin,
+    FetchMixin, ParallelFetchMixin, FolderMixin, AttachmentMixin,
+    SearchMixin, MessageCacheMixin, HeaderFetchMixin, WatchMixin,
+    CallbackMixin,
+):
     """
     Handles IMAP connections and email operations.
     """
@@ -24,16 +51,58 @@ class ImapClient(SmtpMixin, DraftMixin, MessageOpsMixin):
         self,
         account: Account,
         logger: Optional[logging.Logger] = None,
+        message_cache_size: int = 0,
+        fetch_batch_size: int = _DEFAULT_FETCH_BATCH_SIZE,
+        pool: Optional[ImapConnectionPool] = None,
+        keep_smtp_open: bool = False,
     ):
         """Initialize the IMAP client with an account.
 
         Args:
             account: The email account configuration
             logger: Optional logger instance
+            message_cache_size: Number of parsed messages to keep
+                so repeated get_messages calls only fetch new
+                UIDs; 0 disables the cache
+            fetch_batch_size: Messages per body FETCH command;
+                lower it for servers that reject large requests
+            pool: Optional ImapConnectionPool; connect() then
+                leases a session from it and disconnect() hands
+                the session back instead of logging out
+            keep_smtp_open: Reuse one logged-in SMTP session across
+                sends instead of connecting for each one; it is
+                closed by disconnect() or close_smtp()
         """
         self.account = account
         self.client = None
         self.logger = logger or logging.getLogger(__name__)
+        # Cached so per-attachment loops can skip building debug
+        # arguments; refreshed on connect() in case the level changed.
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
+        self._folder_cache: Optional[Set[str]] = None
+        self._dir_cache: Set[Path] = set()
+        self._used_names: Dict[Tuple[str, str, str], int] = {}
+        self._target_cache: Dict[str, Tuple[bool, Path]] = {}
+        self.message_cache_size = message_cache_size
+        self.fetch_batch_size = fetch_batch_size
+        self.pool = pool
+        self.keep_smtp_open = keep_smtp_open
+        self._smtp = None
+        self._smtp_key = None
+        self._message_cache: OrderedDict = OrderedDict()
+        self._mime_cache: OrderedDict = OrderedDict()
+        self._mime_cache_lock = threading.Lock()
+        self._cache_validity: Dict[str, object] = {}
+        self._uidvalidity = None
+
+    def __enter__(self) -> 'ImapClient':
+        """Connect when entering a ``with`` block."""
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Disconnect when leaving a ``with`` block."""
+        self.disconnect()
 
     def connect(self) -> bool:
         """Connect to the IMAP server.
@@ -41,147 +110,95 @@ class ImapClient(SmtpMixin, DraftMixin, MessageOpsMixin):
         Returns:
             bool: True if connection was successful
         """
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
         try:
             self.logger.info(
-                f"Connecting to {self.account.server} "
-                f"for account {self.account.name}"
-            )
-            self.client = IMAPClient(
-                self.account.server,
-                port=self.account.port,
-                use_uid=True,
-                ssl=self.account.use_ssl,
-                timeout=300,
-            )
-            self.client.login(
-                self.account.username,
-                self.account.password,
-            )
-            self.logger.info(
-                f"Connected to {self.account.server}"
+                "Connecting to %s for account %s",
+                self.account.server, self.account.name,
             )
+            if self.pool is not None:
+                self.client = self.pool.acquire(
+                    self.account, self._create_session,
+                )
+            else:
+                self.client = self._create_session()
+            self.logger.info("Connected to %s", self.account.server)
             return True
         except Exception as e:
             self.logger.error(
-                f"Failed to connect to "
-                f"{self.account.server}: {e}"
+                "Failed to connect to %s: %s", self.account.server, e,
             )
             return False
 
+    def _create_session(self) -> IMAPClient:
+        """Open and log in a new IMAP session for the account.
+
+        Returns:
+            IMAPClient: The logged-in session
+
+        Raises:
+            Exception: If connecting or logging in fails
+        """
+        session = IMAPClient(
+            self.account.server,
+            port=self.account.port,
+            use_uid=True,
+            ssl=self.account.use_ssl,
+            timeout=300,
+        )
+        session.login(
+            self.account.username,
+            self.account.password,
+        )
+        return session
+
     def disconnect(self):
         """Disconnect from the IMAP server."""
+        self.close_smtp()
         if self.client:
             try:
-                self.client.logout()
+                if self.pool is not None:
+                    self.pool.release(self.account, self.client)
+                else:
+                    self.client.logout()
                 self.logger.info(
-                    f"Disconnected from "
-                    f"{self.account.server}"
+                    "Disconnected from %s", self.account.server,
                 )
             except Exception as e:
                 self.logger.error(
-                    f"Error disconnecting from "
-                    f"{self.account.server}: {e}"
+                    "Error disconnecting from %s: %s",
+                    self.account.server, e,
                 )
             finally:
                 self.client = None
+                self._invalidate_folder_cache()
 
-    def get_messages(
-        self,
-        search_criteria: List[str] = None,
-        folder: str = 'INBOX',
-        limit: Optional[int] = None,
-        include_attachments: bool = True,
-    ) -> List[Tuple[str, EmailMessage]]:
-        """Get messages from a folder based on search criteria.
+    def _ensure_alive(self) -> bool:
+        """Ping the server with NOOP, reconnecting if dropped.
 
-        Args:
-            search_criteria: IMAP search criteria
-            folder: The folder to search in
-            limit: Maximum number of messages to return
-            include_attachments: Whether to include attachments
+        Servers silently drop idle sessions, so a reused
+        connection is verified before it is trusted.
 
         Returns:
-            List of (message_id, EmailMessage) tuples
+            bool: True if a live session is available
         """
         if not self.client:
-            self.logger.error(
-                "Not connected to IMAP server"
-            )
-            return []
-
-        if search_criteria is None:
-            search_criteria = ['UNSEEN']
+            return self.connect()
 
         try:
-            self.client.select_folder(folder)
-
-            self.logger.info(
-                f"Searching with criteria: "
-                f"{search_criteria}"
-            )
-            message_ids = self.client.search(
-                search_criteria
-            )
-
-            if not message_ids:
-                self.logger.info("No messages found")
-                return []
-
-            self.logger.info(
-                f"Found {len(message_ids)} messages"
-            )
-
-            message_ids = sorted(
-                message_ids, reverse=True
-            )
-
-            if limit is not None and limit > 0:
-                message_ids = message_ids[:limit]
-                self.logger.info(
-                    f"Limited to {len(message_ids)} "
-                    f"most recent messages"
-                )
-
-            messages = []
-            for message_id in message_ids:
-                try:
-                    raw_message = self.client.fetch(
-                        [message_id],
-                        ['BODY.PEEK[]', 'FLAGS'],
-                    )
-                    message_data = (
-                        raw_message[message_id][b'BODY[]']
-                    )
-                    flags = raw_message[message_id].get(
-                        b'FLAGS', ()
-                    )
-                    keywords = _extract_keywords(flags)
-                    email_message = EmailMessage.from_bytes(
-                        str(message_id),
-                        message_data,
-                        self.logger,
-                        include_attachments,
-                        keywords=keywords,
-                    )
-                    messages.append(
-                        (str(message_id), email_message)
-                    )
-                except Exception as e:
-                    self.logger.error(
-                        f"Error fetching message "
-                        f"{message_id}: {e}"
-                    )
-
-            return messages
-        except Exception as e:
-            self.logger.error(
-                f"Error getting messages: {e}"
+            self.client.noop()
+            return True
+        except (IMAPClientError, OSError) as e:
+            self.logger.warning(
+                "Connection to %s lost (%s), reconnecting",
+                self.account.server, e,
             )
-            return []
+            self.client = None
+            return self.connect()
 
     def get_unread_messages(
         self, include_attachments: bool = True,
-    ) -> List[Tuple[str, EmailMessage]]:
+    ) -> List[Tuple[int, EmailMessage]]:
         """Get all unread messages from the inbox.
 
         Args:
@@ -201,7 +218,8 @@ class ImapClient(SmtpMixin, DraftMixin, MessageOpsMixin):
         folder: str = 'INBOX',
         limit: int = 100,
         include_attachments: bool = True,
-    ) -> List[Tuple[str, EmailMessage]]:
+        readonly: bool = False,
+    ) -> List[Tuple[int, EmailMessage]]:
         """Get all messages from a folder (most recent first).
 
         Args:
@@ -209,17 +227,18 @@ class ImapClient(SmtpMixin, DraftMixin, MessageOpsMixin):
             limit: Maximum number of messages to return
             include_attachments: Whether to include
                 attachments
+            readonly: Open the folder with EXAMINE
 
         Returns:
             List of (message_id, EmailMessage) tuples
         """
         return self.get_messages(
-            ['ALL'], folder, limit, include_attachments
+            ['ALL'], folder, limit, include_attachments, readonly,
         )
 
     def get_message_by_id(
         self,
-        message_id: str,
+        message_id: MessageId,
         folder: str = 'INBOX',
         include_attachments: bool = True,
     ) -> Optional[Tuple[str, EmailMessage]]:
@@ -244,33 +263,22 @@ class ImapClient(SmtpMixin, DraftMixin, MessageOpsMixin):
 
         try:
             self.client.select_folder(folder)
-            uid = int(message_id)
+            uid = _to_uid(message_id)
             raw_message = self.client.fetch(
-                [uid], ['BODY.PEEK[]', 'FLAGS'],
+                [uid], _BODY_FIELDS,
             )
             if uid not in raw_message:
                 self.logger.info(
-                    f"Message {message_id} not found "
-                    f"in {folder}"
+                    "Message %s not found in %s", message_id, folder,
                 )
                 return None
-            message_data = raw_message[uid][b'BODY[]']
-            flags = raw_message[uid].get(
-                b'FLAGS', ()
-            )
-            keywords = _extract_keywords(flags)
-            email_message = EmailMessage.from_bytes(
-                str(uid),
-                message_data,
-                self.logger,
-                include_attachments,
-                keywords=keywords,
+            email_message = self._parse_fetched(
+                uid, raw_message[uid], include_attachments,
             )
             return (str(uid), email_message)
         except Exception as e:
             self.logger.error(
-                f"Error fetching message "
-                f"{message_id}: {e}"
+                "Error fetching message %s: %s", message_id, e,
             )
             return None
 
@@ -297,264 +305,6 @@ class ImapClient(SmtpMixin, DraftMixin, MessageOpsMixin):
             return info.get(b'EXISTS', None)
         except Exception as e:
             self.logger.error(
-                f"Error getting message count "
-                f"for '{folder}': {e}"
+                "Error getting message count for '%s': %s", folder, e,
             )
             return None
-
-    def list_folders(self) -> List[str]:
-        """List all folders in the mailbox.
-
-        Returns:
-            List[str]: List of folder names
-        """
-        if not self.client:
-            self.logger.error(
-                "Not connected to IMAP server"
-            )
-            return []
-
-        try:
-            folders = self.client.list_folders()
-            folder_names = [f[2] for f in folders]
-            return folder_names
-        except Exception as e:
-            self.logger.error(
-                f"Error listing folders: {e}"
-            )
-            return []
-
-    def idle_start(self, folder: str = 'INBOX') -> bool:
-        """Start IDLE mode on a folder.
-
-        IDLE allows the server to push notifications
-        about new emails instead of requiring polling.
-
-        Args:
-            folder: The folder to monitor
-
-        Returns:
-            bool: True if IDLE mode started successfully
-        """
-        if not self.client:
-            self.logger.error(
-                "Not connected to IMAP server"
-            )
-            return False
-
-        try:
-            self.client.select_folder(folder)
-            self.client.idle()
-            self.logger.debug(
-                f"Started IDLE on folder '{folder}'"
-            )
-            return True
-        except Exception as e:
-            self.logger.error(
-                f"Error starting IDLE mode: {e}"
-            )
-            return False
-
-    def idle_check(
-        self, timeout: int = 30,
-    ) -> List[Tuple[int, bytes]]:
-        """Check for IDLE responses.
-
-        Blocks until a response is received or timeout.
-
-        Args:
-            timeout: Max wait time in seconds
-
-        Returns:
-            List of (msg_id, event) tuples.
-        """
-        if not self.client:
-            self.logger.error(
-                "Not connected to IMAP server"
-            )
-            return []
-
-        try:
-            responses = self.client.idle_check(
-                timeout=timeout
-            )
-            if responses:
-                self.logger.debug(
-                    f"IDLE responses: {responses}"
-                )
-            return responses
-        except Exception as e:
-            self.logger.error(
-                f"Error checking IDLE: {e}"
-            )
-            raise
-
-    def idle_done(self) -> None:
-        """Exit IDLE mode.
-
-        Must be called before performing any other IMAP
-        operations after starting IDLE mode.
-        """
-        if not self.client:
-            self.logger.error(
-                "Not connected to IMAP server"
-            )
-            return
-
-        try:
-            self.client.idle_done()
-            self.logger.debug("Exited IDLE mode")
-        except Exception as e:
-            self.logger.error(
-                f"Error exiting IDLE mode: {e}"
-            )
-
-    def save_attachment(
-        self,
-        attachment: Attachment,
-        target_path: str,
-        sanitize_filename: bool = True,
-    ) -> str:
-        """Save an attachment to disk.
-
-        Args:
-            attachment: The attachment to save
-            target_path: Directory or full file path
-            sanitize_filename: Whether to sanitize filename
-
-        Returns:
-            str: Path where file was saved, or empty string
-        """
-        try:
-            if os.path.isdir(target_path) or not (
-                os.path.splitext(target_path)[1]
-            ):
-                target_dir = Path(target_path)
-                os.makedirs(target_dir, exist_ok=True)
-
-                filename = attachment.filename
-                if sanitize_filename:
-                    filename = filename.replace(
-                        '/', '_'
-                    ).replace('\\', '_')
-                    self.logger.debug(
-                        f"Sanitized filename: "
-                        f"'{attachment.filename}' "
-                        f"-> '{filename}'"
-                    )
-
-                file_path = target_dir / filename
-            else:
-                file_path = Path(target_path)
-                os.makedirs(
-                    file_path.parent, exist_ok=True
-                )
-
-            counter = 1
-            original_path = file_path
-            while file_path.exists():
-                name = original_path.stem
-                ext = original_path.suffix
-                file_path = original_path.parent / f"{name}_{counter}{ext}"
-                counter += 1
-
-            with open(file_path, 'wb') as f:
-                f.write(attachment.data)
-
-            self.logger.info(
-                f"Saved attachment to {file_path}"
-            )
-            return str(file_path)
-
-        except Exception as e:
-            self.logger.error(
-                f"Error saving attachment "
-                f"{attachment.filename}: {e}"
-            )
-            return ""
-
-    def process_messages_with_callback(
-        self,
-        callback: Callable[[EmailMessage], bool],
-        search_criteria: List[str] = None,
-        folder: str = 'INBOX',
-        mark_as_read: bool = True,
-        move_to_folder: Optional[str] = None,
-    ) -> int:
-        """Process messages with a custom callback.
-
-        Args:
-            callback: Function taking an EmailMessage,
-                returns True to continue processing
-            search_criteria: IMAP search criteria
-            folder: The folder to search in
-            mark_as_read: Mark processed messages as read
-            move_to_folder: Folder to move processed msgs
-
-        Returns:
-            int: Number of messages processed
-        """
-        if not self.connect():
-            return 0
-
-        try:
-            messages = self.get_messages(
-                search_criteria, folder
-            )
-            processed_count = 0
-
-            for message_id, email_message in messages:
-                try:
-                    if callback(email_message):
-                        processed_count += 1
-
-                        if mark_as_read:
-                            self.mark_as_read(message_id)
-
-                        if move_to_folder:
-                            self.move_to_folder(
-                                message_id, move_to_folder
-                            )
-
-                except Exception as e:
-                    self.logger.error(
-                        f"Error processing message "
-                        f"{message_id}: {e}"
-                    )
-
-            return processed_count
-
-        finally:
-            self.disconnect()
-
-    def _ensure_folder_exists(
-        self, folder: str,
-    ) -> bool:
-        """Ensure a folder exists, creating it if needed.
-
-        Args:
-            folder: The folder name to check/create
-
-        Returns:
-            bool: True if folder exists or was created
-        """
-        folders = self.client.list_folders()
-        folder_names = [f[2] for f in folders]
-
-        if folder not in folder_names:
-            self.logger.warning(
-                f"Folder '{folder}' does not exist, "
-                f"attempting to create it"
-            )
-            try:
-                self.client.create_folder(folder)
-                self.logger.info(
-                    f"Created folder '{folder}'"
-                )
-            except Exception as e:
-                self.logger.error(
-                    f"Error creating folder "
-                    f"'{folder}': {e}"
-                )
-                return False
-        return True
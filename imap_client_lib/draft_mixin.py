@@ -6,6 +6,8 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 from .email_message import Attachment
+from .message_ops_mixin import MessageId, _to_uid
+from .smtp_mixin import _set_custom_headers
 
 
 class DraftMixin:
@@ -77,17 +79,10 @@ class DraftMixin:
             msg['Subject'] = subject
 
             if custom_headers:
-                for hdr_name, hdr_val in custom_headers.items():
-                    if hdr_name in msg:
-                        del msg[hdr_name]
-                        self.logger.debug(
-                            f"Removed header: {hdr_name}"
-                        )
-                    msg[hdr_name] = hdr_val
-                    self.logger.debug(
-                        f"Added header: "
-                        f"{hdr_name}: {hdr_val}"
-                    )
+                _set_custom_headers(msg, custom_headers)
+                self.logger.debug(
+                    f"Set headers: {', '.join(custom_headers)}"
+                )
 
             if has_inline and content_type == "text/html":
                 alternative = MIMEMultipart('alternative')
@@ -142,7 +137,7 @@ class DraftMixin:
 
     def update_draft(
         self,
-        message_id: str,
+        message_id: MessageId,
         to_addresses: List[str],
         subject: str,
         body: str,
@@ -154,6 +149,7 @@ class DraftMixin:
         attachments: Optional[List[Attachment]] = None,
         draft_folder: str = "Drafts",
         mark_as_unread: bool = True,
+        verify: bool = True,
     ) -> bool:
         """Update an existing draft by replacing it.
 
@@ -170,6 +166,8 @@ class DraftMixin:
             attachments: List of Attachment objects
             draft_folder: Name of the drafts folder
             mark_as_unread: Mark the draft as unread
+            verify: Check that the draft exists before saving
+                the new version; False skips that FETCH
 
         Returns:
             bool: True if draft was updated successfully
@@ -182,30 +180,11 @@ class DraftMixin:
 
         try:
             self.client.select_folder(draft_folder)
+            uid = _to_uid(message_id)
 
-            try:
-                msg_data = self.client.fetch(
-                    [int(message_id)], ['FLAGS']
-                )
-                if int(message_id) not in msg_data:
-                    self.logger.error(
-                        f"Draft {message_id} not found "
-                        f"in '{draft_folder}'"
-                    )
-                    return False
-
-                flags = msg_data[int(message_id)][b'FLAGS']
-                if b'\\Draft' not in flags:
-                    self.logger.warning(
-                        f"Message {message_id} has no "
-                        f"\\Draft flag. Proceeding anyway."
-                    )
-
-            except Exception as e:
-                self.logger.error(
-                    f"Error checking draft "
-                    f"{message_id}: {e}"
-                )
+            if verify and not self._check_draft(
+                uid, message_id, draft_folder,
+            ):
                 return False
 
             self.logger.debug(
@@ -236,10 +215,9 @@ class DraftMixin:
                 f"Deleting old draft {message_id}"
             )
             try:
-                self.client.delete_messages(
-                    [int(message_id)]
-                )
-                self.client.expunge()
+                self.client.delete_messages([uid])
+                self._expunge_uids([uid])
+                self._cache_discard([uid])
                 self.logger.info(
                     f"Updated draft (deleted old "
                     f"message {message_id})"
@@ -261,3 +239,40 @@ class DraftMixin:
                 f"Error updating draft: {e}"
             )
             return False
+
+    def _check_draft(
+        self, uid: int, message_id: MessageId, draft_folder: str,
+    ) -> bool:
+        """Check that a draft exists before it is replaced.
+
+        Args:
+            uid: The draft's UID
+            message_id: The ID as passed by the caller, for logging
+            draft_folder: Name of the drafts folder
+
+        Returns:
+            bool: True if the message exists
+        """
+        try:
+            msg_data = self.client.fetch([uid], ['FLAGS'])
+            if uid not in msg_data:
+                self.logger.error(
+                    f"Draft {message_id} not found "
+                    f"in '{draft_folder}'"
+                )
+                return False
+
+            flags = msg_data[uid][b'FLAGS']
+            if b'\\Draft' not in flags:
+                self.logger.warning(
+                    f"Message {message_id} has no "
+                    f"\\Draft flag. Proceeding anyway."
+                )
+            return True
+
+        except Exception as e:
+            self.logger.error(
+                f"Error checking draft "
+                f"{message_id}: {e}"
+            )
+            return False
@@ -2,23 +2,183 @@
 Email message model for representing email data.
 """
 from dataclasses import dataclass, field
-from typing import List, Optional
+from datetime import datetime
+from functools import lru_cache, partial
+from typing import Dict, List, Optional
 import email
 from email.message import Message
 import email.header
+from email.parser import BytesParser
 import logging
 
+# Re-exported: both were defined here before moving to attachment.
+from .attachment import STREAM_CHUNK_SIZE, Attachment  # noqa: F401
+
+# Shared parser; parsebytes() keeps no state between calls.
+_PARSER = BytesParser()
+
+
+def _has_payload(part: Message) -> bool:
+    """
+    Tell whether a non-multipart part carries any body text.
+
+    This looks at the encoded text so the decode can stay
+    deferred: a part whose body decodes to nothing (say, stray
+    base64 padding) is kept, with empty ``data``.
+    """
+    payload = part.get_payload()
+    return (
+        isinstance(payload, str)
+        and bool(payload) and not payload.isspace()
+    )
+
+
+@lru_cache(maxsize=4096)
+def _decode_header_str(value: str) -> str:
+    """Decode an RFC 2047 header string, memoised by value.
+
+    Senders and mailing-list subjects recur across a mailbox, so
+    most lookups are hits. Errors propagate and are not cached.
+    """
+    return str(email.header.make_header(
+        email.header.decode_header(value)
+    ))
+
+
+def _decode_mime_header(value) -> str:
+    """Decode a header as returned by Message.get().
+
+    compat32 returns a Header object for undecodable raw bytes;
+    those are unhashable and bypass the cache.
+    """
+    if isinstance(value, str):
+        return _decode_header_str(value)
+    return str(email.header.make_header(
+        email.header.decode_header(value)
+    ))
+
+
+def _decode_header_value(value) -> str:
+    """
+    Decode a possibly MIME-encoded header value to text.
+
+    Args:
+        value: Raw header value as str or bytes
+
+    Returns:
+        str: The decoded value, or the raw value if undecodable
+    """
+    if value is None:
+        return ''
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='replace')
+    try:
+        return _decode_header_str(value)
+    except Exception:
+        return value
+
+
+def _decode_payload(payload: bytes, charset: Optional[str]) -> str:
+    """
+    Decode a body payload with its declared charset.
+
+    Falls back to UTF-8 for unknown or wrong charsets, and to
+    replacement characters as a last resort.
+
+    Args:
+        payload: The transfer-decoded payload
+        charset: The part's charset parameter, if any
+
+    Returns:
+        str: The decoded text
+    """
+    try:
+        return payload.decode(charset or 'utf-8')
+    except (UnicodeDecodeError, LookupError):
+        try:
+            return payload.decode('utf-8')
+        except UnicodeDecodeError:
+            return payload.decode('utf-8', errors='replace')
+
+
+def _format_address(address) -> str:
+    """
+    Format an IMAP ENVELOPE address as ``Name <mailbox@host>``.
+
+    Args:
+        address: imapclient Address from an ENVELOPE response
+
+    Returns:
+        str: The formatted address
+    """
+    mailbox = _decode_header_value(address.mailbox)
+    host = _decode_header_value(address.host)
+    addr = f"{mailbox}@{host}" if mailbox and host else mailbox or host
+    name = _decode_header_value(address.name)
+    return f"{name} <{addr}>" if name else addr
+
 
 @dataclass
-class Attachment:
+class EmailHeader:
     """
-    Represents an email attachment.
+    Represents the envelope of a message, fetched without its body.
     """
-    filename: str
-    content_type: str
-    data: bytes
-    content_id: Optional[str] = None
-    is_inline: bool = False
+    message_id: str
+    from_address: str
+    subject: str
+    date: Optional[datetime]
+    size: int = 0
+    keywords: List[str] = field(default_factory=list)
+    bodystructure: Optional[tuple] = None
+    _subject_lower: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    _from_address_lower: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+
+    @property
+    def subject_lower(self) -> str:
+        """The subject in lowercase, computed on first access."""
+        if self._subject_lower is None:
+            self._subject_lower = self.subject.lower()
+        return self._subject_lower
+
+    @property
+    def from_address_lower(self) -> str:
+        """The sender in lowercase, computed on first access."""
+        if self._from_address_lower is None:
+            self._from_address_lower = self.from_address.lower()
+        return self._from_address_lower
+
+    @classmethod
+    def from_fetch(
+        cls, message_id: str, fetch_data: dict,
+        keywords: Optional[List[str]] = None,
+    ) -> 'EmailHeader':
+        """
+        Create an EmailHeader from an ENVELOPE FETCH response.
+
+        Args:
+            message_id: The unique ID of the message
+            fetch_data: FETCH data with ENVELOPE and optionally
+                RFC822.SIZE and BODYSTRUCTURE
+            keywords: Optional list of IMAP keywords (tags)
+
+        Returns:
+            EmailHeader: New EmailHeader instance
+        """
+        envelope = fetch_data[b'ENVELOPE']
+        senders = envelope.from_ or ()
+        return cls(
+            message_id=message_id,
+            from_address=', '.join(_format_address(a) for a in senders),
+            subject=_decode_header_value(envelope.subject),
+            date=envelope.date,
+            size=fetch_data.get(b'RFC822.SIZE', 0),
+            keywords=keywords or [],
+            bodystructure=fetch_data.get(b'BODYSTRUCTURE'),
+        )
 
 
 @dataclass
@@ -33,6 +193,30 @@ class EmailMessage:
     attachments: List[Attachment]
     raw_message: Message
     keywords: List[str] = field(default_factory=list)
+    _subject_lower: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    _from_address_lower: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    # Decoded bodies by content type, filled by get_body().
+    _bodies: Dict[str, Optional[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False,
+    )
+
+    @property
+    def subject_lower(self) -> str:
+        """The subject in lowercase, computed on first access."""
+        if self._subject_lower is None:
+            self._subject_lower = self.subject.lower()
+        return self._subject_lower
+
+    @property
+    def from_address_lower(self) -> str:
+        """The sender in lowercase, computed on first access."""
+        if self._from_address_lower is None:
+            self._from_address_lower = self.from_address.lower()
+        return self._from_address_lower
 
     def get_body(self, content_type: str = "text/plain") -> Optional[str]:
         """
@@ -45,34 +229,22 @@ class EmailMessage:
         Returns:
             str: The email body content or None if not found
         """
-        if self.raw_message.is_multipart():
-            for part in self.raw_message.walk():
-                if part.get_content_type() == content_type:
-                    payload = part.get_payload(decode=True)
-                    if payload:
-                        try:
-                            # Try to decode with the charset specified in the message
-                            charset = part.get_content_charset() or 'utf-8'
-                            return payload.decode(charset)
-                        except (UnicodeDecodeError, LookupError):
-                            # Fallback to utf-8 if charset fails
-                            try:
-                                return payload.decode('utf-8')
-                            except UnicodeDecodeError:
-                                # Last resort: decode with errors='replace'
-                                return payload.decode('utf-8', errors='replace')
-        else:
-            if self.raw_message.get_content_type() == content_type:
-                payload = self.raw_message.get_payload(decode=True)
+        if content_type not in self._bodies:
+            self._bodies[content_type] = self._find_body(content_type)
+        return self._bodies[content_type]
+
+    def _find_body(self, content_type: str) -> Optional[str]:
+        """Decode the first non-empty part of the given type."""
+        msg = self.raw_message
+        # Most mail is single-part; skip the walk() generator.
+        parts = msg.walk() if msg.is_multipart() else (msg,)
+        for part in parts:
+            if part.get_content_type() == content_type:
+                payload = part.get_payload(decode=True)
                 if payload:
-                    try:
-                        charset = self.raw_message.get_content_charset() or 'utf-8'
-                        return payload.decode(charset)
-                    except (UnicodeDecodeError, LookupError):
-                        try:
-                            return payload.decode('utf-8')
-                        except UnicodeDecodeError:
-                            return payload.decode('utf-8', errors='replace')
+                    return _decode_payload(
+                        payload, part.get_content_charset(),
+                    )
         return None
 
     @classmethod
@@ -95,11 +267,14 @@ class EmailMessage:
         Returns:
             EmailMessage: New EmailMessage instance
         """
-        if logger:
+        # Decided once, so disabled debug logging costs no string
+        # formatting per part.
+        debug = logger is not None and logger.isEnabledFor(logging.DEBUG)
+        if debug:
             logger.debug(f"Parsing email message ID: {message_id}")
 
         # Parse the email message
-        msg = email.message_from_bytes(message_data)
+        msg = _PARSER.parsebytes(message_data)
 
         # Extract basic headers
         from_address = msg.get('From', '')
@@ -109,35 +284,31 @@ class EmailMessage:
         # Decode headers if needed
         if from_address:
             try:
-                decoded_from = str(email.header.make_header(
-                    email.header.decode_header(from_address)
-                ))
-                if logger and decoded_from != from_address:
+                decoded_from = _decode_mime_header(from_address)
+                if debug and decoded_from != from_address:
                     logger.debug(
                         f"Decoded From: "
                         f"'{from_address}' -> '{decoded_from}'"
                     )
                 from_address = decoded_from
             except Exception as e:
-                if logger:
+                if debug:
                     logger.debug(f"Error decoding From header: {e}")
 
         if subject:
             try:
-                decoded_subject = str(email.header.make_header(
-                    email.header.decode_header(subject)
-                ))
-                if logger and decoded_subject != subject:
+                decoded_subject = _decode_mime_header(subject)
+                if debug and decoded_subject != subject:
                     logger.debug(
                         f"Decoded Subject: "
                         f"'{subject}' -> '{decoded_subject}'"
                     )
                 subject = decoded_subject
             except Exception as e:
-                if logger:
+                if debug:
                     logger.debug(f"Error decoding Subject header: {e}")
 
-        if logger:
+        if debug:
             logger.debug(
                 f"Parsed headers - From: '{from_address}', "
                 f"Subject: '{subject}', Date: '{date}'"
@@ -147,15 +318,19 @@ class EmailMessage:
         attachments = []
 
         if include_attachments:
-            if logger:
+            if debug:
                 logger.debug("Scanning for attachments...")
 
             for part in msg.walk():
+                # Containers carry no payload of their own, so skip
+                # the header parsing below for them.
+                if part.is_multipart():
+                    continue
                 content_disposition = part.get_content_disposition()
                 content_type = part.get_content_type()
                 content_id = part.get('Content-ID')
 
-                if logger:
+                if debug:
                     logger.debug(
                         f"Message part - Type: '{content_type}'"
                         f", Disposition: '{content_disposition}'"
@@ -166,29 +341,30 @@ class EmailMessage:
 
                 # Handle regular attachments
                 if content_disposition == 'attachment' and filename:
-                    if logger:
+                    if debug:
                         logger.debug(
                             f"Found attachment - "
                             f"Filename: '{filename}', "
                             f"Type: '{content_type}'"
                         )
 
-                    data = part.get_payload(decode=True)
-
-                    if data:
-                        if logger:
-                            logger.debug(f"Attachment data size: {len(data)} bytes")
+                    if _has_payload(part):
+                        if debug:
+                            logger.debug(
+                                f"Attachment encoded size: "
+                                f"{len(part.get_payload())} bytes"
+                            )
 
-                        attachment = Attachment(
+                        attachment = Attachment.deferred(
+                            partial(part.get_payload, decode=True),
                             filename=filename,
                             content_type=content_type,
-                            data=data,
                             content_id=content_id,
                             is_inline=False
                         )
                         attachments.append(attachment)
                     else:
-                        if logger:
+                        if debug:
                             logger.debug("Attachment has no data, skipping")
 
                 # Handle inline images
@@ -196,43 +372,41 @@ class EmailMessage:
                     content_disposition == 'inline'
                     or (content_id and content_type.startswith('image/'))
                 ):
-                    if logger:
+                    if debug:
                         logger.debug(
                             f"Found inline image - "
                             f"Type: '{content_type}', "
                             f"Content-ID: '{content_id}'"
                         )
 
-                    data = part.get_payload(decode=True)
-
-                    if data:
+                    if _has_payload(part):
                         # Generate filename if not provided
                         if not filename:
                             ext = content_type.split('/')[-1]
                             extension = ext if '/' in content_type else 'bin'
                             filename = f"inline_image.{extension}"
 
-                        if logger:
+                        if debug:
                             logger.debug(
-                                f"Inline image data: "
-                                f"{len(data)} bytes, "
+                                f"Inline image encoded size: "
+                                f"{len(part.get_payload())} bytes, "
                                 f"filename: '{filename}'"
                             )
 
-                        attachment = Attachment(
+                        attachment = Attachment.deferred(
+                            partial(part.get_payload, decode=True),
                             filename=filename,
                             content_type=content_type,
-                            data=data,
                             content_id=content_id,
                             is_inline=True
                         )
                         attachments.append(attachment)
                     else:
-                        if logger:
+                        if debug:
                             logger.debug("Inline image has no data, skipping")
 
                 elif filename and not content_disposition:
-                    if logger:
+                    if debug:
                         logger.debug(
                             f"Attachment without Disposition"
                             f" - Filename: '{filename}'"
@@ -240,26 +414,25 @@ class EmailMessage:
                         )
 
                     # Try to extract it anyway
-                    data = part.get_payload(decode=True)
-
-                    if data:
-                        if logger:
+                    if _has_payload(part):
+                        if debug:
                             logger.debug(
                                 f"Extracted attachment "
                                 f"without Disposition - "
-                                f"Size: {len(data)} bytes"
+                                f"Encoded size: "
+                                f"{len(part.get_payload())} bytes"
                             )
 
-                        attachment = Attachment(
+                        attachment = Attachment.deferred(
+                            partial(part.get_payload, decode=True),
                             filename=filename,
                             content_type=content_type,
-                            data=data,
                             content_id=content_id,
                             is_inline=False
                         )
                         attachments.append(attachment)
         else:
-            if logger:
+            if debug:
                 logger.debug("Skipping attachment processing as requested")
 
         return cls(
@@ -0,0 +1,338 @@
+"""
+Mixin providing batched message retrieval by UID.
+"""
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from imapclient import IMAPClient
+from imapclient.exceptions import IMAPClientError
+
+from .email_message import EmailMessage
+from .message_ops_mixin import _batched, _extract_keywords
+
+_BODY_FIELDS = ['BODY.PEEK[]', 'FLAGS']
+# Header block only: a few KB per message regardless of attachments.
+_HEADER_FIELDS = ['BODY.PEEK[HEADER]', 'FLAGS']
+# A partial BODY[TEXT]<0.n> fetch comes back keyed by its origin.
+_PREVIEW_KEY = b'BODY[TEXT]<0>'
+
+
+class FetchMixin:
+    """Search-and-fetch message retrieval for ImapClient."""
+
+    def get_messages(
+        self,
+        search_criteria: List[str] = None,
+        folder: str = 'INBOX',
+        limit: Optional[int] = None,
+        include_attachments: bool = True,
+        readonly: bool = False,
+    ) -> List[Tuple[int, EmailMessage]]:
+        """Get messages from a folder based on search criteria.
+
+        Args:
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+            limit: Maximum number of messages to return
+            include_attachments: Whether to include attachments
+            readonly: Open the folder with EXAMINE; later flag or
+                move calls on the folder then fail until it is
+                selected read-write again
+
+        Returns:
+            List of (message_id, EmailMessage) tuples
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return []
+
+        try:
+            return list(self._iter_messages(
+                search_criteria, folder, limit, include_attachments,
+                readonly=readonly,
+            ))
+        except Exception as e:
+            if isinstance(e, IMAPClientError):
+                self._invalidate_folder_cache()
+            self.logger.error("Error getting messages: %s", e)
+            return []
+
+    def iter_messages(
+        self,
+        search_criteria: List[str] = None,
+        folder: str = 'INBOX',
+        limit: Optional[int] = None,
+        include_attachments: bool = True,
+        readonly: bool = False,
+    ) -> Iterator[Tuple[int, EmailMessage]]:
+        """Yield messages as each fetch batch is parsed.
+
+        Unlike get_messages, only one batch of messages is held at
+        a time, so memory stays bounded by fetch_batch_size however
+        many messages match. Errors end the iteration and are
+        logged.
+
+        Args:
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+            limit: Maximum number of messages to yield
+            include_attachments: Whether to include attachments
+            readonly: Open the folder with EXAMINE
+
+        Yields:
+            Tuple of (message_id, EmailMessage), newest first
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return
+
+        try:
+            yield from self._iter_messages(
+                search_criteria, folder, limit, include_attachments,
+                readonly=readonly,
+            )
+        except Exception as e:
+            if isinstance(e, IMAPClientError):
+                self._invalidate_folder_cache()
+            self.logger.error("Error getting messages: %s", e)
+
+    def _iter_messages(
+        self,
+        search_criteria: Optional[List[str]],
+        folder: str,
+        limit: Optional[int],
+        include_attachments: bool,
+        headers_only: bool = False,
+        readonly: bool = False,
+        preview_bytes: int = 0,
+    ) -> Iterator[Tuple[int, EmailMessage]]:
+        """Yield messages one fetch batch at a time.
+
+        Only one batch of message bodies is held at once, so
+        callers that process and drop each message keep memory
+        bounded by fetch_batch_size rather than the mailbox size.
+
+        Args:
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+            limit: Maximum number of messages to return
+            include_attachments: Whether to include attachments
+            headers_only: Fetch only the header block; such
+                partial messages bypass the message cache
+            readonly: Open the folder with EXAMINE
+            preview_bytes: With headers_only, also fetch this many
+                leading bytes of the message text
+
+        Yields:
+            Tuple of (message_id, EmailMessage), newest first
+        """
+        message_ids = self._search_uids(
+            search_criteria, folder, limit, readonly,
+        )
+        if not message_ids:
+            return
+
+        if headers_only:
+            fields = _HEADER_FIELDS
+            if preview_bytes > 0:
+                # RFC 3501 partial fetch: only the first bytes of
+                # the text, however large the attachments are.
+                fields = fields + [f'BODY.PEEK[TEXT]<0.{preview_bytes}>']
+            for batch in _batched(message_ids, self.fetch_batch_size):
+                yield from self._fetch_uids(
+                    self.client, batch, False, fields,
+                )
+            return
+
+        uidvalidity = self._uidvalidity
+        cached = self._cache_get(
+            folder, uidvalidity, message_ids, include_attachments,
+        )
+        for batch in _batched(message_ids, self.fetch_batch_size):
+            missing = [m for m in batch if m not in cached]
+            fetched = self._fetch_uids(
+                self.client, missing, include_attachments,
+            ) if missing else []
+            self._cache_put(
+                folder, uidvalidity, fetched, include_attachments,
+            )
+            if not cached:
+                yield from fetched
+                continue
+
+            found = dict(fetched)
+            for message_id in batch:
+                email_message = cached.get(message_id)
+                if email_message is None:
+                    email_message = found.get(message_id)
+                if email_message is not None:
+                    yield message_id, email_message
+
+    def _search_uids(
+        self,
+        search_criteria: Optional[List[str]],
+        folder: str,
+        limit: Optional[int],
+        readonly: bool = False,
+    ) -> List[int]:
+        """Select a folder and search it for matching UIDs.
+
+        Args:
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+            limit: Maximum number of UIDs to return
+            readonly: Open the folder with EXAMINE, which does not
+                clear \\Recent or contend with writing sessions
+
+        Returns:
+            Matching UIDs, most recent first
+        """
+        if search_criteria is None:
+            search_criteria = ['UNSEEN']
+
+        info = self.client.select_folder(folder, readonly=readonly)
+        self._uidvalidity = info.get(b'UIDVALIDITY')
+
+        self.logger.info("Searching with criteria: %s", search_criteria)
+        message_ids = self.client.search(search_criteria)
+
+        if not message_ids:
+            self.logger.info("No messages found")
+            return []
+
+        self.logger.info("Found %s messages", len(message_ids))
+
+        message_ids = sorted(message_ids, reverse=True)
+
+        if limit is not None and limit > 0:
+            message_ids = message_ids[:limit]
+            self.logger.info(
+                "Limited to %s most recent messages", len(message_ids),
+            )
+        return message_ids
+
+    def _fetch_uids(
+        self,
+        session: IMAPClient,
+        message_ids: List[int],
+        include_attachments: bool,
+        fields: List[str] = _BODY_FIELDS,
+    ) -> List[Tuple[int, EmailMessage]]:
+        """Fetch and parse messages in batches on a session.
+
+        Args:
+            session: The IMAP session to fetch on
+            message_ids: UIDs to fetch, in the desired order
+            include_attachments: Whether to include attachments
+            fields: FETCH items; _BODY_FIELDS or _HEADER_FIELDS
+
+        Returns:
+            List of (message_id, EmailMessage) tuples
+        """
+        messages = []
+        for chunk in _batched(message_ids, self.fetch_batch_size):
+            try:
+                raw_messages = session.fetch(chunk, fields)
+            except IMAPClientError as e:
+                # A single bad message can make the server reject
+                # the whole batch; retry one by one so the rest
+                # still come through.
+                self.logger.warning(
+                    "Batch FETCH of %s messages failed (%s), "
+                    "retrying individually", len(chunk), e,
+                )
+                raw_messages = self._fetch_each(
+                    session, chunk, fields,
+                )
+            for message_id in chunk:
+                # Pop rather than index so each raw body can be
+                # freed as soon as it has been parsed.
+                fetch_data = raw_messages.pop(message_id, None)
+                if fetch_data is None:
+                    self.logger.warning(
+                        "Message %s not returned by server",
+                        message_id,
+                    )
+                    continue
+                try:
+                    email_message = self._parse_fetched(
+                        message_id,
+                        fetch_data,
+                        include_attachments,
+                    )
+                    messages.append(
+                        (message_id, email_message)
+                    )
+                except Exception as e:
+                    self.logger.error(
+                        "Error fetching message %s: %s", message_id, e,
+                    )
+        return messages
+
+    def _fetch_each(
+        self,
+        session: IMAPClient,
+        message_ids: List[int],
+        fields: List[str] = _BODY_FIELDS,
+    ) -> Dict[int, dict]:
+        """Fetch messages one FETCH per UID, skipping failures.
+
+        Args:
+            session: The IMAP session to fetch on
+            message_ids: UIDs to fetch
+            fields: FETCH items to request
+
+        Returns:
+            FETCH data keyed by UID for the messages that worked
+        """
+        raw_messages = {}
+        for message_id in message_ids:
+            try:
+                raw_messages.update(
+                    session.fetch([message_id], fields)
+                )
+            except IMAPClientError as e:
+                self.logger.error(
+                    "Error fetching message %s: %s", message_id, e,
+                )
+        return raw_messages
+
+    def _parse_fetched(
+        self,
+        message_id: int,
+        fetch_data: dict,
+        include_attachments: bool,
+    ) -> EmailMessage:
+        """Build an EmailMessage from one FETCH response entry.
+
+        Args:
+            message_id: The UID the data belongs to
+            fetch_data: The FETCH data dict for that UID, with
+                either the full message or just its header and
+                an optional text preview
+            include_attachments: Whether to include attachments
+
+        Returns:
+            EmailMessage: The parsed message
+        """
+        keywords = _extract_keywords(
+            fetch_data.get(b'FLAGS', ())
+        )
+        body = fetch_data.get(b'BODY[]')
+        if body is None:
+            # The header block ends with its blank line, so a text
+            # preview can simply be appended to it.
+            body = (
+                fetch_data[b'BODY[HEADER]']
+                + (fetch_data.get(_PREVIEW_KEY) or b'')
+            )
+        return EmailMessage.from_bytes(
+            str(message_id),
+            body,
+            self.logger,
+            include_attachments,
+            keywords=keywords,
+        )
@@ -0,0 +1,91 @@
+"""
+Mixin providing folder listing and lookup operations.
+"""
+from typing import List
+
+from imapclient.exceptions import IMAPClientError
+
+
+class FolderMixin:
+    """Folder operations for ImapClient."""
+
+    def list_folders(self) -> List[str]:
+        """List all folders in the mailbox.
+
+        Also seeds the set of folders known to exist, so later
+        existence checks need no server round trip.
+
+        Returns:
+            List[str]: List of folder names
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return []
+
+        try:
+            folders = self.client.list_folders()
+            folder_names = [f[2] for f in folders]
+            self._folder_cache = set(folder_names)
+            return folder_names
+        except Exception as e:
+            self.logger.error(
+                f"Error listing folders: {e}"
+            )
+            return []
+
+    def _invalidate_folder_cache(self) -> None:
+        """Forget which folders are known to exist.
+
+        Called when the server rejects a folder operation, since
+        the folder may have been renamed or deleted by another
+        client.
+        """
+        self._folder_cache = None
+
+    def _ensure_folder_exists(
+        self, folder: str,
+    ) -> bool:
+        """Ensure a folder exists, creating it if needed.
+
+        Folders already known to exist (listed, checked or
+        created on this connection) cost nothing; otherwise a
+        single-folder STATUS is used instead of listing the
+        whole mailbox.
+
+        Args:
+            folder: The folder name to check/create
+
+        Returns:
+            bool: True if folder exists or was created
+        """
+        if self._folder_cache is None:
+            self._folder_cache = set()
+        elif folder in self._folder_cache:
+            return True
+
+        try:
+            self.client.folder_status(folder, [b'MESSAGES'])
+            self._folder_cache.add(folder)
+            return True
+        except IMAPClientError:
+            pass
+
+        self.logger.warning(
+            f"Folder '{folder}' does not exist, "
+            f"attempting to create it"
+        )
+        try:
+            self.client.create_folder(folder)
+            self._folder_cache.add(folder)
+            self.logger.info(
+                f"Created folder '{folder}'"
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Error creating folder "
+                f"'{folder}': {e}"
+            )
+            return False
+        return True
@@ -0,0 +1,268 @@
+"""
+Mixin providing header-only retrieval and on-demand body fetches.
+"""
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from .bodystructure import decode_part, find_attachment_parts
+from .email_message import Attachment, EmailHeader, EmailMessage
+from .message_ops_mixin import (
+    MessageId, _batched, _extract_keywords, _to_uid,
+    _UID_CHUNK_SIZE,
+)
+
+_ENVELOPE_FIELDS = ['ENVELOPE', 'RFC822.SIZE', 'BODYSTRUCTURE', 'FLAGS']
+
+
+class HeaderFetchMixin:
+    """Header-first message retrieval for ImapClient."""
+
+    def get_envelopes(
+        self,
+        search_criteria: List[str] = None,
+        folder: str = 'INBOX',
+        limit: Optional[int] = None,
+        readonly: bool = False,
+    ) -> List[Tuple[int, EmailHeader]]:
+        """Get message envelopes without downloading bodies.
+
+        Fetches ENVELOPE, RFC822.SIZE, BODYSTRUCTURE and FLAGS,
+        which is typically a few hundred bytes per message. Use
+        fetch_body() for the messages that turn out to matter.
+
+        Args:
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+            limit: Maximum number of messages to return
+            readonly: Open the folder with EXAMINE
+
+        Returns:
+            List of (message_id, EmailHeader) tuples
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return []
+
+        try:
+            message_ids = self._search_uids(
+                search_criteria, folder, limit, readonly,
+            )
+            headers = []
+            for chunk in _batched(message_ids, _UID_CHUNK_SIZE):
+                raw = self.client.fetch(chunk, _ENVELOPE_FIELDS)
+                for message_id in chunk:
+                    try:
+                        data = raw[message_id]
+                        header = EmailHeader.from_fetch(
+                            str(message_id), data,
+                            _extract_keywords(
+                                data.get(b'FLAGS', ())
+                            ),
+                        )
+                        headers.append((message_id, header))
+                    except Exception as e:
+                        self.logger.error(
+                            f"Error reading envelope of "
+                            f"message {message_id}: {e}"
+                        )
+            return headers
+        except Exception as e:
+            self.logger.error(
+                f"Error getting envelopes: {e}"
+            )
+            return []
+
+    def get_message_headers(
+        self,
+        search_criteria: List[str] = None,
+        folder: str = 'INBOX',
+        limit: Optional[int] = None,
+        readonly: bool = False,
+        preview_bytes: int = 0,
+    ) -> List[Tuple[int, EmailMessage]]:
+        """Get messages with only their header block fetched.
+
+        Uses BODY.PEEK[HEADER], so every header (List-Id,
+        Reply-To, X-* ...) is available on raw_message while the
+        body and attachments are never downloaded. For just
+        subject/sender/date, get_envelopes() is smaller still.
+
+        Args:
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+            limit: Maximum number of messages to return
+            readonly: Open the folder with EXAMINE
+            preview_bytes: Also fetch up to this many leading
+                bytes of the message text (BODY.PEEK[TEXT]<0.n>),
+                enough for a snippet via get_body() on simple
+                messages without downloading attachments
+
+        Returns:
+            List of (message_id, EmailMessage) tuples without
+            attachments
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return []
+
+        try:
+            return list(self._iter_messages(
+                search_criteria, folder, limit, False,
+                headers_only=True, readonly=readonly,
+                preview_bytes=preview_bytes,
+            ))
+        except Exception as e:
+            self.logger.error(
+                f"Error getting message headers: {e}"
+            )
+            return []
+
+    def _get_filtered_messages(
+        self,
+        header_filter: Callable[[EmailHeader], bool],
+        search_criteria: Optional[List[str]],
+        folder: str,
+    ) -> Iterator[Tuple[int, EmailMessage]]:
+        """Fetch full messages only for envelopes that pass a filter.
+
+        Bodies are fetched and yielded one batch at a time.
+
+        Args:
+            header_filter: Function taking an EmailHeader,
+                returns True to fetch the full message
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+
+        Yields:
+            Tuple of (message_id, EmailMessage)
+        """
+        headers = self.get_envelopes(search_criteria, folder)
+        wanted = []
+        for message_id, header in headers:
+            try:
+                if header_filter(header):
+                    wanted.append(_to_uid(message_id))
+            except Exception as e:
+                self.logger.error(
+                    f"Error filtering message "
+                    f"{message_id}: {e}"
+                )
+
+        self.logger.info(
+            f"{len(wanted)} of {len(headers)} messages "
+            f"passed the header filter"
+        )
+        for batch in _batched(wanted, self.fetch_batch_size):
+            yield from self._fetch_uids(self.client, batch, True)
+
+    def fetch_body(
+        self,
+        message_id: MessageId,
+        include_attachments: bool = True,
+    ) -> Optional[EmailMessage]:
+        """Fetch the full message for a UID in the current folder.
+
+        Args:
+            message_id: The UID of the message
+            include_attachments: Whether to include attachments
+
+        Returns:
+            EmailMessage, or None if not found or on error
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return None
+
+        try:
+            uid = _to_uid(message_id)
+            raw = self.client.fetch([uid], ['BODY.PEEK[]', 'FLAGS'])
+            if uid not in raw:
+                self.logger.info(
+                    f"Message {message_id} not found"
+                )
+                return None
+            return self._parse_fetched(
+                uid, raw[uid], include_attachments,
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Error fetching body of message "
+                f"{message_id}: {e}"
+            )
+            return None
+
+    def fetch_attachments(
+        self,
+        message_id: MessageId,
+        extensions: Optional[Sequence[str]] = None,
+        bodystructure=None,
+    ) -> List[Attachment]:
+        """Fetch only the attachment parts of a message.
+
+        Uses BODYSTRUCTURE to find the section numbers of matching
+        attachments and requests just those with BODY.PEEK[n], so
+        text bodies and unrelated parts are never downloaded.
+
+        Args:
+            message_id: The UID of the message in the current folder
+            extensions: Extensions to keep (e.g. ['pdf']), or None
+                for all attachments
+            bodystructure: BODYSTRUCTURE already fetched, e.g.
+                EmailHeader.bodystructure from get_envelopes()
+
+        Returns:
+            List of Attachment objects, empty if none or on error
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return []
+
+        try:
+            uid = _to_uid(message_id)
+            if bodystructure is None:
+                raw = self.client.fetch([uid], ['BODYSTRUCTURE'])
+                if uid not in raw:
+                    self.logger.info(
+                        f"Message {message_id} not found"
+                    )
+                    return []
+                bodystructure = raw[uid][b'BODYSTRUCTURE']
+
+            parts = find_attachment_parts(bodystructure, extensions)
+            if not parts:
+                return []
+
+            raw = self.client.fetch(
+                [uid], [f'BODY.PEEK[{p.section}]' for p in parts],
+            )
+            data = raw.get(uid, {})
+            attachments = []
+            for part in parts:
+                body = data.get(f'BODY[{part.section}]'.encode())
+                if body is None:
+                    self.logger.warning(
+                        f"Section {part.section} of message "
+                        f"{message_id} missing from response"
+                    )
+                    continue
+                attachments.append(Attachment(
+                    filename=part.filename or f"part_{part.section}",
+                    content_type=part.content_type,
+                    data=decode_part(body, part.encoding),
+                    content_id=part.content_id,
+                    is_inline=part.disposition == 'inline',
+                ))
+            return attachments
+        except Exception as e:
+            self.logger.error(
+                f"Error fetching attachments of message "
+                f"{message_id}: {e}"
+            )
+            return []
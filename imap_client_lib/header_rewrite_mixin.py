@@ -0,0 +1,182 @@
+"""
+Mixin providing moves that rewrite message headers on the way.
+"""
+from email.header import Header
+from typing import Dict
+
+from .message_ops_mixin import MessageId, _to_uid
+
+
+def _replace_headers(
+    raw: bytes, custom_headers: Dict[str, str],
+) -> bytes:
+    """Set headers on a raw message without parsing its body.
+
+    Existing headers of the same names (including folded
+    continuation lines) are removed and the new ones appended to
+    the header block. The body, attachments included, is copied
+    through untouched.
+
+    Args:
+        raw: The message as received from the server
+        custom_headers: Header names and values to set
+
+    Returns:
+        bytes: The message with the headers replaced
+    """
+    end = raw.find(b'\r\n\r\n')
+    newline = b'\r\n'
+    if end < 0:
+        end = raw.find(b'\n\n')
+        newline = b'\n'
+    if end < 0:
+        head, body = raw.rstrip(b'\r\n'), b''
+    else:
+        head = raw[:end]
+        body = raw[end + 2 * len(newline):]
+
+    names = {name.lower().encode('ascii') for name in custom_headers}
+    kept = []
+    dropping = False
+    for line in head.split(newline):
+        if line[:1] in (b' ', b'\t'):
+            if not dropping:
+                kept.append(line)
+            continue
+        name = line.split(b':', 1)[0].strip().lower()
+        dropping = name in names
+        if not dropping:
+            kept.append(line)
+
+    linesep = newline.decode('ascii')
+    for name, value in custom_headers.items():
+        # Fold long values and RFC 2047-encode non-ASCII ones with
+        # the message's own line ending, so header framing holds.
+        charset = 'us-ascii' if value.isascii() else 'utf-8'
+        value = Header(
+            value, charset, header_name=name,
+        ).encode(linesep=linesep)
+        kept.append(f"{name}: {value}".encode('ascii'))
+
+    return b''.join((
+        newline.join(kept), newline, newline, body,
+    ))
+
+
+class HeaderRewriteMixin:
+    """Header-rewriting moves for ImapClient."""
+
+    def move_with_headers(
+        self,
+        message_id: MessageId,
+        destination_folder: str,
+        custom_headers: Dict[str, str],
+    ) -> bool:
+        """Move a message while adding custom headers.
+
+        Fetches the original message, adds custom headers,
+        recreates it in the destination folder, then deletes
+        the original.
+
+        Args:
+            message_id: The ID of the message to move
+            destination_folder: The destination folder
+            custom_headers: Headers to add
+
+        Returns:
+            bool: True if successful
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return False
+
+        if not destination_folder:
+            self.logger.debug(
+                f"No move folder for message "
+                f"{message_id}, skipping"
+            )
+            return True
+
+        if not custom_headers:
+            self.logger.debug(
+                "No custom headers, using regular move"
+            )
+            return self.move_to_folder(
+                message_id, destination_folder
+            )
+
+        try:
+            self.logger.debug(
+                f"Fetching message {message_id} "
+                f"for header modification"
+            )
+            uid = _to_uid(message_id)
+            raw_data = self.client.fetch(
+                [uid],
+                ['BODY.PEEK[]', 'FLAGS', 'INTERNALDATE'],
+            )
+
+            if uid not in raw_data:
+                self.logger.error(
+                    f"Message {message_id} not found"
+                )
+                return False
+
+            msg_info = raw_data[uid]
+            orig_bytes = msg_info[b'BODY[]']
+            orig_flags = msg_info[b'FLAGS']
+            orig_date = msg_info[b'INTERNALDATE']
+
+            # Rewrite the header block only; re-serialising a
+            # parsed message would decode and re-encode every
+            # attachment.
+            modified_bytes = _replace_headers(
+                orig_bytes, custom_headers,
+            )
+            self.logger.debug(
+                f"Set headers: {', '.join(custom_headers)}"
+            )
+
+            if not self._ensure_folder_exists(
+                destination_folder
+            ):
+                return False
+
+            self.logger.debug(
+                f"Appending modified message "
+                f"to '{destination_folder}'"
+            )
+            result = self.client.append(
+                destination_folder, modified_bytes,
+                flags=orig_flags, msg_time=orig_date,
+            )
+
+            if result:
+                self.logger.debug(
+                    f"Deleting original message "
+                    f"{message_id}"
+                )
+                self.client.delete_messages([uid])
+                self._expunge_uids([uid])
+                self._cache_discard([uid])
+                self.logger.info(
+                    f"Moved message {message_id} to "
+                    f"'{destination_folder}' with headers"
+                )
+                return True
+            else:
+                self.logger.error(
+                    f"Failed to append message "
+                    f"to '{destination_folder}'"
+                )
+                return False
+
+        except Exception as e:
+            self.logger.error(
+                f"Error moving message {message_id} "
+                f"with headers to "
+                f"'{destination_folder}': {e}"
+            )
+            return False
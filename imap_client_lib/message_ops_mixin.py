@@ -1,8 +1,30 @@
 """
 Mixin providing message management operations.
 """
-from typing import List, Optional, Dict
-import email
+from typing import Iterator, List, Optional, Dict, Sequence, TypeVar, Union
+
+from imapclient.exceptions import IMAPClientError
+
+# Upper bound on UIDs per STORE/MOVE command (RFC 2683 3.2.1.5).
+_UID_CHUNK_SIZE = 1000
+
+# UIDs are ints (RFC 3501); str is still accepted at the API boundary.
+MessageId = Union[int, str]
+
+T = TypeVar('T')
+
+
+def _batched(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """Yield consecutive slices of at most ``size`` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _to_uid(message_id: MessageId) -> int:
+    """Return a message ID as an int UID, parsing only strings."""
+    if isinstance(message_id, int):
+        return message_id
+    return int(message_id)
 
 
 def _extract_keywords(flags: tuple) -> List[str]:
@@ -32,7 +54,7 @@ def _extract_keywords(flags: tuple) -> List[str]:
 class MessageOpsMixin:
     """Message management operations for ImapClient."""
 
-    def mark_as_read(self, message_id: str) -> bool:
+    def mark_as_read(self, message_id: MessageId) -> bool:
         """Mark a message as read.
 
         Args:
@@ -49,7 +71,7 @@ class MessageOpsMixin:
 
         try:
             self.client.add_flags(
-                [int(message_id)], [b'\\Seen']
+                [_to_uid(message_id)], [b'\\Seen']
             )
             self.logger.info(
                 f"Marked message {message_id} as read"
@@ -62,7 +84,7 @@ class MessageOpsMixin:
             )
             return False
 
-    def mark_as_unread(self, message_id: str) -> bool:
+    def mark_as_unread(self, message_id: MessageId) -> bool:
         """Mark a message as unread.
 
         Args:
@@ -79,7 +101,7 @@ class MessageOpsMixin:
 
         try:
             self.client.remove_flags(
-                [int(message_id)], [b'\\Seen']
+                [_to_uid(message_id)], [b'\\Seen']
             )
             self.logger.info(
                 f"Marked message {message_id} as unread"
@@ -92,8 +114,75 @@ class MessageOpsMixin:
             )
             return False
 
+    def mark_many_as_read(
+        self, message_ids: List[MessageId],
+    ) -> bool:
+        """Mark several messages as read with as few STOREs as possible.
+
+        Args:
+            message_ids: The IDs of the messages
+
+        Returns:
+            bool: True if all messages were marked
+        """
+        return self._set_seen_many(message_ids, True)
+
+    def mark_many_as_unread(
+        self, message_ids: List[MessageId],
+    ) -> bool:
+        """Mark several messages as unread with as few STOREs as possible.
+
+        Args:
+            message_ids: The IDs of the messages
+
+        Returns:
+            bool: True if all messages were marked
+        """
+        return self._set_seen_many(message_ids, False)
+
+    def _set_seen_many(
+        self, message_ids: List[MessageId], seen: bool,
+    ) -> bool:
+        """Add or remove the Seen flag, up to 1000 UIDs per STORE.
+
+        Args:
+            message_ids: The IDs of the messages
+            seen: True to add the flag, False to remove it
+
+        Returns:
+            bool: True if successful
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return False
+
+        if not message_ids:
+            return True
+
+        state = 'read' if seen else 'unread'
+        store = (
+            self.client.add_flags if seen
+            else self.client.remove_flags
+        )
+        try:
+            uids = [_to_uid(m) for m in message_ids]
+            for chunk in _batched(uids, _UID_CHUNK_SIZE):
+                store(chunk, [b'\\Seen'])
+            self.logger.info(
+                f"Marked {len(uids)} message(s) as {state}"
+            )
+            return True
+        except Exception as e:
+            self.logger.error(
+                f"Error marking {len(message_ids)} "
+                f"message(s) as {state}: {e}"
+            )
+            return False
+
     def get_keywords(
-        self, message_id: str,
+        self, message_id: MessageId,
     ) -> List[str]:
         """Get custom keywords (tags) on a message.
 
@@ -113,10 +202,9 @@ class MessageOpsMixin:
             return []
 
         try:
-            result = self.client.fetch(
-                [int(message_id)], ['FLAGS']
-            )
-            flags = result[int(message_id)][b'FLAGS']
+            uid = _to_uid(message_id)
+            result = self.client.fetch([uid], ['FLAGS'])
+            flags = result[uid][b'FLAGS']
             keywords = _extract_keywords(flags)
             self.logger.debug(
                 f"Keywords for message {message_id}: "
@@ -131,7 +219,7 @@ class MessageOpsMixin:
             return []
 
     def add_keyword(
-        self, message_id: str, keyword: str,
+        self, message_id: MessageId, keyword: str,
     ) -> bool:
         """Add a keyword (tag) to a message.
 
@@ -150,7 +238,7 @@ class MessageOpsMixin:
 
         try:
             self.client.add_flags(
-                [int(message_id)],
+                [_to_uid(message_id)],
                 [keyword.encode()],
             )
             self.logger.info(
@@ -166,7 +254,7 @@ class MessageOpsMixin:
             return False
 
     def remove_keyword(
-        self, message_id: str, keyword: str,
+        self, message_id: MessageId, keyword: str,
     ) -> bool:
         """Remove a keyword (tag) from a message.
 
@@ -185,7 +273,7 @@ class MessageOpsMixin:
 
         try:
             self.client.remove_flags(
-                [int(message_id)],
+                [_to_uid(message_id)],
                 [keyword.encode()],
             )
             self.logger.info(
@@ -202,12 +290,15 @@ class MessageOpsMixin:
 
     def move_to_folder(
         self,
-        message_id: str,
+        message_id: MessageId,
         folder: str,
         custom_headers: Optional[Dict[str, str]] = None,
     ) -> bool:
         """Move a message to a different folder.
 
+        Moving several messages is cheaper with move_many(),
+        which issues one MOVE per 1000 UIDs.
+
         Args:
             message_id: The ID of the message to move
             folder: The destination folder
@@ -234,26 +325,64 @@ class MessageOpsMixin:
                 message_id, folder, custom_headers
             )
 
+        return self.move_many([message_id], folder)
+
+    def move_many(
+        self, message_ids: List[MessageId], folder: str,
+    ) -> bool:
+        """Move several messages with as few MOVE commands as possible.
+
+        The destination is checked once and the UIDs are moved in
+        chunks of up to 1000 per command.
+
+        Args:
+            message_ids: The IDs of the messages to move
+            folder: The destination folder
+
+        Returns:
+            bool: True if all messages were moved
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return False
+
+        if not message_ids:
+            return True
+
         try:
             if not self._ensure_folder_exists(folder):
                 return False
 
-            self.client.move([int(message_id)], folder)
+            uids = [_to_uid(m) for m in message_ids]
+            has_move = self.client.has_capability('MOVE')
+            for chunk in _batched(uids, _UID_CHUNK_SIZE):
+                if has_move:
+                    self.client.move(chunk, folder)
+                else:
+                    # RFC 6851 fallback for servers without MOVE.
+                    self.client.copy(chunk, folder)
+                    self.client.delete_messages(chunk)
+                    self._expunge_uids(chunk)
+                self._cache_discard(chunk)
             self.logger.info(
-                f"Moved message {message_id} "
+                f"Moved {len(uids)} message(s) "
                 f"to folder '{folder}'"
             )
             return True
         except Exception as e:
+            if isinstance(e, IMAPClientError):
+                self._invalidate_folder_cache()
             self.logger.error(
-                f"Error moving message {message_id} "
+                f"Error moving {len(message_ids)} messages "
                 f"to folder '{folder}': {e}"
             )
             return False
 
     def move_message(
         self,
-        message_id: str,
+        message_id: MessageId,
         destination_folder: str,
         custom_headers: Optional[Dict[str, str]] = None,
     ) -> bool:
@@ -271,129 +400,7 @@ class MessageOpsMixin:
             message_id, destination_folder, custom_headers
         )
 
-    def move_with_headers(
-        self,
-        message_id: str,
-        destination_folder: str,
-        custom_headers: Dict[str, str],
-    ) -> bool:
-        """Move a message while adding custom headers.
-
-        Fetches the original message, adds custom headers,
-        recreates it in the destination folder, then deletes
-        the original.
-
-        Args:
-            message_id: The ID of the message to move
-            destination_folder: The destination folder
-            custom_headers: Headers to add
-
-        Returns:
-            bool: True if successful
-        """
-        if not self.client:
-            self.logger.error(
-                "Not connected to IMAP server"
-            )
-            return False
-
-        if not destination_folder:
-            self.logger.debug(
-                f"No move folder for message "
-                f"{message_id}, skipping"
-            )
-            return True
-
-        if not custom_headers:
-            self.logger.debug(
-                "No custom headers, using regular move"
-            )
-            return self.move_to_folder(
-                message_id, destination_folder
-            )
-
-        try:
-            self.logger.debug(
-                f"Fetching message {message_id} "
-                f"for header modification"
-            )
-            raw_data = self.client.fetch(
-                [int(message_id)],
-                ['BODY.PEEK[]', 'FLAGS', 'INTERNALDATE'],
-            )
-
-            if int(message_id) not in raw_data:
-                self.logger.error(
-                    f"Message {message_id} not found"
-                )
-                return False
-
-            msg_info = raw_data[int(message_id)]
-            orig_bytes = msg_info[b'BODY[]']
-            orig_flags = msg_info[b'FLAGS']
-            orig_date = msg_info[b'INTERNALDATE']
-
-            parsed = email.message_from_bytes(orig_bytes)
-
-            for hdr_name, hdr_val in custom_headers.items():
-                if hdr_name in parsed:
-                    del parsed[hdr_name]
-                    self.logger.debug(
-                        f"Removed existing header: "
-                        f"{hdr_name}"
-                    )
-                parsed[hdr_name] = hdr_val
-                self.logger.debug(
-                    f"Added header: "
-                    f"{hdr_name}: {hdr_val}"
-                )
-
-            modified_bytes = parsed.as_bytes()
-
-            if not self._ensure_folder_exists(
-                destination_folder
-            ):
-                return False
-
-            self.logger.debug(
-                f"Appending modified message "
-                f"to '{destination_folder}'"
-            )
-            result = self.client.append(
-                destination_folder, modified_bytes,
-                flags=orig_flags, msg_time=orig_date,
-            )
-
-            if result:
-                self.logger.debug(
-                    f"Deleting original message "
-                    f"{message_id}"
-                )
-                self.client.delete_messages(
-                    [int(message_id)]
-                )
-                self.client.expunge()
-                self.logger.info(
-                    f"Moved message {message_id} to "
-                    f"'{destination_folder}' with headers"
-                )
-                return True
-            else:
-                self.logger.error(
-                    f"Failed to append message "
-                    f"to '{destination_folder}'"
-                )
-                return False
-
-        except Exception as e:
-            self.logger.error(
-                f"Error moving message {message_id} "
-                f"with headers to "
-                f"'{destination_folder}': {e}"
-            )
-            return False
-
-    def delete_message(self, message_id: str) -> bool:
+    def delete_message(self, message_id: MessageId) -> bool:
         """Delete a message.
 
         Args:
@@ -409,8 +416,10 @@ class MessageOpsMixin:
             return False
 
         try:
-            self.client.delete_messages([int(message_id)])
-            self.client.expunge()
+            uid = _to_uid(message_id)
+            self.client.delete_messages([uid])
+            self._expunge_uids([uid])
+            self._cache_discard([uid])
             self.logger.info(
                 f"Deleted message {message_id}"
             )
@@ -421,3 +430,18 @@ class MessageOpsMixin:
                 f"{message_id}: {e}"
             )
             return False
+
+    def _expunge_uids(self, uids: List[int]) -> None:
+        """Expunge deleted messages, limited to uids if possible.
+
+        With UIDPLUS (RFC 4315) only the given UIDs are removed;
+        otherwise a plain EXPUNGE also removes any other message
+        already flagged \\Deleted in the folder.
+
+        Args:
+            uids: UIDs just flagged \\Deleted
+        """
+        if self.client.has_capability('UIDPLUS'):
+            self.client.uid_expunge(uids)
+        else:
+            self.client.expunge()
@@ -0,0 +1,204 @@
+"""
+Mixin providing work spread over parallel IMAP sessions.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, TypeVar,
+)
+
+from .account import Account
+from .email_message import EmailMessage
+from .pool import ImapConnectionPool, PoolKey, _pool_key
+
+if TYPE_CHECKING:
+    from .client import ImapClient
+
+T = TypeVar('T')
+
+
+class ParallelFetchMixin:
+    """Parallel accounts and message retrieval for ImapClient."""
+
+    @classmethod
+    def run_parallel(
+        cls,
+        accounts: List[Account],
+        fn: Callable[['ImapClient'], T],
+        max_workers: int = 16,
+        pool: Optional[ImapConnectionPool] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> List[Optional[T]]:
+        """Run a function against several accounts concurrently.
+
+        Each account gets its own connected client on a worker
+        thread, so slow servers no longer hold up the others.
+        Entries for the same account never run more than
+        account.max_connections at a time, since providers cap
+        sessions per account (iCloud: 10).
+
+        Args:
+            accounts: The accounts to run fn for
+            fn: Called with a connected ImapClient per account
+            max_workers: Maximum number of threads overall
+            pool: Optional ImapConnectionPool shared by the
+                clients, so repeated runs reuse sessions
+            logger: Optional logger instance
+
+        Returns:
+            List of fn results in account order; None where the
+            connection or fn failed
+        """
+        logger = logger or logging.getLogger(cls.__module__)
+        limits: Dict[PoolKey, threading.Semaphore] = {}
+        for account in accounts:
+            limits.setdefault(
+                _pool_key(account),
+                threading.Semaphore(max(1, account.max_connections)),
+            )
+
+        def run(account: Account) -> Optional[T]:
+            with limits[_pool_key(account)]:
+                client = cls(account, logger, pool=pool)
+                if not client.connect():
+                    return None
+                try:
+                    return fn(client)
+                except Exception as e:
+                    logger.error(
+                        "Error running on account %s: %s",
+                        account.name, e,
+                    )
+                    return None
+                finally:
+                    client.disconnect()
+
+        if not accounts:
+            return []
+        workers = min(max_workers, len(accounts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, accounts))
+
+    def get_messages_parallel(
+        self,
+        search_criteria: List[str] = None,
+        folder: str = 'INBOX',
+        n_connections: int = 3,
+        limit: Optional[int] = None,
+        include_attachments: bool = True,
+    ) -> List[Tuple[int, EmailMessage]]:
+        """Get messages, fetching bodies over several sessions.
+
+        Searches on the current connection, splits the matching
+        UIDs into contiguous ranges and fetches each range on its
+        own session. Useful for large result sets where a single
+        connection is bound by per-command server time.
+
+        Args:
+            search_criteria: IMAP search criteria
+            folder: The folder to search in
+            n_connections: Number of sessions to fetch with,
+                capped by ``account.max_connections``
+            limit: Maximum number of messages to return
+            include_attachments: Whether to include attachments
+
+        Returns:
+            List of (message_id, EmailMessage) tuples, in the
+            same order as get_messages returns them
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return []
+
+        try:
+            message_ids = self._search_uids(
+                search_criteria, folder, limit,
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Error getting messages: {e}"
+            )
+            return []
+
+        if not message_ids:
+            return []
+
+        # The current connection counts against the account limit.
+        workers = min(
+            n_connections,
+            self.account.max_connections - 1,
+            len(message_ids),
+        )
+        if workers <= 1:
+            return self._fetch_uids(
+                self.client, message_ids, include_attachments,
+            )
+
+        size = -(-len(message_ids) // workers)
+        ranges = [
+            message_ids[i:i + size]
+            for i in range(0, len(message_ids), size)
+        ]
+        self.logger.info(
+            f"Fetching {len(message_ids)} messages over "
+            f"{len(ranges)} connections"
+        )
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            results = pool.map(
+                lambda uids: self._fetch_range(
+                    uids, folder, include_attachments,
+                ),
+                ranges,
+            )
+            messages = []
+            for chunk in results:
+                messages.extend(chunk)
+        return messages
+
+    def _fetch_range(
+        self,
+        message_ids: List[int],
+        folder: str,
+        include_attachments: bool,
+    ) -> List[Tuple[int, EmailMessage]]:
+        """Fetch a range of UIDs on a dedicated session.
+
+        Args:
+            message_ids: UIDs to fetch
+            folder: The folder the messages are in
+            include_attachments: Whether to include attachments
+
+        Returns:
+            List of (message_id, EmailMessage) tuples
+        """
+        try:
+            session = self._create_session()
+        except Exception as e:
+            self.logger.error(
+                f"Failed to open extra connection to "
+                f"{self.account.server}: {e}"
+            )
+            return []
+
+        try:
+            session.select_folder(folder, readonly=True)
+            return self._fetch_uids(
+                session, message_ids, include_attachments,
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Error fetching {len(message_ids)} messages "
+                f"from '{folder}': {e}"
+            )
+            return []
+        finally:
+            try:
+                session.logout()
+            except Exception as e:
+                self.logger.debug(
+                    f"Error closing extra connection: {e}"
+                )
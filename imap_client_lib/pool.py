@@ -0,0 +1,177 @@
+"""
+Pool of logged-in IMAP sessions shared between ImapClient instances.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from imapclient import IMAPClient
+
+from .account import Account
+
+# Idle sessions older than this are logged out instead of reused.
+# Some providers (iCloud) drop idle connections after 30 minutes.
+DEFAULT_IDLE_TIMEOUT = 25 * 60
+
+# Sessions idle at least this long are checked with NOOP before
+# being handed out; fresher ones were just checked on release.
+RECHECK_AFTER = 60
+
+PoolKey = Tuple[str, int, str, bool]
+
+
+def _pool_key(account: Account) -> PoolKey:
+    """Return the key sessions of an account are pooled under."""
+    return (
+        account.server, account.port,
+        account.username, account.use_ssl,
+    )
+
+
+class ImapConnectionPool:
+    """
+    Thread-safe pool of idle IMAP sessions keyed by account.
+
+    Sessions are keyed by (server, port, username, use_ssl), so
+    clients for the same account reuse one TLS handshake and LOGIN
+    instead of paying for a new one on every connect().
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        max_idle_per_account: int = 4,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize an empty pool.
+
+        Args:
+            idle_timeout: Seconds an idle session may be kept
+            max_idle_per_account: Idle sessions kept per account;
+                extra released sessions are logged out
+            logger: Optional logger instance
+        """
+        self.idle_timeout = idle_timeout
+        self.max_idle_per_account = max_idle_per_account
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._idle: Dict[PoolKey, Deque[Tuple[IMAPClient, float]]] = {}
+
+    def acquire(
+        self,
+        account: Account,
+        factory: Callable[[], IMAPClient],
+    ) -> IMAPClient:
+        """
+        Lease a session for an account, creating one if none is idle.
+
+        Args:
+            account: The account the session is for
+            factory: Called to open and log in a new session
+
+        Returns:
+            IMAPClient: A logged-in session
+
+        Raises:
+            Exception: If a new session is needed and factory fails
+        """
+        key = _pool_key(account)
+        while True:
+            session, idle_for = self._pop_idle(key)
+            if session is None:
+                return factory()
+            if idle_for >= RECHECK_AFTER:
+                # Servers may drop sessions well before our own
+                # idle timeout; a NOOP is far cheaper than paying
+                # for a failed command and a reconnect later.
+                try:
+                    session.noop()
+                except Exception as e:
+                    self.logger.debug(
+                        f"Dropping dead pooled session: {e}"
+                    )
+                    self._logout(session)
+                    continue
+            self.logger.debug(
+                f"Reusing pooled session for {account.username}"
+            )
+            return session
+
+    def _pop_idle(
+        self, key: PoolKey,
+    ) -> Tuple[Optional[IMAPClient], float]:
+        """Take the most recently released unexpired session.
+
+        Expired sessions met on the way are logged out.
+
+        Args:
+            key: The pool key to take a session for
+
+        Returns:
+            Tuple of (session or None, seconds it was idle)
+        """
+        expired = []
+        session = None
+        idle_for = 0.0
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                candidate, released_at = idle.pop()
+                if now - released_at < self.idle_timeout:
+                    session = candidate
+                    idle_for = now - released_at
+                    break
+                expired.append(candidate)
+
+        for stale in expired:
+            self._logout(stale)
+        return session, idle_for
+
+    def release(self, account: Account, session: IMAPClient) -> None:
+        """
+        Return a leased session to the pool.
+
+        The session is checked with NOOP first; broken sessions
+        and sessions beyond max_idle_per_account are logged out.
+
+        Args:
+            account: The account the session belongs to
+            session: The session to return
+        """
+        try:
+            session.noop()
+        except Exception as e:
+            self.logger.debug(f"Dropping broken pooled session: {e}")
+            self._logout(session)
+            return
+
+        key = _pool_key(account)
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self.max_idle_per_account:
+                idle.append((session, time.monotonic()))
+                return
+        self._logout(session)
+
+    def close_all(self) -> None:
+        """Log out every idle session in the pool."""
+        with self._lock:
+            sessions = [
+                session
+                for idle in self._idle.values()
+                for session, _ in idle
+            ]
+            self._idle.clear()
+        for session in sessions:
+            self._logout(session)
+
+    def _logout(self, session: IMAPClient) -> None:
+        """Log a session out, ignoring errors."""
+        try:
+            session.logout()
+        except Exception as e:
+            self.logger.debug(f"Error logging out pooled session: {e}")
@@ -0,0 +1,110 @@
+"""
+Mixin providing search helpers that filter on the server.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+from .email_message import EmailMessage
+
+_GMAIL_CAPABILITY = b'X-GM-EXT-1'
+
+
+def attachment_hint_criteria(
+    subject: Optional[str],
+    extensions: Sequence[str],
+    unseen: bool = True,
+    gmail_raw: bool = False,
+) -> list:
+    """Build search criteria for messages likely to carry attachments.
+
+    The generic form ORs together ``BODY ".ext"`` terms. BODY
+    searches cover the MIME part headers, so the attachment
+    filenames are matched on the server and messages without a
+    matching attachment are never fetched. Matches are a hint:
+    a body that merely mentions ``.pdf`` also matches.
+
+    Args:
+        subject: Text the subject must contain, or None
+        extensions: Attachment extensions, e.g. ``['pdf']``
+        unseen: Only match unread messages
+        gmail_raw: Build a Gmail ``X-GM-RAW`` query instead
+
+    Returns:
+        IMAP search criteria for ImapClient.get_messages
+    """
+    exts = [ext.lstrip('.').lower() for ext in extensions]
+
+    if gmail_raw:
+        terms = ['has:attachment']
+        if subject:
+            terms.insert(0, f'subject:"{subject}"')
+        if exts:
+            names = ' OR '.join(f'filename:{ext}' for ext in exts)
+            terms.append(f'({names})' if len(exts) > 1 else names)
+        if unseen:
+            terms.append('is:unread')
+        return ['X-GM-RAW', ' '.join(terms)]
+
+    criteria = []
+    if subject:
+        criteria += ['SUBJECT', subject]
+    if unseen:
+        criteria.append('UNSEEN')
+    for i, ext in enumerate(exts):
+        if i < len(exts) - 1:
+            criteria.append('OR')
+        criteria += ['BODY', f'.{ext}']
+    return criteria or ['ALL']
+
+
+class SearchMixin:
+    """Server-side search helpers for ImapClient."""
+
+    def search_with_attachment_hint(
+        self,
+        subject: Optional[str],
+        extensions: Sequence[str],
+        folder: str = 'INBOX',
+        unseen: bool = True,
+        gmail_raw: bool = False,
+        limit: Optional[int] = None,
+        include_attachments: bool = True,
+    ) -> List[Tuple[int, EmailMessage]]:
+        """Get messages whose attachments plausibly match.
+
+        Lets the server drop messages without a matching
+        attachment before any body is downloaded.
+
+        Args:
+            subject: Text the subject must contain, or None
+            extensions: Attachment extensions, e.g. ``['pdf']``
+            folder: The folder to search in
+            unseen: Only match unread messages
+            gmail_raw: Use Gmail's X-GM-RAW search if the server
+                supports it, falling back to the generic search
+            limit: Maximum number of messages to return
+            include_attachments: Whether to include attachments
+
+        Returns:
+            List of (message_id, EmailMessage) tuples
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return []
+
+        if gmail_raw and (
+            _GMAIL_CAPABILITY not in self.client.capabilities()
+        ):
+            self.logger.info(
+                "Server does not support X-GM-RAW, "
+                "using generic attachment search"
+            )
+            gmail_raw = False
+
+        criteria = attachment_hint_criteria(
+            subject, extensions, unseen, gmail_raw,
+        )
+        return self.get_messages(
+            criteria, folder, limit, include_attachments,
+        )
@@ -1,31 +1,64 @@
 """Mixin providing SMTP email sending and forwarding operations."""
+import hashlib
+import html
 from typing import List, Optional, Dict
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
-from email import encoders
 
 from .email_message import EmailMessage, Attachment
+from .smtp_session_mixin import SmtpSessionMixin
 
+try:
+    # SIMD-accelerated and output-compatible; optional ('fast').
+    from pybase64 import encodebytes as _b64_encodebytes
+except ImportError:
+    from base64 import encodebytes as _b64_encodebytes
 
-class SmtpMixin:
-    """SMTP operations for ImapClient."""
+# Encoded attachment payloads kept per client for repeated forwards.
+_MIME_CACHE_SIZE = 32
+
+_BR_TABLE = str.maketrans({'\n': '<br>'})
+
+# %-templates for forwarded bodies: from, date, subject, original.
+_FWD_TEXT_TEMPLATE = (
+    "\n---------- Forwarded message ----------\n"
+    "From: %s\n"
+    "Date: %s\n"
+    "Subject: %s\n\n"
+    "%s"
+)
+_FWD_HTML_TEMPLATE = (
+    "<div><p>---------- Forwarded message ----------<br>\n"
+    "From: %s<br>\n"
+    "Date: %s<br>\n"
+    "Subject: %s</p>\n"
+    "<div>%s</div></div>"
+)
+
+
+def _set_custom_headers(msg, custom_headers: Dict[str, str]) -> None:
+    """Replace headers on a MIME message in one pass.
+
+    ``del msg[name]`` walks the whole header list for every custom
+    header; filtering the list once by a set of names does not.
+
+    Args:
+        msg: The message to modify
+        custom_headers: Header names and values to set
+    """
+    names = {name.lower() for name in custom_headers}
+    msg._headers = [
+        (name, value) for name, value in msg._headers
+        if name.lower() not in names
+    ]
+    for name, value in custom_headers.items():
+        msg[name] = value
 
-    def _resolve_smtp_credentials(self, server, user, pw):
-        """Resolve SMTP credentials with account fallbacks."""
-        if user is None:
-            user = self.account.username
-        if pw is None:
-            pw = self.account.password
-        if server is None:
-            server = self.account.server.replace(
-                'imap', 'smtp'
-            )
-            self.logger.info(
-                f"Derived SMTP server: {server}"
-            )
-        return server, user, pw
+
+class SmtpMixin(SmtpSessionMixin):
+    """SMTP operations for ImapClient."""
 
     def _set_message_headers(self, msg, from_email,
                              to_addresses, subject,
@@ -41,10 +74,7 @@ class SmtpMixin:
             msg['Bcc'] = ', '.join(bcc_addresses)
         msg['Subject'] = subject
         if custom_headers:
-            for hdr_name, hdr_val in custom_headers.items():
-                if hdr_name in msg:
-                    del msg[hdr_name]
-                msg[hdr_name] = hdr_val
+            _set_custom_headers(msg, custom_headers)
 
     def _log_send_success(self, action, to_addresses,
                           bcc_addresses=None):
@@ -70,17 +100,9 @@ class SmtpMixin:
         smtp_password: Optional[str] = None,
     ) -> bool:
         """Send an already-built MIME message via SMTP."""
-        smtp_server, smtp_username, smtp_password = (
-            self._resolve_smtp_credentials(
-                smtp_server, smtp_username, smtp_password,
-            )
-        )
-        self.logger.info(
-            f"Connecting to SMTP: {smtp_server}:{smtp_port}"
-        )
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_username, smtp_password)
+        with self._smtp_session(
+            smtp_server, smtp_port, smtp_username, smtp_password,
+        ) as server:
             all_recipients = to_addresses.copy()
             if bcc_addresses:
                 all_recipients.extend(bcc_addresses)
@@ -167,32 +189,10 @@ class SmtpMixin:
     ) -> bool:
         """Forward an email with an optional modified subject."""
         try:
-            if new_subject is None:
-                new_subject = f"Fwd: {email_message.subject}"
-            if sender_email is None:
-                sender_email = (
-                    smtp_username
-                    if smtp_username is not None
-                    else self.account.username
-                )
-            has_inline = any(
-                att.is_inline and att.content_id
-                for att in email_message.attachments
-            )
-            msg = MIMEMultipart(
-                'related' if has_inline else 'mixed'
-            )
-            self._set_message_headers(
-                msg, sender_email, to_addresses,
-                new_subject, bcc_addresses=bcc_addresses,
-                custom_headers=custom_headers,
-            )
-            self._build_forward_body(
-                msg, has_inline, email_message,
-                additional_message,
-            )
-            self._attach_files(
-                msg, email_message.attachments
+            msg = self._build_forward_message(
+                email_message, to_addresses, new_subject,
+                smtp_username, sender_email, bcc_addresses,
+                custom_headers, additional_message,
             )
             self._smtp_send(
                 msg, to_addresses, bcc_addresses,
@@ -209,6 +209,100 @@ class SmtpMixin:
             )
             return False
 
+    def forward_email_to_each(
+        self,
+        email_message: EmailMessage,
+        to_addresses: List[str],
+        new_subject: Optional[str] = None,
+        smtp_server: Optional[str] = None,
+        smtp_port: int = 587,
+        smtp_username: Optional[str] = None,
+        smtp_password: Optional[str] = None,
+        sender_email: Optional[str] = None,
+        custom_headers: Optional[Dict[str, str]] = None,
+        additional_message: str = "",
+    ) -> int:
+        """Forward an email to each recipient as a separate message.
+
+        The message is built and serialised once and sent over a
+        single SMTP session; per recipient only a To header line
+        is prepended to the same bytes. Refused recipients are
+        logged and skipped.
+
+        Returns:
+            int: Number of recipients the email was sent to
+        """
+        if not to_addresses:
+            return 0
+        sent = 0
+        try:
+            msg = self._build_forward_message(
+                email_message, to_addresses[:1], new_subject,
+                smtp_username, sender_email, None,
+                custom_headers, additional_message,
+            )
+            from_addr = msg['From']
+            del msg['To']
+            wire_policy = msg.policy.clone(linesep='\r\n')
+            body = msg.as_bytes(policy=wire_policy)
+            with self._smtp_session(
+                smtp_server, smtp_port,
+                smtp_username, smtp_password,
+            ) as server:
+                for address in to_addresses:
+                    data = wire_policy.fold_binary('To', address) + body
+                    try:
+                        server.sendmail(from_addr, [address], data)
+                        sent += 1
+                    except smtplib.SMTPRecipientsRefused as e:
+                        self.logger.error(
+                            f"Recipient refused: {address}: {e}"
+                        )
+        except Exception as e:
+            self.logger.error(
+                f"Error forwarding email: {e}"
+            )
+        self.logger.info(
+            f"Forwarded email to {sent} of "
+            f"{len(to_addresses)} recipient(s)"
+        )
+        return sent
+
+    def _build_forward_message(
+        self, email_message, to_addresses, new_subject,
+        smtp_username, sender_email, bcc_addresses,
+        custom_headers, additional_message,
+    ) -> MIMEMultipart:
+        """Build the complete MIME message for a forward."""
+        if new_subject is None:
+            new_subject = f"Fwd: {email_message.subject}"
+        if sender_email is None:
+            sender_email = (
+                smtp_username
+                if smtp_username is not None
+                else self.account.username
+            )
+        has_inline = any(
+            att.is_inline and att.content_id
+            for att in email_message.attachments
+        )
+        msg = MIMEMultipart(
+            'related' if has_inline else 'mixed'
+        )
+        self._set_message_headers(
+            msg, sender_email, to_addresses,
+            new_subject, bcc_addresses=bcc_addresses,
+            custom_headers=custom_headers,
+        )
+        self._build_forward_body(
+            msg, has_inline, email_message,
+            additional_message,
+        )
+        self._attach_files(
+            msg, email_message.attachments
+        )
+        return msg
+
     def _build_forward_body(self, msg, has_inline,
                             email_message,
                             additional_message):
@@ -219,75 +313,54 @@ class SmtpMixin:
         orig_html = (
             email_message.get_body('text/html') or ""
         )
-        fwd_header = (
-            f"\n---------- Forwarded message "
-            f"----------\n"
-            f"From: {email_message.from_address}\n"
-            f"Date: {email_message.date}\n"
-            f"Subject: {email_message.subject}\n\n"
-        )
-        if additional_message:
-            fwd_content = (
-                f"{additional_message}\n\n"
-                f"{fwd_header}{orig_text}"
-            )
-        else:
-            fwd_content = f"{fwd_header}{orig_text}"
-        fwd_info = (
-            f"<p>---------- Forwarded message "
-            f"----------<br>\n"
-            f"From: {email_message.from_address}<br>\n"
-            f"Date: {email_message.date}<br>\n"
-            f"Subject: {email_message.subject}</p>\n"
-            f"<div>{orig_html}</div>"
+        fwd_content = _FWD_TEXT_TEMPLATE % (
+            email_message.from_address,
+            email_message.date,
+            email_message.subject,
+            orig_text,
         )
         if additional_message:
-            am_html = additional_message.replace(
-                chr(10), '<br>'
+            fwd_content = f"{additional_message}\n\n{fwd_content}"
+        html_fwd = None
+        if orig_html:
+            html_fwd = _FWD_HTML_TEMPLATE % (
+                html.escape(str(email_message.from_address)),
+                html.escape(str(email_message.date)),
+                html.escape(str(email_message.subject)),
+                orig_html,
             )
-            html_fwd = (
-                f"<p>{am_html}</p>\n<div>{fwd_info}</div>"
-            )
-        else:
-            html_fwd = f"<div>{fwd_info}</div>"
-        if has_inline and orig_html:
+            if additional_message:
+                html_fwd = (
+                    f"<p>{additional_message.translate(_BR_TABLE)}"
+                    f"</p>\n{html_fwd}"
+                )
+        if has_inline and html_fwd:
             alt = MIMEMultipart('alternative')
             alt.attach(MIMEText(fwd_content, 'plain'))
             alt.attach(MIMEText(html_fwd, 'html'))
             msg.attach(alt)
         else:
             msg.attach(MIMEText(fwd_content, 'plain'))
-            if orig_html:
+            if html_fwd:
                 msg.attach(MIMEText(html_fwd, 'html'))
 
     def _attach_files(self, msg, attachments):
         """Attach files (inline or regular) to a message."""
         for attachment in attachments:
+            part = self._build_attachment_part(attachment)
             if attachment.is_inline and attachment.content_id:
-                main_type, sub_type = (
-                    attachment.content_type.split('/', 1)
-                )
-                part = MIMEBase(main_type, sub_type)
-                part.set_payload(attachment.data)
-                encoders.encode_base64(part)
                 part.add_header(
                     'Content-Disposition', 'inline',
                     filename=attachment.filename,
                 )
-                cid = attachment.content_id.strip('<>')
-                part.add_header('Content-ID', f'<{cid}>')
+                part.add_header('Content-ID', attachment.content_id)
                 msg.attach(part)
                 self.logger.debug(
                     f"Attached inline image: "
                     f"{attachment.filename} "
-                    f"with Content-ID: <{cid}>"
+                    f"with Content-ID: {attachment.content_id}"
                 )
             else:
-                part = MIMEBase(
-                    'application', 'octet-stream'
-                )
-                part.set_payload(attachment.data)
-                encoders.encode_base64(part)
                 part.add_header(
                     'Content-Disposition',
                     f'attachment; filename= '
@@ -297,3 +370,50 @@ class SmtpMixin:
                 self.logger.debug(
                     f"Attached file: {attachment.filename}"
                 )
+
+    def _build_attachment_part(self, attachment) -> MIMEBase:
+        """
+        Build a base64-encoded MIME part without per-message headers.
+
+        The encoded payload is cached by content hash, so forwarding
+        the same attachment to many recipients only encodes it once.
+        """
+        if attachment.is_inline and attachment.content_id:
+            main_type = attachment.main_type
+            sub_type = attachment.sub_type
+        else:
+            main_type, sub_type = 'application', 'octet-stream'
+        part = MIMEBase(main_type, sub_type)
+        part.set_payload(self._encoded_payload(attachment))
+        part['Content-Transfer-Encoding'] = 'base64'
+        return part
+
+    def _encoded_payload(self, attachment: Attachment) -> str:
+        """
+        Return the base64 text for an attachment's data.
+
+        The same Attachment object reuses its own encoding without
+        rehashing; other objects with equal data hit the client's
+        content-hash cache.
+        """
+        cached = attachment._encoded
+        if cached is not None and cached[0] is attachment.data:
+            return cached[1]
+        key = hashlib.sha256(attachment.data).hexdigest()
+        # AsyncImapClient forwards from executor threads share this
+        # cache, so every access to it holds the lock; the encoding
+        # itself runs outside it.
+        with self._mime_cache_lock:
+            payload = self._mime_cache.get(key)
+            if payload is not None:
+                self._mime_cache.move_to_end(key)
+        if payload is None:
+            payload = _b64_encodebytes(
+                attachment.data
+            ).decode('ascii')
+            with self._mime_cache_lock:
+                self._mime_cache[key] = payload
+                while len(self._mime_cache) > _MIME_CACHE_SIZE:
+                    self._mime_cache.popitem(last=False)
+        attachment._encoded = (attachment.data, payload)
+        return payload
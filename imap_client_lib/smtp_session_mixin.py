@@ -0,0 +1,118 @@
+"""Mixin managing the SMTP sessions used for sending mail."""
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Optional
+import smtplib
+
+
+@lru_cache(maxsize=None)
+def _derive_smtp_server(imap_server: str) -> str:
+    """Guess the SMTP host for an IMAP host (imap.x -> smtp.x)."""
+    return imap_server.replace('imap', 'smtp')
+
+
+class SmtpSessionMixin:
+    """SMTP session handling for ImapClient."""
+
+    def _resolve_smtp_credentials(self, server, user, pw):
+        """Resolve SMTP credentials with account fallbacks."""
+        if user is None:
+            user = self.account.username
+        if pw is None:
+            pw = self.account.password
+        if server is None:
+            server = _derive_smtp_server(self.account.server)
+            self.logger.info(
+                f"Derived SMTP server: {server}"
+            )
+        return server, user, pw
+
+    @contextmanager
+    def _smtp_session(
+        self,
+        smtp_server: Optional[str] = None,
+        smtp_port: int = 587,
+        smtp_username: Optional[str] = None,
+        smtp_password: Optional[str] = None,
+    ) -> Iterator[smtplib.SMTP]:
+        """Provide a logged-in SMTP session for a ``with`` block.
+
+        With keep_smtp_open the session outlives the block and is
+        reused by later sends; otherwise it is closed on exit.
+        """
+        smtp_server, smtp_username, smtp_password = (
+            self._resolve_smtp_credentials(
+                smtp_server, smtp_username, smtp_password,
+            )
+        )
+        if self.keep_smtp_open:
+            server = self._get_smtp(
+                smtp_server, smtp_port,
+                smtp_username, smtp_password,
+            )
+            try:
+                yield server
+            except smtplib.SMTPServerDisconnected:
+                self.close_smtp()
+                raise
+            except smtplib.SMTPException:
+                # SMTPException subclasses OSError, but refusals and
+                # data errors leave the session usable (smtplib
+                # RSETs it), so keep it for the next send.
+                raise
+            except OSError:
+                # Socket-level failure: the session is gone.
+                self.close_smtp()
+                raise
+            return
+
+        self.logger.info(
+            f"Connecting to SMTP: {smtp_server}:{smtp_port}"
+        )
+        with smtplib.SMTP(smtp_server, smtp_port) as server:
+            server.starttls()
+            server.login(smtp_username, smtp_password)
+            yield server
+
+    def _get_smtp(self, server, port, user, pw) -> smtplib.SMTP:
+        """Return the kept-open SMTP session, logging in if needed.
+
+        A cached session for the same server and user is checked
+        with NOOP before reuse; a dead or mismatched one is closed
+        and replaced.
+        """
+        key = (server, port, user)
+        if self._smtp is not None:
+            if self._smtp_key == key:
+                try:
+                    if self._smtp.noop()[0] == 250:
+                        return self._smtp
+                except (smtplib.SMTPException, OSError) as e:
+                    self.logger.debug(
+                        f"Dropping stale SMTP session: {e}"
+                    )
+            self.close_smtp()
+
+        self.logger.info(f"Connecting to SMTP: {server}:{port}")
+        smtp = smtplib.SMTP(server, port)
+        try:
+            smtp.starttls()
+            smtp.login(user, pw)
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        self._smtp_key = key
+        return smtp
+
+    def close_smtp(self) -> None:
+        """Close the kept-open SMTP session, if any."""
+        smtp, self._smtp = self._smtp, None
+        self._smtp_key = None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError) as e:
+            self.logger.debug(f"Error closing SMTP session: {e}")
+            smtp.close()
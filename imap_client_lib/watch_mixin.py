@@ -0,0 +1,282 @@
+"""
+Mixin providing push-based processing of new mail via IMAP IDLE.
+"""
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from imapclient.exceptions import IMAPClientError
+
+from .email_message import EmailMessage
+
+# RFC 2177: servers may drop an IDLE after 30 minutes, so clients
+# should re-issue it before then.
+DEFAULT_IDLE_TIMEOUT = 29 * 60
+
+_NEW_MAIL_EVENTS = (b'EXISTS', b'RECENT')
+
+# Backoff between reconnect attempts: doubles per consecutive
+# failure, starting at _RECONNECT_DELAY, capped at the maximum.
+_RECONNECT_DELAY = 1
+_MAX_RECONNECT_DELAY = 5 * 60
+
+
+class WatchMixin:
+    """IDLE-driven new-mail processing for ImapClient."""
+
+    def idle_start(self, folder: str = 'INBOX') -> bool:
+        """Start IDLE mode on a folder.
+
+        IDLE allows the server to push notifications
+        about new emails instead of requiring polling.
+
+        Args:
+            folder: The folder to monitor
+
+        Returns:
+            bool: True if IDLE mode started successfully
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return False
+
+        try:
+            self.client.select_folder(folder)
+            self.client.idle()
+            self.logger.debug("Started IDLE on folder '%s'", folder)
+            return True
+        except Exception as e:
+            self.logger.error("Error starting IDLE mode: %s", e)
+            return False
+
+    def idle_check(
+        self, timeout: int = 30,
+    ) -> List[Tuple[int, bytes]]:
+        """Check for IDLE responses.
+
+        Blocks until a response is received or timeout.
+
+        Args:
+            timeout: Max wait time in seconds
+
+        Returns:
+            List of (msg_id, event) tuples.
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return []
+
+        try:
+            responses = self.client.idle_check(
+                timeout=timeout
+            )
+            if responses:
+                self.logger.debug("IDLE responses: %s", responses)
+            return responses
+        except Exception as e:
+            self.logger.error("Error checking IDLE: %s", e)
+            raise
+
+    def idle_done(self) -> None:
+        """Exit IDLE mode.
+
+        Must be called before performing any other IMAP
+        operations after starting IDLE mode.
+        """
+        if not self.client:
+            self.logger.error(
+                "Not connected to IMAP server"
+            )
+            return
+
+        try:
+            self.client.idle_done()
+            self.logger.debug("Exited IDLE mode")
+        except Exception as e:
+            self.logger.error("Error exiting IDLE mode: %s", e)
+
+    def watch_folder(
+        self,
+        callback: Callable[[EmailMessage], bool],
+        folder: str = 'INBOX',
+        mark_as_read: bool = True,
+        move_to_folder: Optional[str] = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        check_interval: float = 30,
+        stop_event: Optional[threading.Event] = None,
+        max_retries: int = 5,
+    ) -> int:
+        """Process messages as they arrive, using IMAP IDLE.
+
+        Instead of polling with repeated SEARCHes, the folder is
+        watched with IDLE; when the server reports new messages,
+        only UIDs above the highest one seen are fetched and passed
+        to the callback. Messages already in the folder when the
+        watch starts are not processed.
+
+        Blocks until stop_event is set. Connects for the duration
+        of the call if not connected. When the session fails, it
+        is dropped and a new one is opened after an exponential
+        backoff; the watch gives up after max_retries consecutive
+        failures.
+
+        Args:
+            callback: Function taking an EmailMessage,
+                returns True if the message was processed
+            folder: The folder to watch
+            mark_as_read: Mark processed messages as read
+            move_to_folder: Folder to move processed msgs
+            idle_timeout: Seconds after which IDLE is re-issued
+                even without events
+            check_interval: Seconds between checks of stop_event
+                while idling
+            stop_event: Set it (e.g. from another thread) to end
+                the watch
+            max_retries: Consecutive failed attempts after which
+                the watch ends
+
+        Returns:
+            int: Number of messages processed
+        """
+        stop_event = stop_event or threading.Event()
+        opened = False
+        if not self.client:
+            if not self.connect():
+                return 0
+            opened = True
+
+        processed_count = 0
+        last_uid = None
+        failures = 0
+        try:
+            while not stop_event.is_set():
+                try:
+                    if self.client is None and not self.connect():
+                        raise ConnectionError("reconnect failed")
+                    if last_uid is None:
+                        last_uid = self._highest_uid(folder)
+                    else:
+                        self.client.select_folder(folder)
+
+                    self._idle_until_new_mail(
+                        idle_timeout, check_interval, stop_event,
+                    )
+                    failures = 0
+                    if stop_event.is_set():
+                        break
+
+                    # Also search after a quiet timeout, in case the
+                    # server never pushed the notification.
+                    new_ids = [
+                        uid for uid in self.client.search(
+                            ['UID', f'{last_uid + 1}:*']
+                        )
+                        if uid > last_uid
+                    ]
+                    if not new_ids:
+                        continue
+                    last_uid = max(new_ids)
+                    processed_count += self._process_new_messages(
+                        callback, sorted(new_ids),
+                        mark_as_read, move_to_folder,
+                    )
+                except (IMAPClientError, OSError) as e:
+                    failures += 1
+                    if failures > max_retries:
+                        self.logger.error(
+                            f"Watching '{folder}' failed {failures} "
+                            f"times in a row ({e}), giving up"
+                        )
+                        break
+                    delay = min(
+                        _MAX_RECONNECT_DELAY,
+                        _RECONNECT_DELAY * 2 ** (failures - 1),
+                    )
+                    self.logger.warning(
+                        f"Watching '{folder}' failed ({e}), "
+                        f"reconnecting in {delay}s"
+                    )
+                    self._drop_session()
+                    if stop_event.wait(delay):
+                        break
+        finally:
+            if opened:
+                self.disconnect()
+        return processed_count
+
+    def _drop_session(self) -> None:
+        """Release a failed session without closing SMTP.
+
+        Pooled sessions go back to the pool, which NOOP-checks
+        them and logs out broken ones; others are logged out.
+        """
+        session, self.client = self.client, None
+        self._invalidate_folder_cache()
+        if session is None:
+            return
+        try:
+            if self.pool is not None:
+                self.pool.release(self.account, session)
+            else:
+                session.logout()
+        except Exception as e:
+            self.logger.debug(f"Error dropping session: {e}")
+
+    def _highest_uid(self, folder: str) -> int:
+        """Select a folder and return the highest UID in use."""
+        info = self.client.select_folder(folder)
+        uidnext = info.get(b'UIDNEXT')
+        if uidnext is not None:
+            return uidnext - 1
+        uids = self.client.search(['ALL'])
+        return max(uids) if uids else 0
+
+    def _idle_until_new_mail(
+        self,
+        idle_timeout: float,
+        check_interval: float,
+        stop_event: threading.Event,
+    ) -> None:
+        """IDLE until new mail, idle_timeout or stop_event."""
+        self.client.idle()
+        started = time.monotonic()
+        try:
+            while not stop_event.is_set():
+                remaining = idle_timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                responses = self.client.idle_check(
+                    timeout=min(check_interval, remaining)
+                )
+                if any(
+                    len(r) > 1 and r[1] in _NEW_MAIL_EVENTS
+                    for r in responses
+                ):
+                    break
+        finally:
+            self.client.idle_done()
+
+    def _process_new_messages(
+        self,
+        callback: Callable[[EmailMessage], bool],
+        uids: List[int],
+        mark_as_read: bool,
+        move_to_folder: Optional[str],
+    ) -> int:
+        """Fetch new UIDs, run the callback and flush the results."""
+        processed_ids = [
+            message_id
+            for message_id, email_message in self._fetch_uids(
+                self.client, uids, True,
+            )
+            if self._run_callback(callback, message_id, email_message)
+        ]
+        if processed_ids and mark_as_read:
+            self.mark_many_as_read(processed_ids)
+        if processed_ids and move_to_folder:
+            self.move_many(processed_ids, move_to_folder)
+        return len(processed_ids)
@@ -33,6 +33,12 @@ setup(
         "IMAPClient>=2.3.1",
     ],
     extras_require={
+        "async": [
+            "aioimaplib>=2.0",
+        ],
+        "fast": [
+            "pybase64>=1.0",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-cov",
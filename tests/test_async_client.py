@@ -0,0 +1,350 @@
+"""Tests for the aioimaplib-based AsyncImapClient."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import namedtuple
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from imap_client_lib.account import Account
+from imap_client_lib.email_message import Attachment
+from imap_client_lib.async_client import (
+    AsyncImapClient,
+    _parse_fetch_lines,
+)
+
+Response = namedtuple("Response", "result lines")
+
+
+def _make_client() -> AsyncImapClient:
+    """Create an AsyncImapClient with a mocked aioimaplib session."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    client = AsyncImapClient(account)
+    client.client = MagicMock()
+    client.client.select = AsyncMock(return_value=Response("OK", []))
+    client.client.uid_search = AsyncMock(
+        return_value=Response("OK", [b"1 2 3", b"SEARCH completed"]),
+    )
+    client.client.expunge = AsyncMock(return_value=Response("OK", []))
+    client.client.create = AsyncMock(return_value=Response("OK", []))
+    return client
+
+
+def _fetch_response(uid_set: str) -> Response:
+    """Build an aioimaplib FETCH response for a UID set."""
+    lines = []
+    for seq, uid in enumerate(uid_set.split(","), start=1):
+        body = f"Subject: Message {uid}\r\n\r\nBody".encode()
+        lines += [
+            f"{seq} FETCH (UID {uid} FLAGS (\\Seen $label1) "
+            f"BODY[] {{{len(body)}}}".encode(),
+            bytearray(body),
+            b")",
+        ]
+    return Response("OK", lines + [b"FETCH completed."])
+
+
+def _uid_handler(stored: list):
+    """Answer UID commands and record all but FETCH."""
+    async def uid(command, *args):
+        if command == "fetch":
+            return _fetch_response(args[0])
+        stored.append((command,) + args)
+        return Response("OK", [])
+    return uid
+
+
+def _capabilities(*names: str):
+    """Build a has_capability stand-in for the given names."""
+    return lambda capability: capability in names
+
+
+class TestParseFetchLines:
+    """Tests for _parse_fetch_lines()."""
+
+    def test_extracts_body_and_flags(self) -> None:
+        """The literal and FLAGS list are read from the lines."""
+        raw = _parse_fetch_lines(_fetch_response("5").lines)
+        body, flags = raw[5]
+        assert body.startswith(b"Subject: Message 5")
+        assert flags == (b"\\Seen", b"$label1")
+
+    def test_demuxes_by_uid(self) -> None:
+        """Each literal is attributed to the UID on its FETCH line."""
+        raw = _parse_fetch_lines(_fetch_response("9,4").lines)
+        assert sorted(raw) == [4, 9]
+        assert raw[4][0].startswith(b"Subject: Message 4")
+
+    def test_missing_literal(self) -> None:
+        """No literal means no entry."""
+        assert _parse_fetch_lines([b"FETCH completed."]) == {}
+
+
+class TestGetMessages:
+    """Tests for AsyncImapClient.get_messages()."""
+
+    def test_returns_parsed_messages_newest_first(self) -> None:
+        """All search hits are fetched and parsed."""
+        client = _make_client()
+        client.client.uid = _uid_handler([])
+
+        messages = asyncio.run(client.get_messages())
+
+        assert [uid for uid, _ in messages] == [3, 2, 1]
+        assert messages[0][1].subject == "Message 3"
+        assert messages[0][1].keywords == ["$label1"]
+
+    def test_batches_uid_sets(self) -> None:
+        """UIDs are fetched fetch_batch_size per command."""
+        client = _make_client()
+        client.fetch_batch_size = 2
+        requested = []
+
+        async def uid(command, *args):
+            requested.append(args[0])
+            return _fetch_response(args[0])
+
+        client.client.uid = uid
+        messages = asyncio.run(client.get_messages())
+
+        assert sorted(requested) == ["1", "3,2"]
+        assert [m for m, _ in messages] == [3, 2, 1]
+
+    def test_one_fetch_at_a_time(self) -> None:
+        """FETCHes never overlap on the single connection."""
+        client = _make_client()
+        client.fetch_batch_size = 1
+        client.client.uid_search.return_value = Response(
+            "OK", [b" ".join(str(i).encode() for i in range(1, 11))],
+        )
+        active = []
+        peak = []
+
+        async def uid(command, *args):
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0)
+            active.pop()
+            return _fetch_response(args[0])
+
+        client.client.uid = uid
+        messages = asyncio.run(client.get_messages())
+
+        assert len(messages) == 10
+        assert max(peak) == 1
+
+    def test_next_batch_prefetched(self) -> None:
+        """The next batch is requested before the current is consumed."""
+        client = _make_client()
+        client.fetch_batch_size = 1
+        events = []
+
+        async def uid(command, *args):
+            events.append(("fetch", args[0]))
+            return _fetch_response(args[0])
+
+        client.client.uid = uid
+
+        async def consume():
+            async for message_id, _ in client.iter_messages():
+                await asyncio.sleep(0)
+                events.append(("yield", message_id))
+
+        asyncio.run(consume())
+
+        assert events == [
+            ("fetch", "3"), ("fetch", "2"), ("yield", 3),
+            ("fetch", "1"), ("yield", 2), ("yield", 1),
+        ]
+
+    def test_not_connected(self) -> None:
+        """Returns an empty list when not connected."""
+        client = _make_client()
+        client.client = None
+        assert asyncio.run(client.get_messages()) == []
+
+
+class TestMoveMany:
+    """Tests for AsyncImapClient.move_many()."""
+
+    def test_copy_fallback_expunges_only_moved(self) -> None:
+        """Without MOVE, uses COPY, STORE and UID EXPUNGE."""
+        client = _make_client()
+        client.client.has_capability = _capabilities("UIDPLUS")
+        calls: list = []
+        client.client.uid = _uid_handler(calls)
+
+        assert asyncio.run(client.move_many([1, 2], "Done"))
+
+        assert calls == [
+            ("copy", "1,2", "Done"),
+            ("store", "1,2", "+FLAGS", "(\\Deleted)"),
+            ("expunge", "1,2"),
+        ]
+        client.client.expunge.assert_not_awaited()
+
+    def test_plain_expunge_without_uidplus(self) -> None:
+        """Without UIDPLUS the folder is expunged as a whole."""
+        client = _make_client()
+        client.client.has_capability = _capabilities()
+        client.client.uid = _uid_handler([])
+
+        assert asyncio.run(client.move_many([1], "Done"))
+
+        client.client.expunge.assert_awaited_once()
+
+    def test_failed_store_stops_before_expunge(self) -> None:
+        """A rejected STORE is reported and nothing is expunged."""
+        client = _make_client()
+        client.client.has_capability = _capabilities("UIDPLUS")
+        commands = []
+
+        async def uid(command, *args):
+            commands.append(command)
+            ok = command != "store"
+            return Response("OK" if ok else "NO", [])
+
+        client.client.uid = uid
+
+        assert not asyncio.run(client.move_many([1], "Done"))
+        assert commands == ["copy", "store"]
+
+    def test_creates_folder_on_trycreate(self) -> None:
+        """The folder is created and the command retried on TRYCREATE."""
+        client = _make_client()
+        answers = [
+            Response("NO", [b"[TRYCREATE] Mailbox doesn't exist"]),
+            Response("OK", []),
+        ]
+        client.client.uid = AsyncMock(side_effect=answers)
+
+        assert asyncio.run(client.move_many([1], "New"))
+
+        client.client.create.assert_awaited_once_with("New")
+        assert client.client.uid.await_count == 2
+
+    def test_other_failure_does_not_create(self) -> None:
+        """A NO without TRYCREATE is reported, not papered over."""
+        client = _make_client()
+        client.client.uid = AsyncMock(
+            return_value=Response("NO", [b"Over quota"]),
+        )
+
+        assert not asyncio.run(client.move_many([1], "Done"))
+        client.client.create.assert_not_awaited()
+
+    @patch("imap_client_lib.async_ops_mixin._UID_CHUNK_SIZE", 2)
+    def test_uid_sets_are_chunked(self) -> None:
+        """MOVE and STORE are sent at most 1000 UIDs at a time."""
+        client = _make_client()
+        calls: list = []
+        client.client.uid = _uid_handler(calls)
+
+        asyncio.run(client.move_many([1, 2, 3], "Done"))
+        asyncio.run(client.mark_many_as_read([1, 2, 3]))
+
+        assert [c[:2] for c in calls] == [
+            ("move", "1,2"), ("move", "3"),
+            ("store", "1,2"), ("store", "3"),
+        ]
+
+
+class TestProcessMessagesWithCallback:
+    """Tests for AsyncImapClient.process_messages_with_callback()."""
+
+    def test_sync_callback_and_batched_store(self) -> None:
+        """Accepted messages are flagged with a single STORE."""
+        client = _make_client()
+        stored: list = []
+        client.client.uid = _uid_handler(stored)
+
+        count = asyncio.run(client.process_messages_with_callback(
+            lambda msg: msg.subject != "Message 2",
+        ))
+
+        assert count == 2
+        assert len(stored) == 1
+        assert stored[0][0] == "store"
+        assert sorted(stored[0][1].split(",")) == ["1", "3"]
+
+    def test_async_callback_and_move(self) -> None:
+        """Coroutine callbacks are awaited and messages moved."""
+        client = _make_client()
+        stored: list = []
+        client.client.uid = _uid_handler(stored)
+
+        async def callback(msg):
+            return True
+
+        count = asyncio.run(client.process_messages_with_callback(
+            callback, mark_as_read=False, move_to_folder="Done",
+        ))
+
+        assert count == 3
+        assert [c[0] for c in stored] == ["move"]
+        assert stored[0][2] == "Done"
+        client.client.expunge.assert_not_awaited()
+
+    def test_callbacks_run_concurrently_up_to_limit(self) -> None:
+        """Coroutine callbacks overlap up to callback_concurrency."""
+        client = _make_client()
+        stored: list = []
+        client.client.uid = _uid_handler(stored)
+        client.fetch_batch_size = 1
+        active = 0
+        peak = 0
+
+        async def callback(msg):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return msg.subject != "Message 2"
+
+        count = asyncio.run(client.process_messages_with_callback(
+            callback, callback_concurrency=2,
+        ))
+
+        assert count == 2
+        assert peak == 2
+        assert sorted(stored[0][1].split(",")) == ["1", "3"]
+
+
+class TestBlockingHelpers:
+    """Tests for the executor-backed SMTP and disk helpers."""
+
+    def test_forward_email_runs_sync_forward(self) -> None:
+        """forward_email delegates to ImapClient.forward_email."""
+        client = _make_client()
+        message = MagicMock()
+
+        with patch(
+            "imap_client_lib.client.ImapClient.forward_email",
+            return_value=True,
+        ) as forward:
+            result = asyncio.run(client.forward_email(
+                message, ["to@example.com"], new_subject="Fwd",
+            ))
+
+        assert result is True
+        forward.assert_called_once_with(
+            message, ["to@example.com"], new_subject="Fwd",
+        )
+
+    def test_save_attachments_writes_files(self, tmp_path: Path) -> None:
+        """save_attachments writes to disk off the event loop."""
+        client = _make_client()
+        attachments = [Attachment("a.pdf", "application/pdf", b"a")]
+
+        saved = asyncio.run(
+            client.save_attachments(attachments, str(tmp_path))
+        )
+
+        assert Path(saved[0]).read_bytes() == b"a"
@@ -0,0 +1,181 @@
+"""Tests for bulk message operations."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+
+
+def _make_client() -> ImapClient:
+    """Create an ImapClient with a mocked IMAP backend."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    client = ImapClient(account)
+    client.client = MagicMock()
+    client.client.list_folders.return_value = [
+        ((), b'/', 'INBOX'),
+        ((), b'/', 'Processed'),
+    ]
+    return client
+
+
+def _fake_fetch(uids, spec):
+    """Return a FETCH response for the requested UIDs."""
+    return {
+        uid: {
+            b'BODY[]': b"Subject: Test\r\n\r\nBody",
+            b'FLAGS': (),
+        }
+        for uid in uids
+    }
+
+
+class TestMoveMany:
+    """Tests for ImapClient.move_many()."""
+
+    def test_single_move_command(self) -> None:
+        """All UIDs are moved with one MOVE."""
+        client = _make_client()
+
+        assert client.move_many(["1", "2", "3"], "Processed")
+
+        client.client.move.assert_called_once_with(
+            [1, 2, 3], "Processed"
+        )
+        client.client.folder_status.assert_called_once()
+
+    @patch("imap_client_lib.message_ops_mixin._UID_CHUNK_SIZE", 2)
+    def test_chunks_large_moves(self) -> None:
+        """Moves are split into bounded chunks."""
+        client = _make_client()
+
+        client.move_many(["1", "2", "3"], "Processed")
+
+        assert client.client.move.call_count == 2
+
+    def test_empty_list_is_noop(self) -> None:
+        """Nothing is sent for an empty list."""
+        client = _make_client()
+
+        assert client.move_many([], "Processed") is True
+        client.client.move.assert_not_called()
+
+    def test_returns_false_on_error(self) -> None:
+        """Returns False when MOVE raises."""
+        client = _make_client()
+        client.client.move.side_effect = Exception("failed")
+
+        assert client.move_many(["1"], "Processed") is False
+
+    def test_falls_back_without_move(self) -> None:
+        """Without MOVE, uses COPY, STORE and UID EXPUNGE."""
+        client = _make_client()
+        client.client.has_capability.side_effect = (
+            lambda cap: cap == "UIDPLUS"
+        )
+
+        assert client.move_many(["1", "2"], "Processed")
+
+        client.client.move.assert_not_called()
+        client.client.copy.assert_called_once_with(
+            [1, 2], "Processed"
+        )
+        client.client.delete_messages.assert_called_once_with([1, 2])
+        client.client.uid_expunge.assert_called_once_with([1, 2])
+        client.client.expunge.assert_not_called()
+
+
+class TestMarkMany:
+    """Tests for ImapClient.mark_many_as_read/unread()."""
+
+    @patch("imap_client_lib.message_ops_mixin._UID_CHUNK_SIZE", 2)
+    def test_read_in_chunks(self) -> None:
+        """Seen is added with one STORE per chunk."""
+        client = _make_client()
+
+        assert client.mark_many_as_read(["1", 2, 3]) is True
+
+        calls = client.client.add_flags.call_args_list
+        assert [c[0] for c in calls] == [
+            ([1, 2], [b'\\Seen']), ([3], [b'\\Seen']),
+        ]
+
+    def test_unread_removes_flag(self) -> None:
+        """Seen is removed for all IDs in one STORE."""
+        client = _make_client()
+
+        assert client.mark_many_as_unread([5, 6]) is True
+
+        client.client.remove_flags.assert_called_once_with(
+            [5, 6], [b'\\Seen'],
+        )
+
+    def test_error_returns_false(self) -> None:
+        """A failing STORE is reported as False."""
+        client = _make_client()
+        client.client.add_flags.side_effect = Exception("NO")
+
+        assert client.mark_many_as_read([1]) is False
+
+
+class TestProcessMessagesBatching:
+    """Tests for deferred flag/move in callback processing."""
+
+    def test_flags_and_moves_once(self) -> None:
+        """Processed messages are flagged and moved in bulk."""
+        client = _make_client()
+        client.client.search.return_value = [1, 2, 3]
+        client.client.fetch.side_effect = _fake_fetch
+
+        count = client.process_messages_with_callback(
+            lambda m: m.message_id != "2",
+            ['ALL'],
+            move_to_folder="Processed",
+        )
+
+        assert count == 2
+        client.client.add_flags.assert_called_once_with(
+            [3, 1], [b'\\Seen']
+        )
+        client.client.move.assert_called_once_with(
+            [3, 1], "Processed"
+        )
+
+    def test_no_matches_sends_nothing(self) -> None:
+        """No STORE or MOVE when the callback rejects all."""
+        client = _make_client()
+        client.client.search.return_value = [1]
+        client.client.fetch.side_effect = _fake_fetch
+
+        count = client.process_messages_with_callback(
+            lambda m: False, ['ALL'], move_to_folder="Processed",
+        )
+
+        assert count == 0
+        client.client.add_flags.assert_not_called()
+        client.client.move.assert_not_called()
+
+
+class TestMessageIdTypes:
+    """Tests that int and str message IDs are interchangeable."""
+
+    def test_int_and_str_ids(self) -> None:
+        """Both forms reach the server as int UIDs."""
+        client = _make_client()
+        assert client.mark_as_read(5) is True
+        assert client.mark_as_read("6") is True
+        calls = client.client.add_flags.call_args_list
+        assert [c[0][0] for c in calls] == [[5], [6]]
+
+    def test_move_many_mixed_ids(self) -> None:
+        """move_many accepts a mix of int and str IDs."""
+        client = _make_client()
+        client._folder_cache = {"Archive"}
+        assert client.move_many([1, "2"], "Archive") is True
+        client.client.move.assert_called_once_with([1, 2], "Archive")
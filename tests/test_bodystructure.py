@@ -0,0 +1,175 @@
+"""Tests for BODYSTRUCTURE-driven attachment fetching."""
+
+from __future__ import annotations
+
+import base64
+from unittest.mock import MagicMock
+
+from imapclient.response_types import BodyData
+
+from imap_client_lib.account import Account
+from imap_client_lib.bodystructure import (
+    decode_part,
+    find_attachment_parts,
+    iter_parts,
+)
+from imap_client_lib.client import ImapClient
+
+
+def _make_client() -> ImapClient:
+    """Create an ImapClient with a mocked IMAP backend."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    client = ImapClient(account)
+    client.client = MagicMock()
+    return client
+
+
+_TEXT = (
+    b'text', b'plain', (b'charset', b'utf-8'), None, None,
+    b'7bit', 12, 1, None, None, None, None,
+)
+_HTML = (
+    b'text', b'html', (b'charset', b'utf-8'), None, None,
+    b'quoted-printable', 40, 2, None, None, None, None,
+)
+_PDF = (
+    b'application', b'pdf', (b'name', b'invoice.pdf'), None, None,
+    b'base64', 8, None, (b'attachment', (b'filename', b'invoice.pdf')),
+    None, None,
+)
+_PNG = (
+    b'image', b'png', (b'name', b'logo.png'), b'<logo>', None,
+    b'base64', 8, None, (b'inline', (b'filename', b'logo.png')),
+    None, None,
+)
+
+
+def _structure() -> BodyData:
+    """multipart/mixed(multipart/alternative(text, html), pdf, png)."""
+    alternative = ([_TEXT, _HTML], b'alternative')
+    return BodyData.create(
+        ([alternative, _PDF, _PNG], b'mixed'),
+    )
+
+
+class TestIterParts:
+    """Tests for section numbering."""
+
+    def test_nested_sections(self) -> None:
+        """Nested multiparts produce dotted section numbers."""
+        sections = [
+            (p.section, p.content_type)
+            for p in iter_parts(_structure())
+        ]
+        assert sections == [
+            ('1.1', 'text/plain'),
+            ('1.2', 'text/html'),
+            ('2', 'application/pdf'),
+            ('3', 'image/png'),
+        ]
+
+    def test_single_part_is_section_one(self) -> None:
+        """A non-multipart message has a single section 1."""
+        parts = list(iter_parts(BodyData.create(_TEXT)))
+        assert [p.section for p in parts] == ['1']
+
+    def test_disposition_position_depends_on_type(self) -> None:
+        """Text parts' extra line count does not shift detection."""
+        text_attachment = (
+            b'text', b'csv', (), None, None, b'7bit', 5, 1, None,
+            (b'attachment', (b'filename', b'data.csv')), None, None,
+        )
+        parts = list(iter_parts(BodyData.create(text_attachment)))
+        assert parts[0].filename == 'data.csv'
+        assert parts[0].disposition == 'attachment'
+
+
+class TestFindAttachmentParts:
+    """Tests for extension filtering."""
+
+    def test_filters_by_extension(self) -> None:
+        """Only parts with matching filenames are returned."""
+        parts = find_attachment_parts(_structure(), ['.PDF'])
+        assert [p.section for p in parts] == ['2']
+
+    def test_all_attachments_without_filter(self) -> None:
+        """Without extensions every named part is returned."""
+        parts = find_attachment_parts(_structure())
+        assert [p.filename for p in parts] == [
+            'invoice.pdf', 'logo.png',
+        ]
+
+
+class TestDecodePart:
+    """Tests for transfer-encoding decoding."""
+
+    def test_base64(self) -> None:
+        """Base64 bodies with line breaks are decoded."""
+        assert decode_part(b'aGVs\r\nbG8=\r\n', 'base64') == b'hello'
+
+    def test_quoted_printable(self) -> None:
+        """Quoted-printable bodies are decoded."""
+        assert decode_part(b'caf=C3=A9', 'quoted-printable') == (
+            'café'.encode()
+        )
+
+    def test_identity(self) -> None:
+        """7bit and binary bodies are returned unchanged."""
+        assert decode_part(b'raw', '7bit') == b'raw'
+
+
+class TestFetchAttachments:
+    """Tests for ImapClient.fetch_attachments()."""
+
+    def test_fetches_only_matching_sections(self) -> None:
+        """Only the PDF section is requested and decoded."""
+        client = _make_client()
+        payload = base64.encodebytes(b'%PDF-1.4')
+        client.client.fetch.side_effect = [
+            {7: {b'BODYSTRUCTURE': _structure()}},
+            {7: {b'BODY[2]': payload}},
+        ]
+
+        attachments = client.fetch_attachments('7', ['pdf'])
+
+        assert [a.filename for a in attachments] == ['invoice.pdf']
+        assert attachments[0].data == b'%PDF-1.4'
+        assert attachments[0].content_type == 'application/pdf'
+        assert client.client.fetch.call_args_list[1][0] == (
+            [7], ['BODY.PEEK[2]'],
+        )
+
+    def test_uses_supplied_bodystructure(self) -> None:
+        """A known BODYSTRUCTURE skips the structure fetch."""
+        client = _make_client()
+        client.client.fetch.return_value = {
+            7: {b'BODY[3]': base64.encodebytes(b'png')},
+        }
+
+        attachments = client.fetch_attachments(
+            7, ['png'], bodystructure=_structure(),
+        )
+
+        assert client.client.fetch.call_count == 1
+        assert attachments[0].is_inline
+        assert attachments[0].content_id == '<logo>'
+
+    def test_no_matching_parts(self) -> None:
+        """No section fetch is issued when nothing matches."""
+        client = _make_client()
+        attachments = client.fetch_attachments(
+            7, ['zip'], bodystructure=_structure(),
+        )
+        assert attachments == []
+        client.client.fetch.assert_not_called()
+
+    def test_not_connected(self) -> None:
+        """Returns an empty list when not connected."""
+        client = _make_client()
+        client.client = None
+        assert client.fetch_attachments('7') == []
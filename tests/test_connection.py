@@ -0,0 +1,116 @@
+"""Tests for ImapClient session handling."""
+
+from __future__ import annotations
+
+import logging
+from unittest.mock import MagicMock, patch
+
+from imapclient.exceptions import IMAPClientError
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+
+
+def _make_client() -> ImapClient:
+    """Create an ImapClient with a test account."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    return ImapClient(account)
+
+
+class TestContextManager:
+    """Tests for the with-statement support."""
+
+    @patch("imap_client_lib.client.IMAPClient")
+    def test_connects_and_disconnects(
+        self, mock_imap_cls: MagicMock,
+    ) -> None:
+        """Entering connects, leaving logs out."""
+        with _make_client() as client:
+            assert client.client is mock_imap_cls.return_value
+
+        mock_imap_cls.return_value.logout.assert_called_once()
+        assert client.client is None
+
+
+class TestDebugFlag:
+    """Tests for the cached debug-level check."""
+
+    @patch("imap_client_lib.client.IMAPClient")
+    def test_refreshed_on_connect(
+        self, mock_imap_cls: MagicMock,
+    ) -> None:
+        """connect() picks up a logger level changed after init."""
+        logger = logging.getLogger("test_debug_flag")
+        logger.setLevel(logging.INFO)
+        client = ImapClient(_make_client().account, logger=logger)
+        assert client._debug is False
+
+        logger.setLevel(logging.DEBUG)
+        client.connect()
+        assert client._debug is True
+
+
+class TestEnsureAlive:
+    """Tests for the NOOP liveness check."""
+
+    def test_live_session_is_kept(self) -> None:
+        """A successful NOOP keeps the existing session."""
+        client = _make_client()
+        session = MagicMock()
+        client.client = session
+
+        assert client._ensure_alive() is True
+        session.noop.assert_called_once()
+        assert client.client is session
+
+    @patch("imap_client_lib.client.IMAPClient")
+    def test_reconnects_on_dropped_session(
+        self, mock_imap_cls: MagicMock,
+    ) -> None:
+        """A failing NOOP triggers a fresh connection."""
+        client = _make_client()
+        stale = MagicMock()
+        stale.noop.side_effect = IMAPClientError("gone")
+        client.client = stale
+
+        assert client._ensure_alive() is True
+        assert client.client is mock_imap_cls.return_value
+
+
+class TestProcessMessagesSessionReuse:
+    """Tests for connection reuse in callback processing."""
+
+    @patch("imap_client_lib.client.IMAPClient")
+    def test_reuses_open_connection(
+        self, mock_imap_cls: MagicMock,
+    ) -> None:
+        """An open session is reused and left open."""
+        client = _make_client()
+        session = MagicMock()
+        session.search.return_value = []
+        client.client = session
+
+        client.process_messages_with_callback(lambda m: True)
+
+        mock_imap_cls.assert_not_called()
+        session.logout.assert_not_called()
+        assert client.client is session
+
+    @patch("imap_client_lib.client.IMAPClient")
+    def test_connects_and_closes_when_not_connected(
+        self, mock_imap_cls: MagicMock,
+    ) -> None:
+        """Without a session, one is opened and closed again."""
+        client = _make_client()
+        mock_imap_cls.return_value.search.return_value = []
+
+        client.process_messages_with_callback(lambda m: True)
+
+        mock_imap_cls.assert_called_once()
+        mock_imap_cls.return_value.logout.assert_called_once()
+        assert client.client is None
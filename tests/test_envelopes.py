@@ -0,0 +1,301 @@
+"""Tests for header-only retrieval, header decoding and body fetches."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from imapclient.response_types import Address, Envelope
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+from imap_client_lib.email_message import (
+    EmailHeader,
+    EmailMessage,
+    _decode_header_str,
+)
+
+
+def _make_client() -> ImapClient:
+    """Create an ImapClient with a mocked IMAP backend."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    client = ImapClient(account)
+    client.client = MagicMock()
+    return client
+
+
+def _envelope(subject: bytes) -> Envelope:
+    """Build an ENVELOPE with the given raw subject."""
+    return Envelope(
+        date=datetime(2024, 1, 1),
+        subject=subject,
+        from_=(Address(b'Jane Doe', None, b'jane', b'example.com'),),
+        sender=None, reply_to=None, to=None, cc=None, bcc=None,
+        in_reply_to=None, message_id=b'<1@example.com>',
+    )
+
+
+def _fake_fetch(uids, spec):
+    """Answer envelope and body FETCHes for the given UIDs."""
+    data = {}
+    for uid in uids:
+        if 'ENVELOPE' in spec:
+            data[uid] = {
+                b'ENVELOPE': _envelope(f"Invoice {uid}".encode()
+                                       if uid % 2 else b"Hello"),
+                b'RFC822.SIZE': 1234,
+                b'FLAGS': (b'$label1',),
+            }
+        else:
+            data[uid] = {
+                b'BODY[]': b"Subject: Invoice\r\n\r\nBody",
+                b'FLAGS': (),
+            }
+    return data
+
+
+class TestEmailHeader:
+    """Tests for EmailHeader.from_fetch()."""
+
+    def test_decodes_envelope(self) -> None:
+        """Subject and sender are decoded from the envelope."""
+        header = EmailHeader.from_fetch("4", {
+            b'ENVELOPE': _envelope(b'=?utf-8?q?Gr=C3=BC=C3=9Fe?='),
+            b'RFC822.SIZE': 99,
+        })
+
+        assert header.subject == "Grüße"
+        assert header.from_address == "Jane Doe <jane@example.com>"
+        assert header.size == 99
+        assert header.date == datetime(2024, 1, 1)
+
+    def test_lowercase_fields_are_cached(self) -> None:
+        """subject_lower is computed once and kept out of repr/eq."""
+        header = EmailHeader.from_fetch("4", {
+            b'ENVELOPE': _envelope(b'INVOICE 42'),
+        })
+
+        assert header.subject_lower == "invoice 42"
+        assert header.subject_lower is header.subject_lower
+        assert header.from_address_lower == (
+            "jane doe <jane@example.com>"
+        )
+        assert "_subject_lower" not in repr(header)
+        assert header == EmailHeader.from_fetch("4", {
+            b'ENVELOPE': _envelope(b'INVOICE 42'),
+        })
+
+
+class TestHeaderDecoding:
+    """Tests for the memoised MIME header decoding."""
+
+    def test_repeated_sender_hits_cache(self) -> None:
+        """Decoding the same From header again is a cache hit."""
+        raw = (
+            b"From: =?utf-8?q?J=C3=BCrgen?= <j@example.com>\r\n"
+            b"Subject: Hi\r\n\r\nBody"
+        )
+        EmailMessage.from_bytes("1", raw)
+        hits = _decode_header_str.cache_info().hits
+
+        msg = EmailMessage.from_bytes("2", raw)
+
+        assert msg.from_address == "Jürgen <j@example.com>"
+        assert _decode_header_str.cache_info().hits > hits
+
+    def test_raw_8bit_header_is_decoded(self) -> None:
+        """Undecodable raw bytes still parse without the cache."""
+        raw = "Subject: Grüße\r\n\r\nBody".encode("utf-8")
+
+        msg = EmailMessage.from_bytes("1", raw)
+
+        assert msg.subject
+
+
+class TestGetBody:
+    """Tests for EmailMessage.get_body()."""
+
+    def test_body_is_decoded_once(self) -> None:
+        """Repeated calls reuse the decoded body."""
+        msg = EmailMessage.from_bytes(
+            "1", b"Subject: Hi\r\n\r\nHello",
+        )
+
+        first = msg.get_body()
+        msg.raw_message.set_payload("changed")
+
+        assert msg.get_body() is first
+        assert msg.get_body("text/html") is None
+
+    def test_bad_charset_falls_back_to_utf8(self) -> None:
+        """An unknown charset is decoded as UTF-8."""
+        msg = EmailMessage.from_bytes(
+            "1",
+            b"Content-Type: text/plain; charset=bogus\r\n\r\n"
+            + "Grüße".encode("utf-8"),
+        )
+
+        assert msg.get_body() == "Grüße"
+
+
+class TestFromBytesLogging:
+    """Tests for debug logging in EmailMessage.from_bytes()."""
+
+    def test_no_debug_calls_when_disabled(self) -> None:
+        """Nothing is formatted or logged below DEBUG level."""
+        logger = MagicMock()
+        logger.isEnabledFor.return_value = False
+
+        EmailMessage.from_bytes(
+            "1", b"Subject: Hi\r\n\r\nBody", logger,
+        )
+
+        logger.debug.assert_not_called()
+
+    def test_debug_calls_when_enabled(self) -> None:
+        """Parts are logged when DEBUG is enabled."""
+        logger = MagicMock()
+        logger.isEnabledFor.return_value = True
+
+        EmailMessage.from_bytes(
+            "1", b"Subject: Hi\r\n\r\nBody", logger,
+        )
+
+        assert logger.debug.called
+
+
+class TestGetEnvelopes:
+    """Tests for ImapClient.get_envelopes()."""
+
+    def test_fetches_envelopes_only(self) -> None:
+        """No message bodies are requested."""
+        client = _make_client()
+        client.client.search.return_value = [1, 2]
+        client.client.fetch.side_effect = _fake_fetch
+
+        headers = client.get_envelopes(['ALL'])
+
+        spec = client.client.fetch.call_args[0][1]
+        assert 'BODY.PEEK[]' not in spec
+        assert [h[0] for h in headers] == [2, 1]
+        assert headers[1][1].subject == "Invoice 1"
+        assert headers[1][1].keywords == ['$label1']
+
+
+class TestHeaderFilter:
+    """Tests for header_filter in process_messages_with_callback."""
+
+    def test_bodies_only_for_accepted_headers(self) -> None:
+        """Only messages accepted by the filter are downloaded."""
+        client = _make_client()
+        client.client.search.return_value = [1, 2, 3]
+        client.client.fetch.side_effect = _fake_fetch
+        seen = []
+
+        count = client.process_messages_with_callback(
+            lambda m: seen.append(m.message_id) or True,
+            ['ALL'],
+            mark_as_read=False,
+            header_filter=lambda h: h.subject.startswith("Invoice"),
+        )
+
+        body_calls = [
+            c.args[0] for c in client.client.fetch.call_args_list
+            if 'BODY.PEEK[]' in c.args[1]
+        ]
+        assert body_calls == [[3, 1]]
+        assert seen == ["3", "1"]
+        assert count == 2
+
+
+class TestFetchBody:
+    """Tests for ImapClient.fetch_body()."""
+
+    def test_returns_message(self) -> None:
+        """The full message is parsed."""
+        client = _make_client()
+        client.client.fetch.side_effect = _fake_fetch
+
+        message = client.fetch_body("5")
+
+        assert message is not None
+        assert message.subject == "Invoice"
+
+    def test_returns_none_when_missing(self) -> None:
+        """Unknown UIDs return None."""
+        client = _make_client()
+        client.client.fetch.return_value = {}
+
+        assert client.fetch_body("5") is None
+
+
+class TestGetMessageHeaders:
+    """Tests for ImapClient.get_message_headers()."""
+
+    def test_fetches_header_block_only(self) -> None:
+        """BODY.PEEK[HEADER] is requested and parsed."""
+        client = _make_client()
+        client.message_cache_size = 10
+        client.client.search.return_value = [1]
+        client.client.fetch.return_value = {
+            1: {
+                b'BODY[HEADER]': (
+                    b"Subject: Invoice\r\nList-Id: <billing>\r\n\r\n"
+                ),
+                b'FLAGS': (b'$label1',),
+            },
+        }
+
+        messages = client.get_message_headers(['ALL'])
+
+        client.client.fetch.assert_called_once_with(
+            [1], ['BODY.PEEK[HEADER]', 'FLAGS'],
+        )
+        message_id, message = messages[0]
+        assert message_id == 1
+        assert message.subject == "Invoice"
+        assert message.raw_message['List-Id'] == "<billing>"
+        assert message.attachments == []
+        assert message.keywords == ['$label1']
+        assert len(client._message_cache) == 0
+
+    def test_process_headers_only(self) -> None:
+        """process_messages_with_callback can skip bodies."""
+        client = _make_client()
+        client.client.search.return_value = [1]
+        client.client.fetch.return_value = {
+            1: {b'BODY[HEADER]': b"Subject: Hi\r\n\r\n", b'FLAGS': ()},
+        }
+
+        count = client.process_messages_with_callback(
+            lambda msg: msg.subject == "Hi", headers_only=True,
+        )
+
+        assert count == 1
+        spec = client.client.fetch.call_args_list[0][0][1]
+        assert spec == ['BODY.PEEK[HEADER]', 'FLAGS']
+
+    def test_preview_bytes_fetches_partial_text(self) -> None:
+        """preview_bytes adds a partial TEXT fetch to the header."""
+        client = _make_client()
+        client.client.search.return_value = [1]
+        client.client.fetch.return_value = {
+            1: {
+                b'BODY[HEADER]': b"Subject: Hi\r\n\r\n",
+                b'BODY[TEXT]<0>': b"Hello th",
+                b'FLAGS': (),
+            },
+        }
+
+        messages = client.get_message_headers(['ALL'], preview_bytes=8)
+
+        client.client.fetch.assert_called_once_with(
+            [1], ['BODY.PEEK[HEADER]', 'FLAGS', 'BODY.PEEK[TEXT]<0.8>'],
+        )
+        assert messages[0][1].subject == "Hi"
+        assert messages[0][1].get_body() == "Hello th"
@@ -0,0 +1,106 @@
+"""Tests for folder lookup and caching."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from imapclient.exceptions import IMAPClientError
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+
+
+def _make_client() -> ImapClient:
+    """Create an ImapClient with a mocked IMAP backend."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    client = ImapClient(account)
+    client.client = MagicMock()
+    client.client.list_folders.return_value = [
+        ((), b'/', 'INBOX'),
+        ((), b'/', 'Archive'),
+    ]
+
+    def folder_status(folder, items):
+        if folder not in ('INBOX', 'Archive'):
+            raise IMAPClientError("Mailbox doesn't exist")
+        return {b'MESSAGES': 0}
+
+    client.client.folder_status.side_effect = folder_status
+    return client
+
+
+class TestFolderCache:
+    """Tests for the cached folder-name lookup."""
+
+    def test_moves_check_folder_once(self) -> None:
+        """Repeated moves check the folder once, without LIST."""
+        client = _make_client()
+
+        assert client.move_to_folder("1", "Archive") is True
+        assert client.move_to_folder("2", "Archive") is True
+
+        client.client.folder_status.assert_called_once_with(
+            "Archive", [b'MESSAGES']
+        )
+        client.client.list_folders.assert_not_called()
+        client.client.create_folder.assert_not_called()
+        assert client.client.move.call_count == 2
+
+    def test_created_folder_is_cached(self) -> None:
+        """A folder created on demand is added to the cache."""
+        client = _make_client()
+
+        client.move_to_folder("1", "Invoices")
+        client.move_to_folder("2", "Invoices")
+
+        client.client.create_folder.assert_called_once_with(
+            "Invoices"
+        )
+        client.client.folder_status.assert_called_once()
+
+    def test_disconnect_clears_cache(self) -> None:
+        """The cache does not outlive the connection."""
+        client = _make_client()
+        client._ensure_folder_exists("Archive")
+
+        client.disconnect()
+
+        assert client._folder_cache is None
+
+    def test_list_folders_seeds_cache(self) -> None:
+        """An explicit listing is reused by later moves."""
+        client = _make_client()
+
+        assert client.list_folders() == ['INBOX', 'Archive']
+        client.move_to_folder("1", "Archive")
+
+        client.client.list_folders.assert_called_once()
+        client.client.folder_status.assert_not_called()
+
+    def test_server_error_invalidates_cache(self) -> None:
+        """A rejected MOVE makes the next move re-check the folder."""
+        client = _make_client()
+        client.move_to_folder("1", "Archive")
+        client.client.move.side_effect = IMAPClientError("no such box")
+
+        assert client.move_to_folder("2", "Archive") is False
+        assert client._folder_cache is None
+
+        client.client.move.side_effect = None
+        client.move_to_folder("3", "Archive")
+        assert client.client.folder_status.call_count == 2
+
+    def test_socket_error_keeps_cache(self) -> None:
+        """Connection errors say nothing about folders."""
+        client = _make_client()
+        client.move_to_folder("1", "Archive")
+        client.client.move.side_effect = OSError("reset")
+
+        client.move_to_folder("2", "Archive")
+
+        assert client._folder_cache == {"Archive"}
@@ -0,0 +1,306 @@
+"""Tests for ImapClient.get_messages()."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock
+
+from imapclient.exceptions import IMAPClientError
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+
+
+def _make_client() -> ImapClient:
+    """Create an ImapClient with a mocked IMAP backend."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    client = ImapClient(account)
+    client.client = MagicMock()
+    return client
+
+
+def _raw_email(subject: str) -> bytes:
+    """Build a minimal RFC822 message with the given subject."""
+    return (
+        b"From: sender@example.com\r\n"
+        b"Subject: " + subject.encode() + b"\r\n"
+        b"\r\nBody text"
+    )
+
+
+def _fetch_result(uids):
+    """Build a fake FETCH response for the given UIDs."""
+    return {
+        uid: {
+            b'BODY[]': _raw_email(f"Message {uid}"),
+            b'FLAGS': (b'\\Seen',),
+        }
+        for uid in uids
+    }
+
+
+class TestGetMessagesBatching:
+    """Tests for batched FETCH in get_messages."""
+
+    def test_single_fetch_for_all_uids(self) -> None:
+        """All UIDs are fetched with one FETCH command."""
+        client = _make_client()
+        client.client.search.return_value = [1, 2, 3]
+        client.client.fetch.return_value = _fetch_result([1, 2, 3])
+
+        messages = client.get_messages(['ALL'])
+
+        client.client.fetch.assert_called_once_with(
+            [3, 2, 1], ['BODY.PEEK[]', 'FLAGS'],
+        )
+        assert [m[0] for m in messages] == [3, 2, 1]
+        assert messages[0][1].subject == "Message 3"
+
+    def test_large_result_is_chunked(self) -> None:
+        """UID lists larger than fetch_batch_size are split."""
+        client = _make_client()
+        client.fetch_batch_size = 2
+        client.client.search.return_value = [1, 2, 3]
+        client.client.fetch.side_effect = (
+            lambda uids, spec: _fetch_result(uids)
+        )
+
+        messages = client.get_messages(['ALL'])
+
+        assert client.client.fetch.call_count == 2
+        assert len(messages) == 3
+
+    def test_default_batch_size(self) -> None:
+        """Bodies are fetched 100 at a time by default."""
+        client = _make_client()
+        client.client.search.return_value = list(range(1, 251))
+        client.client.fetch.side_effect = (
+            lambda uids, spec: _fetch_result(uids)
+        )
+
+        messages = client.get_messages(['ALL'])
+
+        sizes = [len(c[0][0]) for c in client.client.fetch.call_args_list]
+        assert sizes == [100, 100, 50]
+        assert len(messages) == 250
+
+    def test_malformed_entry_does_not_drop_batch(self) -> None:
+        """A missing or broken entry only skips that message."""
+        client = _make_client()
+        client.client.search.return_value = [1, 2]
+        client.client.fetch.return_value = _fetch_result([1])
+
+        messages = client.get_messages(['ALL'])
+
+        assert [m[0] for m in messages] == [1]
+
+    def test_rejected_batch_falls_back_per_message(self) -> None:
+        """A failed batch FETCH is retried one UID at a time."""
+        client = _make_client()
+        client.client.search.return_value = [1, 2, 3]
+
+        def fetch(uids, spec):
+            if len(uids) > 1 or uids == [2]:
+                raise IMAPClientError("FETCH failed")
+            return _fetch_result(uids)
+
+        client.client.fetch.side_effect = fetch
+
+        messages = client.get_messages(['ALL'])
+
+        assert [m[0] for m in messages] == [3, 1]
+        assert client.client.fetch.call_count == 4
+
+    def test_connection_errors_are_not_retried(self) -> None:
+        """Socket errors abort instead of retrying every UID."""
+        client = _make_client()
+        client.client.search.return_value = [1, 2, 3]
+        client.client.fetch.side_effect = OSError("reset")
+
+        assert client.get_messages(['ALL']) == []
+        client.client.fetch.assert_called_once()
+
+    def test_no_matches(self) -> None:
+        """An empty search result skips FETCH entirely."""
+        client = _make_client()
+        client.client.search.return_value = []
+
+        assert client.get_messages(['ALL']) == []
+        client.client.fetch.assert_not_called()
+
+
+class TestReadonlySelect:
+    """Tests for opening folders with EXAMINE."""
+
+    def test_read_write_by_default(self) -> None:
+        """Folders are selected read-write unless asked otherwise."""
+        client = _make_client()
+        client.client.search.return_value = []
+
+        client.get_messages(['ALL'], 'Archive')
+
+        client.client.select_folder.assert_called_once_with(
+            'Archive', readonly=False,
+        )
+
+    def test_readonly_passed_through(self) -> None:
+        """readonly=True opens the folder with EXAMINE."""
+        client = _make_client()
+        client.client.search.return_value = [1]
+        client.client.fetch.return_value = _fetch_result([1])
+
+        messages = client.get_all_messages('Archive', readonly=True)
+
+        assert [m[0] for m in messages] == [1]
+        client.client.select_folder.assert_called_once_with(
+            'Archive', readonly=True,
+        )
+
+
+class TestStreamingProcessing:
+    """Tests for lazy message iteration in callback processing."""
+
+    def test_callback_runs_before_next_batch(self) -> None:
+        """Each batch is handed to the callback before the next FETCH."""
+        client = _make_client()
+        client.fetch_batch_size = 2
+        client.client.search.return_value = [1, 2, 3, 4]
+        events = []
+
+        def fetch(uids, spec):
+            events.append(("fetch", list(uids)))
+            return _fetch_result(uids)
+
+        client.client.fetch.side_effect = fetch
+
+        def callback(msg):
+            events.append(("callback", msg.subject))
+            return True
+
+        count = client.process_messages_with_callback(
+            callback, mark_as_read=False,
+        )
+
+        assert count == 4
+        assert events == [
+            ("fetch", [4, 3]),
+            ("callback", "Message 4"),
+            ("callback", "Message 3"),
+            ("fetch", [2, 1]),
+            ("callback", "Message 2"),
+            ("callback", "Message 1"),
+        ]
+
+    def test_failure_midway_keeps_processed(self) -> None:
+        """Messages processed before a fetch error are still flagged."""
+        client = _make_client()
+        client.fetch_batch_size = 2
+        client.client.search.return_value = [1, 2, 3, 4]
+
+        def fetch(uids, spec):
+            if 2 in uids:
+                raise OSError("connection reset")
+            return _fetch_result(uids)
+
+        client.client.fetch.side_effect = fetch
+
+        count = client.process_messages_with_callback(lambda m: True)
+
+        assert count == 2
+        client.client.add_flags.assert_called_once_with(
+            [4, 3], [b'\\Seen'],
+        )
+
+
+class TestIterMessages:
+    """Tests for ImapClient.iter_messages()."""
+
+    def test_fetches_lazily(self) -> None:
+        """No FETCH is sent until the iterator is advanced."""
+        client = _make_client()
+        client.fetch_batch_size = 2
+        client.client.search.return_value = [1, 2, 3]
+        client.client.fetch.side_effect = (
+            lambda uids, spec: _fetch_result(uids)
+        )
+
+        messages = client.iter_messages(['ALL'])
+        client.client.fetch.assert_not_called()
+
+        assert next(messages)[0] == 3
+        assert client.client.fetch.call_count == 1
+        assert [m[0] for m in messages] == [2, 1]
+        assert client.client.fetch.call_count == 2
+
+    def test_error_ends_iteration(self) -> None:
+        """Messages before a failing batch are still yielded."""
+        client = _make_client()
+        client.fetch_batch_size = 1
+        client.client.search.return_value = [1, 2]
+
+        def fetch(uids, spec):
+            if 1 in uids:
+                raise OSError("connection reset")
+            return _fetch_result(uids)
+
+        client.client.fetch.side_effect = fetch
+
+        assert [m[0] for m in client.iter_messages(['ALL'])] == [2]
+
+    def test_not_connected(self) -> None:
+        """Yields nothing without a connection."""
+        client = _make_client()
+        client.client = None
+
+        assert list(client.iter_messages(['ALL'])) == []
+
+
+class TestParallelCallbacks:
+    """Tests for process_messages_with_callback(max_workers=...)."""
+
+    def test_callbacks_overlap(self) -> None:
+        """Callbacks run concurrently on the worker threads."""
+        client = _make_client()
+        client.client.search.return_value = [1, 2, 3, 4]
+        client.client.fetch.return_value = _fetch_result([1, 2, 3, 4])
+        barrier = threading.Barrier(2, timeout=5)
+
+        def callback(msg):
+            barrier.wait()
+            return msg.subject != "Message 2"
+
+        count = client.process_messages_with_callback(
+            callback, max_workers=2,
+        )
+
+        assert count == 3
+        client.client.add_flags.assert_called_once_with(
+            [4, 3, 1], [b'\\Seen'],
+        )
+
+    def test_failure_midway_keeps_processed(self) -> None:
+        """A fetch error still flushes callbacks already submitted."""
+        client = _make_client()
+        client.fetch_batch_size = 2
+        client.client.search.return_value = [1, 2, 3, 4]
+
+        def fetch(uids, spec):
+            if 2 in uids:
+                raise OSError("connection reset")
+            return _fetch_result(uids)
+
+        client.client.fetch.side_effect = fetch
+
+        count = client.process_messages_with_callback(
+            lambda m: True, max_workers=4,
+        )
+
+        assert count == 2
+        client.client.add_flags.assert_called_once_with(
+            [4, 3], [b'\\Seen'],
+        )
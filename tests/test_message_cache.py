@@ -0,0 +1,118 @@
+"""Tests for the parsed-message cache used by get_messages()."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+
+
+def _make_client(cache_size: int = 10) -> ImapClient:
+    """Create an ImapClient with caching and a mocked backend."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    client = ImapClient(account, message_cache_size=cache_size)
+    client.client = MagicMock()
+    client.client.select_folder.return_value = {b'UIDVALIDITY': 7}
+    client.client.fetch.side_effect = _fake_fetch
+    return client
+
+
+def _fake_fetch(uids, spec):
+    """Return a FETCH response for the requested UIDs."""
+    data = {}
+    for uid in uids:
+        data[uid] = {b'FLAGS': (b'$label1',)}
+        if 'BODY.PEEK[]' in spec:
+            data[uid][b'BODY[]'] = (
+                b"Subject: Message " + str(uid).encode()
+                + b"\r\n\r\nBody"
+            )
+    return data
+
+
+def _body_fetches(client: ImapClient):
+    """Return the UID lists of all body FETCH calls."""
+    return [
+        c.args[0] for c in client.client.fetch.call_args_list
+        if 'BODY.PEEK[]' in c.args[1]
+    ]
+
+
+class TestMessageCache:
+    """Tests for cache hits, misses and invalidation."""
+
+    def test_second_call_only_fetches_new_uids(self) -> None:
+        """Cached bodies are not fetched again."""
+        client = _make_client()
+        client.client.search.return_value = [1, 2]
+        first = client.get_messages(['ALL'])
+
+        client.client.search.return_value = [1, 2, 3]
+        second = client.get_messages(['ALL'])
+
+        assert _body_fetches(client) == [[2, 1], [3]]
+        assert [m[0] for m in second] == [3, 2, 1]
+        assert second[1][1] is first[0][1]
+
+    def test_hits_refresh_keywords(self) -> None:
+        """Cached messages get their keywords from fresh FLAGS."""
+        client = _make_client()
+        client.client.search.return_value = [1]
+        client.get_messages(['ALL'])
+        client.client.fetch.side_effect = None
+        client.client.fetch.return_value = {
+            1: {b'FLAGS': (b'$label2',)},
+        }
+
+        messages = client.get_messages(['ALL'])
+
+        assert messages[0][1].keywords == ['$label2']
+
+    def test_uidvalidity_change_invalidates(self) -> None:
+        """A new UIDVALIDITY drops the folder's entries."""
+        client = _make_client()
+        client.client.search.return_value = [1]
+        client.get_messages(['ALL'])
+
+        client.client.select_folder.return_value = {b'UIDVALIDITY': 8}
+        client.get_messages(['ALL'])
+
+        assert _body_fetches(client) == [[1], [1]]
+
+    def test_lru_eviction(self) -> None:
+        """The cache never exceeds its size."""
+        client = _make_client(cache_size=2)
+        client.client.search.return_value = [1, 2, 3]
+
+        client.get_messages(['ALL'])
+
+        assert len(client._message_cache) == 2
+
+    def test_disabled_by_default(self) -> None:
+        """Without a cache size, every call fetches bodies."""
+        client = _make_client(cache_size=0)
+        client.client.search.return_value = [1]
+
+        client.get_messages(['ALL'])
+        client.get_messages(['ALL'])
+
+        assert _body_fetches(client) == [[1], [1]]
+        assert not client._message_cache
+
+    def test_move_and_delete_drop_entries(self) -> None:
+        """Moved or deleted messages leave the cache."""
+        client = _make_client()
+        client._folder_cache = {'Archive'}
+        client.client.search.return_value = [1, 2, 3]
+        client.get_messages(['ALL'])
+
+        client.move_many([1, 2], 'Archive')
+        client.delete_message(3)
+
+        assert not client._message_cache
@@ -0,0 +1,128 @@
+"""Tests for ImapClient.move_with_headers() header rewriting."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+from imap_client_lib.header_rewrite_mixin import _replace_headers
+
+_BODY = b"--XX\r\nContent-Type: application/pdf\r\n\r\nJVBERi0=\r\n--XX--\r\n"
+_RAW = (
+    b"From: sender@example.com\r\n"
+    b"X-Processed: old\r\n"
+    b"Subject: a long\r\n"
+    b" folded subject\r\n"
+    b"\r\n" + _BODY
+)
+
+
+def _make_client() -> ImapClient:
+    """Create an ImapClient with a mocked IMAP backend."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    client = ImapClient(account)
+    client.client = MagicMock()
+    return client
+
+
+class TestReplaceHeaders:
+    """Tests for the byte-level header rewrite."""
+
+    def test_body_is_untouched(self) -> None:
+        """Only the header block changes."""
+        result = _replace_headers(_RAW, {"X-Tag": "done"})
+
+        head, body = result.split(b"\r\n\r\n", 1)
+        assert body == _BODY
+        assert head.endswith(b"\r\nX-Tag: done")
+
+    def test_replaces_existing_header(self) -> None:
+        """Existing headers of the same name are dropped."""
+        result = _replace_headers(_RAW, {"x-processed": "new"})
+
+        assert b"X-Processed: old" not in result
+        assert result.count(b"x-processed: new") == 1
+
+    def test_drops_folded_continuation_lines(self) -> None:
+        """A replaced folded header loses all its lines."""
+        result = _replace_headers(_RAW, {"Subject": "Short"})
+
+        assert b"folded subject" not in result
+        assert b"Subject: Short\r\n\r\n" in result
+
+    def test_non_ascii_value_is_encoded(self) -> None:
+        """Non-ASCII values are RFC 2047 encoded."""
+        result = _replace_headers(_RAW, {"X-Note": "Grüße"})
+
+        assert b"X-Note: =?utf-8?" in result
+
+    def test_folding_keeps_crlf_framing(self) -> None:
+        """Folded values use CRLF and never a bare LF."""
+        result = _replace_headers(_RAW, {
+            "X-Note": "Grüße " * 20,
+            "X-Long": "word " * 30,
+        })
+
+        head = result.split(b"\r\n\r\n", 1)[0]
+        assert b"\n" not in head.replace(b"\r\n", b"")
+        assert all(len(line) <= 78 for line in head.split(b"\r\n"))
+        assert b"\r\n " in head.split(b"X-Long:", 1)[1]
+
+    def test_folding_follows_lf_messages(self) -> None:
+        """LF-only messages get LF continuation lines."""
+        result = _replace_headers(
+            b"Subject: Hi\n\nBody", {"X-Long": "word " * 30},
+        )
+
+        assert b"\r" not in result
+        assert b"\n word" in result
+
+    def test_header_only_message(self) -> None:
+        """A message without a body keeps a valid header block."""
+        result = _replace_headers(b"Subject: Hi\n", {"X-Tag": "1"})
+
+        assert result == b"Subject: Hi\nX-Tag: 1\n\n"
+
+
+class TestMoveWithHeaders:
+    """Tests for ImapClient.move_with_headers()."""
+
+    def test_appends_rewritten_message(self) -> None:
+        """The rewritten bytes are appended and the original removed."""
+        client = _make_client()
+        client._folder_cache = {"Done"}
+        client.client.fetch.return_value = {
+            7: {
+                b'BODY[]': _RAW,
+                b'FLAGS': (b'\\Seen',),
+                b'INTERNALDATE': "date",
+            },
+        }
+
+        assert client.move_with_headers(7, "Done", {"X-Tag": "done"})
+
+        args = client.client.append.call_args
+        assert args[0][0] == "Done"
+        assert args[0][1].endswith(b"X-Tag: done\r\n\r\n" + _BODY)
+        client.client.delete_messages.assert_called_once_with([7])
+        client.client.uid_expunge.assert_called_once_with([7])
+
+    def test_plain_expunge_without_uidplus(self) -> None:
+        """Falls back to EXPUNGE when UIDPLUS is missing."""
+        client = _make_client()
+        client._folder_cache = {"Done"}
+        client.client.has_capability.return_value = False
+        client.client.fetch.return_value = {
+            7: {b'BODY[]': _RAW, b'FLAGS': (), b'INTERNALDATE': "d"},
+        }
+
+        assert client.move_with_headers(7, "Done", {"X-Tag": "done"})
+
+        client.client.uid_expunge.assert_not_called()
+        client.client.expunge.assert_called_once_with()
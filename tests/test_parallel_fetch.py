@@ -0,0 +1,88 @@
+"""Tests for ImapClient.get_messages_parallel()."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+
+
+def _make_client(max_connections: int = 10) -> ImapClient:
+    """Create an ImapClient with a mocked IMAP backend."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+        max_connections=max_connections,
+    )
+    client = ImapClient(account)
+    client.client = MagicMock()
+    return client
+
+
+def _fake_fetch(uids, spec):
+    """Return a FETCH response for the requested UIDs."""
+    return {
+        uid: {
+            b'BODY[]': (
+                b"Subject: Message " + str(uid).encode()
+                + b"\r\n\r\nBody"
+            ),
+            b'FLAGS': (),
+        }
+        for uid in uids
+    }
+
+
+class TestGetMessagesParallel:
+    """Tests for fetching over several sessions."""
+
+    @patch("imap_client_lib.client.IMAPClient")
+    def test_splits_uids_across_sessions(
+        self, mock_imap_cls: MagicMock,
+    ) -> None:
+        """Each extra session fetches one range, order is kept."""
+        client = _make_client()
+        client.client.search.return_value = list(range(1, 7))
+        sessions = [MagicMock() for _ in range(3)]
+        for session in sessions:
+            session.fetch.side_effect = _fake_fetch
+        mock_imap_cls.side_effect = sessions
+
+        messages = client.get_messages_parallel(
+            ['ALL'], n_connections=3,
+        )
+
+        assert [m[0] for m in messages] == [
+            6, 5, 4, 3, 2, 1,
+        ]
+        assert mock_imap_cls.call_count == 3
+        client.client.fetch.assert_not_called()
+        for session in sessions:
+            session.select_folder.assert_called_once_with(
+                'INBOX', readonly=True,
+            )
+            session.logout.assert_called_once()
+
+    @patch("imap_client_lib.client.IMAPClient")
+    def test_respects_account_connection_cap(
+        self, mock_imap_cls: MagicMock,
+    ) -> None:
+        """With no spare connections the main session is used."""
+        client = _make_client(max_connections=1)
+        client.client.search.return_value = [1, 2]
+        client.client.fetch.side_effect = _fake_fetch
+
+        messages = client.get_messages_parallel(['ALL'])
+
+        mock_imap_cls.assert_not_called()
+        assert len(messages) == 2
+
+    def test_returns_empty_when_not_connected(self) -> None:
+        """Returns an empty list without a session."""
+        client = _make_client()
+        client.client = None
+
+        assert client.get_messages_parallel(['ALL']) == []
@@ -0,0 +1,133 @@
+"""Tests for the shared IMAP session pool."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+from imap_client_lib.pool import ImapConnectionPool
+
+
+def _account(username: str = "user@example.com") -> Account:
+    """Build a test account."""
+    return Account(
+        name="test",
+        server="imap.example.com",
+        username=username,
+        password="secret",
+    )
+
+
+class TestImapConnectionPool:
+    """Tests for ImapConnectionPool."""
+
+    def test_released_session_is_reused(self) -> None:
+        """A released session is handed out again."""
+        pool = ImapConnectionPool()
+        factory = MagicMock(side_effect=lambda: MagicMock())
+
+        first = pool.acquire(_account(), factory)
+        pool.release(_account(), first)
+        second = pool.acquire(_account(), factory)
+
+        assert second is first
+        factory.assert_called_once()
+        first.noop.assert_called_once()
+
+    def test_sessions_are_keyed_by_account(self) -> None:
+        """Another user never gets a pooled session."""
+        pool = ImapConnectionPool()
+        factory = MagicMock(side_effect=lambda: MagicMock())
+
+        session = pool.acquire(_account(), factory)
+        pool.release(_account(), session)
+        other = pool.acquire(_account("other@example.com"), factory)
+
+        assert other is not session
+        assert factory.call_count == 2
+
+    def test_broken_session_is_dropped(self) -> None:
+        """A session failing NOOP on release is logged out."""
+        pool = ImapConnectionPool()
+        session = MagicMock()
+        session.noop.side_effect = OSError("reset")
+
+        pool.release(_account(), session)
+
+        session.logout.assert_called_once()
+        assert pool.acquire(_account(), lambda: "new") == "new"
+
+    @patch("imap_client_lib.pool.time.monotonic")
+    def test_idle_sessions_expire(
+        self, monotonic: MagicMock,
+    ) -> None:
+        """Sessions idle past idle_timeout are not reused."""
+        pool = ImapConnectionPool(idle_timeout=60)
+        session = MagicMock()
+        monotonic.return_value = 0
+        pool.release(_account(), session)
+
+        monotonic.return_value = 61
+        assert pool.acquire(_account(), lambda: "new") == "new"
+        session.logout.assert_called_once()
+
+    @patch("imap_client_lib.pool.time.monotonic")
+    def test_long_idle_session_is_rechecked(
+        self, monotonic: MagicMock,
+    ) -> None:
+        """A session idle past RECHECK_AFTER that fails NOOP is replaced."""
+        pool = ImapConnectionPool(idle_timeout=600)
+        dead, alive = MagicMock(), MagicMock()
+        monotonic.return_value = 0
+        pool.release(_account(), alive)
+        pool.release(_account(), dead)
+        dead.noop.side_effect = OSError("reset")
+
+        monotonic.return_value = 120
+        session = pool.acquire(_account(), lambda: "new")
+
+        assert session is alive
+        dead.logout.assert_called_once()
+        assert alive.noop.call_count == 2
+
+    def test_extra_sessions_are_closed(self) -> None:
+        """Only max_idle_per_account sessions are kept."""
+        pool = ImapConnectionPool(max_idle_per_account=1)
+        first, second = MagicMock(), MagicMock()
+
+        pool.release(_account(), first)
+        pool.release(_account(), second)
+
+        second.logout.assert_called_once()
+        first.logout.assert_not_called()
+
+    def test_close_all(self) -> None:
+        """close_all logs out every idle session."""
+        pool = ImapConnectionPool()
+        session = MagicMock()
+        pool.release(_account(), session)
+
+        pool.close_all()
+
+        session.logout.assert_called_once()
+
+
+class TestClientWithPool:
+    """Tests for ImapClient's use of a pool."""
+
+    @patch("imap_client_lib.client.IMAPClient")
+    def test_clients_share_one_login(
+        self, mock_imap_cls: MagicMock,
+    ) -> None:
+        """Consecutive clients reuse the pooled session."""
+        pool = ImapConnectionPool()
+
+        with ImapClient(_account(), pool=pool) as client:
+            first = client.client
+        with ImapClient(_account(), pool=pool) as client:
+            assert client.client is first
+
+        mock_imap_cls.assert_called_once()
+        mock_imap_cls.return_value.login.assert_called_once()
+        mock_imap_cls.return_value.logout.assert_not_called()
@@ -0,0 +1,79 @@
+"""Tests for ImapClient.run_parallel()."""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+
+
+def _account(username: str, max_connections: int = 10) -> Account:
+    """Build a test account."""
+    return Account(
+        name=username,
+        server="imap.example.com",
+        username=username,
+        password="secret",
+        max_connections=max_connections,
+    )
+
+
+@patch(
+    "imap_client_lib.client.IMAPClient",
+    side_effect=lambda *a, **k: MagicMock(),
+)
+class TestRunParallel:
+    """Tests for running a function across accounts."""
+
+    def test_results_in_account_order(self, mock_imap_cls: MagicMock) -> None:
+        """Each account's result is returned in input order."""
+        accounts = [_account("a"), _account("b"), _account("c")]
+
+        results = ImapClient.run_parallel(
+            accounts, lambda client: client.account.username,
+        )
+
+        assert results == ["a", "b", "c"]
+        assert mock_imap_cls.call_count == 3
+
+    def test_failures_yield_none(self, mock_imap_cls: MagicMock) -> None:
+        """An exception in fn only affects its own account."""
+        def fn(client):
+            if client.account.username == "b":
+                raise RuntimeError("boom")
+            return True
+
+        results = ImapClient.run_parallel(
+            [_account("a"), _account("b")], fn,
+        )
+
+        assert results == [True, None]
+
+    def test_respects_max_connections(self, mock_imap_cls: MagicMock) -> None:
+        """One account never exceeds its max_connections."""
+        account = _account("a", max_connections=2)
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def fn(client):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return True
+
+        results = ImapClient.run_parallel([account] * 6, fn, max_workers=6)
+
+        assert results == [True] * 6
+        assert peak <= 2
+
+    def test_empty(self, mock_imap_cls: MagicMock) -> None:
+        """No accounts means no work."""
+        assert ImapClient.run_parallel([], lambda client: 1) == []
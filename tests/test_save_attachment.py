@@ -0,0 +1,510 @@
+"""Tests for ImapClient.save_attachment() and Attachment data access."""
+
+from __future__ import annotations
+
+import dataclasses
+import errno
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+from imap_client_lib.email_message import Attachment, EmailMessage
+
+
+def _make_client() -> ImapClient:
+    """Create an ImapClient with a test account."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    return ImapClient(account)
+
+
+class TestAttachmentStream:
+    """Tests for Attachment.stream()."""
+
+    def test_chunks_cover_data(self) -> None:
+        """Chunks are bounded and reassemble to the data."""
+        attachment = Attachment("a.bin", "application/pdf", b"x" * 10)
+
+        chunks = list(attachment.stream(chunk_size=4))
+
+        assert [len(c) for c in chunks] == [4, 4, 2]
+        assert b"".join(chunks) == b"x" * 10
+
+    def test_empty_data(self) -> None:
+        """Empty data yields no chunks."""
+        attachment = Attachment("a.bin", "application/pdf", b"")
+
+        assert list(attachment.stream()) == []
+
+
+
+class TestAttachmentFields:
+    """Tests for values derived when an Attachment is built."""
+
+    def test_content_type_is_split(self) -> None:
+        """main_type and sub_type come from content_type."""
+        attachment = Attachment("a.png", "image/png", b"")
+
+        assert (attachment.main_type, attachment.sub_type) == ("image", "png")
+
+    def test_malformed_content_type_falls_back(self) -> None:
+        """A type without a subtype is treated as octet-stream."""
+        attachment = Attachment("a", "garbage", b"")
+
+        assert attachment.sub_type == "octet-stream"
+
+    def test_content_id_is_normalised(self) -> None:
+        """Content-IDs always carry exactly one pair of brackets."""
+        for raw in ("logo@x", "<logo@x>", " <logo@x", "logo@x>"):
+            assert Attachment("a", "image/png", b"", raw).content_id == (
+                "<logo@x>"
+            )
+
+
+class TestDeferredAttachment:
+    """Tests for attachments whose data is decoded on first use."""
+
+    def test_parsed_attachment_decodes_lazily(self) -> None:
+        """from_bytes defers the decode until data is read."""
+        raw = (
+            b"Content-Type: multipart/mixed; boundary=XX\r\n\r\n"
+            b"--XX\r\nContent-Type: text/plain\r\n\r\nHi\r\n"
+            b"--XX\r\nContent-Type: application/pdf\r\n"
+            b"Content-Disposition: attachment; filename=r.pdf\r\n"
+            b"Content-Transfer-Encoding: base64\r\n\r\ncGRm\r\n"
+            b"--XX--\r\n"
+        )
+        msg = EmailMessage.from_bytes("1", raw)
+        attachment = msg.attachments[0]
+
+        assert attachment._loader is not None
+        assert attachment.data == b"pdf"
+        assert attachment._loader is None
+
+    def test_single_part_attachment_is_found(self) -> None:
+        """A message whose only part is an attachment keeps it."""
+        raw = (
+            b"Content-Type: application/pdf\r\n"
+            b"Content-Disposition: attachment; filename=r.pdf\r\n"
+            b"Content-Transfer-Encoding: base64\r\n\r\ncGRm\r\n"
+        )
+
+        msg = EmailMessage.from_bytes("1", raw)
+
+        assert [a.filename for a in msg.attachments] == ["r.pdf"]
+        assert msg.get_body() is None
+
+    def test_loader_runs_once(self) -> None:
+        """Repeated reads reuse the loaded data."""
+        calls = []
+
+        def loader() -> bytes:
+            calls.append(1)
+            return b"data"
+
+        attachment = Attachment.deferred(loader, "a.bin", "text/plain")
+
+        assert attachment.data == b"data"
+        assert attachment.data == b"data"
+        assert len(calls) == 1
+
+    def test_assignment_replaces_loader(self) -> None:
+        """Assigning data discards the pending loader."""
+        attachment = Attachment.deferred(
+            lambda: b"old", "a.bin", "text/plain",
+        )
+
+        attachment.data = b"new"
+
+        assert attachment.data == b"new"
+
+    def test_equality_compares_loaded_data(self) -> None:
+        """Deferred and eager attachments compare by their bytes."""
+        deferred = Attachment.deferred(
+            lambda: b"x", "a.bin", "text/plain",
+        )
+
+        assert deferred == Attachment("a.bin", "text/plain", b"x")
+
+    def test_data_is_a_dataclass_field(self) -> None:
+        """repr, asdict and replace see the loaded bytes."""
+        deferred = Attachment.deferred(
+            lambda: b"x", "a.bin", "text/plain",
+        )
+
+        assert "data=b'x'" in repr(deferred)
+        assert dataclasses.asdict(deferred)["data"] == b"x"
+        copy = dataclasses.replace(deferred, filename="b.bin")
+        assert copy.data == b"x"
+
+    def test_data_is_required(self) -> None:
+        """Eager construction still needs the data argument."""
+        try:
+            Attachment("a.bin", "text/plain")
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("data should be required")
+
+    def test_empty_decoded_payload_is_kept(self) -> None:
+        """Only the encoded text is checked, so empty decodes stay."""
+        raw = (
+            b"Content-Type: multipart/mixed; boundary=XX\r\n\r\n"
+            b"--XX\r\nContent-Type: application/pdf\r\n"
+            b"Content-Disposition: attachment; filename=r.pdf\r\n"
+            b"Content-Transfer-Encoding: base64\r\n\r\n====\r\n"
+            b"--XX--\r\n"
+        )
+
+        msg = EmailMessage.from_bytes("1", raw)
+
+        assert [a.filename for a in msg.attachments] == ["r.pdf"]
+        assert msg.attachments[0].data == b""
+
+
+class TestSaveAttachment:
+    """Tests for writing attachments to disk."""
+
+    def test_saves_into_directory(self, tmp_path: Path) -> None:
+        """A directory target keeps the attachment filename."""
+        client = _make_client()
+        attachment = Attachment("doc.pdf", "application/pdf", b"data")
+
+        saved = client.save_attachment(attachment, str(tmp_path))
+
+        assert saved == str(tmp_path / "doc.pdf")
+        assert (tmp_path / "doc.pdf").read_bytes() == b"data"
+
+    def test_creates_missing_directory(self, tmp_path: Path) -> None:
+        """Missing target directories are created."""
+        client = _make_client()
+        attachment = Attachment("doc.pdf", "application/pdf", b"data")
+        target = tmp_path / "nested" / "dir"
+
+        saved = client.save_attachment(attachment, str(target))
+
+        assert Path(saved).read_bytes() == b"data"
+
+    def test_duplicate_names_get_suffix(self, tmp_path: Path) -> None:
+        """Existing files are not overwritten."""
+        client = _make_client()
+        attachment = Attachment("doc.pdf", "application/pdf", b"data")
+
+        first = client.save_attachment(attachment, str(tmp_path))
+        second = client.save_attachment(attachment, str(tmp_path))
+        third = client.save_attachment(attachment, str(tmp_path))
+
+        assert Path(first).name == "doc.pdf"
+        assert Path(second).name == "doc_1.pdf"
+        assert Path(third).name == "doc_2.pdf"
+
+    def test_full_file_path(self, tmp_path: Path) -> None:
+        """A target with an extension is used as the file path."""
+        client = _make_client()
+        attachment = Attachment("doc.pdf", "application/pdf", b"data")
+        target = tmp_path / "out" / "renamed.pdf"
+
+        saved = client.save_attachment(attachment, str(target))
+
+        assert saved == str(target)
+        assert target.read_bytes() == b"data"
+
+    def test_sanitizes_path_separators(self, tmp_path: Path) -> None:
+        """Path separators in filenames are replaced."""
+        client = _make_client()
+        attachment = Attachment("../evil.pdf", "application/pdf", b"x")
+
+        saved = client.save_attachment(attachment, str(tmp_path))
+
+        assert Path(saved).parent == tmp_path
+        assert Path(saved).name == ".._evil.pdf"
+
+    def test_sanitizes_windows_reserved_characters(
+        self, tmp_path: Path,
+    ) -> None:
+        """Characters Windows rejects in names are replaced."""
+        client = _make_client()
+        attachment = Attachment(
+            'a\\b:c*d?"e"<f>|g.pdf', "application/pdf", b"x",
+        )
+
+        saved = client.save_attachment(attachment, str(tmp_path))
+
+        assert Path(saved).name == "a_b_c_d__e__f__g.pdf"
+
+    def test_large_payload_round_trips(self, tmp_path: Path) -> None:
+        """Payloads larger than one write chunk are intact."""
+        client = _make_client()
+        data = bytes(range(256)) * (40 * 1024 + 3)
+        attachment = Attachment("big.bin", "application/pdf", data)
+
+        saved = client.save_attachment(attachment, str(tmp_path))
+
+        assert Path(saved).read_bytes() == data
+
+    def test_directory_created_once(self, tmp_path: Path) -> None:
+        """Repeated saves to one directory skip mkdir."""
+        client = _make_client()
+        attachment = Attachment("doc.pdf", "application/pdf", b"data")
+        target = tmp_path / "out"
+
+        with patch.object(
+            Path, "mkdir", autospec=True, side_effect=Path.mkdir,
+        ) as mkdir:
+            client.save_attachment(attachment, str(target))
+            client.save_attachment(attachment, str(target))
+
+        assert mkdir.call_count == 1
+        assert len(list(target.iterdir())) == 2
+
+    def test_removed_directory_is_recreated(self, tmp_path: Path) -> None:
+        """A cached directory deleted externally is created again."""
+        client = _make_client()
+        attachment = Attachment("doc.pdf", "application/pdf", b"data")
+        target = tmp_path / "out"
+        client.save_attachment(attachment, str(target))
+        shutil.rmtree(target)
+
+        saved = client.save_attachment(attachment, str(target))
+
+        assert Path(saved) == target / "doc.pdf"
+        assert Path(saved).read_bytes() == b"data"
+
+    def test_duplicate_suffix_is_remembered(self, tmp_path: Path) -> None:
+        """Later duplicates try the plain name, then the next suffix."""
+        client = _make_client()
+        attachment = Attachment("doc.pdf", "application/pdf", b"data")
+        for _ in range(3):
+            client.save_attachment(attachment, str(tmp_path))
+
+        real_open = os.open
+        with patch.object(
+            os, "open", side_effect=real_open,
+        ) as os_open:
+            saved = client.save_attachment(attachment, str(tmp_path))
+
+        assert Path(saved).name == "doc_3.pdf"
+        assert os_open.call_count == 2
+
+    def test_freed_plain_name_is_reused(self, tmp_path: Path) -> None:
+        """A deleted plain name is used again, as without the hint."""
+        client = _make_client()
+        attachment = Attachment("doc.pdf", "application/pdf", b"data")
+        for _ in range(3):
+            client.save_attachment(attachment, str(tmp_path))
+        (tmp_path / "doc.pdf").unlink()
+
+        saved = client.save_attachment(attachment, str(tmp_path))
+
+        assert Path(saved).name == "doc.pdf"
+
+    def test_freed_suffix_below_hint_is_skipped(
+        self, tmp_path: Path,
+    ) -> None:
+        """Suffixes freed below the remembered one are not refilled."""
+        client = _make_client()
+        attachment = Attachment("doc.pdf", "application/pdf", b"data")
+        for _ in range(3):
+            client.save_attachment(attachment, str(tmp_path))
+        (tmp_path / "doc_1.pdf").unlink()
+
+        saved = client.save_attachment(attachment, str(tmp_path))
+
+        assert Path(saved).name == "doc_3.pdf"
+
+    def test_extensionless_target_resolved_once(
+        self, tmp_path: Path,
+    ) -> None:
+        """A target without an extension is never stat'ed."""
+        client = _make_client()
+        target = tmp_path / "invoices"
+        attachment = Attachment("doc.pdf", "application/pdf", b"data")
+
+        with patch.object(
+            Path, "is_dir", autospec=True, side_effect=Path.is_dir,
+        ) as is_dir:
+            for _ in range(3):
+                client.save_attachment(attachment, str(target))
+
+        assert is_dir.call_count == 0
+        assert len(list(target.iterdir())) == 3
+
+    def test_dotted_target_is_rechecked(self, tmp_path: Path) -> None:
+        """A dotted target that turns into a directory is saved into."""
+        client = _make_client()
+        target = tmp_path / "invoices.d"
+        attachment = Attachment("doc.pdf", "application/pdf", b"data")
+        first = client.save_attachment(attachment, str(target))
+        Path(first).unlink()
+        target.mkdir()
+
+        saved = client.save_attachment(attachment, str(target))
+
+        assert Path(first) == target
+        assert Path(saved) == target / "doc.pdf"
+
+    def test_external_file_is_not_overwritten(
+        self, tmp_path: Path,
+    ) -> None:
+        """A file created behind the cache's back is skipped."""
+        client = _make_client()
+        attachment = Attachment("doc.pdf", "application/pdf", b"data")
+        client.save_attachment(attachment, str(tmp_path))
+        (tmp_path / "doc_1.pdf").write_bytes(b"other")
+
+        saved = client.save_attachment(attachment, str(tmp_path))
+
+        assert Path(saved).name == "doc_2.pdf"
+        assert (tmp_path / "doc_1.pdf").read_bytes() == b"other"
+
+
+    def test_short_writes_are_retried(self, tmp_path: Path) -> None:
+        """Partial os.write results are continued, not dropped."""
+        client = _make_client()
+        data = bytes(range(256)) * 4
+        attachment = Attachment("part.bin", "application/pdf", data)
+        real_write = os.write
+
+        def short_write(fd: int, chunk: memoryview) -> int:
+            return real_write(fd, chunk[:100])
+
+        with patch.object(os, "write", side_effect=short_write):
+            saved = client.save_attachment(attachment, str(tmp_path))
+
+        assert Path(saved).read_bytes() == data
+
+    def test_failed_decode_leaves_no_file(self, tmp_path: Path) -> None:
+        """A loader that raises creates no file, even on retry."""
+        client = _make_client()
+
+        def loader() -> bytes:
+            raise ValueError("bad base64")
+
+        attachment = Attachment.deferred(loader, "x.pdf", "application/pdf")
+
+        assert client.save_attachment(attachment, str(tmp_path)) == ""
+        assert client.save_attachment(attachment, str(tmp_path)) == ""
+        assert list(tmp_path.iterdir()) == []
+
+
+    def test_failed_write_removes_file(self, tmp_path: Path) -> None:
+        """A write failing part way leaves no truncated file."""
+        client = _make_client()
+        attachment = Attachment("doc.pdf", "application/pdf", b"x" * 1000)
+        real_write = os.write
+        calls = []
+
+        def full_disk(fd: int, chunk: memoryview) -> int:
+            # The first write gets 100 bytes onto disk, then it fills.
+            calls.append(1)
+            if len(calls) > 1:
+                raise OSError(errno.ENOSPC, "No space left on device")
+            return real_write(fd, chunk[:100])
+
+        with patch.object(os, "write", side_effect=full_disk):
+            assert client.save_attachment(attachment, str(tmp_path)) == ""
+        assert list(tmp_path.iterdir()) == []
+
+        saved = client.save_attachment(attachment, str(tmp_path))
+
+        assert Path(saved).name == "doc.pdf"
+        assert not client._used_names.get(
+            (str(tmp_path), "doc", ".pdf"),
+        )
+
+
+class TestSaveAttachments:
+    """Tests for ImapClient.save_attachments()."""
+
+    def test_saves_all_in_order(self, tmp_path: Path) -> None:
+        """Each attachment is saved and its path returned in order."""
+        client = _make_client()
+        attachments = [
+            Attachment("a.pdf", "application/pdf", b"a"),
+            Attachment("b.pdf", "application/pdf", b"b"),
+        ]
+
+        saved = client.save_attachments(attachments, str(tmp_path / "out"))
+
+        assert [Path(p).name for p in saved] == ["a.pdf", "b.pdf"]
+        assert Path(saved[1]).read_bytes() == b"b"
+
+    def test_existing_names_skipped_without_probing(
+        self, tmp_path: Path,
+    ) -> None:
+        """Names already in the directory are skipped from the listing."""
+        client = _make_client()
+        for name in ("doc.pdf", "doc_1.pdf"):
+            (tmp_path / name).write_bytes(b"old")
+        attachments = [
+            Attachment("doc.pdf", "application/pdf", b"new"),
+            Attachment("doc.pdf", "application/pdf", b"newer"),
+        ]
+
+        real_open = os.open
+        with patch.object(
+            os, "open", side_effect=real_open,
+        ) as os_open:
+            saved = client.save_attachments(attachments, str(tmp_path))
+
+        assert [Path(p).name for p in saved] == ["doc_2.pdf", "doc_3.pdf"]
+        assert os_open.call_count == 2
+        assert (tmp_path / "doc.pdf").read_bytes() == b"old"
+
+    def test_sanitizes_names(self, tmp_path: Path) -> None:
+        """Filenames are sanitized like save_attachment."""
+        client = _make_client()
+        attachment = Attachment("../evil.pdf", "application/pdf", b"x")
+
+        saved = client.save_attachments([attachment], str(tmp_path))
+
+        assert Path(saved[0]).parent == tmp_path
+        assert Path(saved[0]).name == ".._evil.pdf"
+
+    def test_failed_write_frees_name(self, tmp_path: Path) -> None:
+        """A failed write neither keeps its file nor takes its name."""
+        client = _make_client()
+        attachments = [
+            Attachment("doc.pdf", "application/pdf", b"x"),
+            Attachment("doc.pdf", "application/pdf", b"y"),
+        ]
+        real_write = os.write
+        calls = []
+
+        def fail_first(fd: int, chunk: memoryview) -> int:
+            calls.append(1)
+            if len(calls) == 1:
+                raise OSError(errno.ENOSPC, "No space left on device")
+            return real_write(fd, chunk)
+
+        with patch.object(os, "write", side_effect=fail_first):
+            saved = client.save_attachments(attachments, str(tmp_path))
+
+        assert saved[0] == ""
+        assert Path(saved[1]).name == "doc.pdf"
+        assert Path(saved[1]).read_bytes() == b"y"
+        assert [p.name for p in tmp_path.iterdir()] == ["doc.pdf"]
+
+    def test_failed_attachment_yields_empty_path(
+        self, tmp_path: Path,
+    ) -> None:
+        """A failing attachment does not stop the others."""
+        client = _make_client()
+        attachments = [
+            Attachment("missing/bad.pdf", "application/pdf", b"x"),
+            Attachment("good.pdf", "application/pdf", b"y"),
+        ]
+
+        saved = client.save_attachments(
+            attachments, str(tmp_path), sanitize_filename=False,
+        )
+
+        assert saved[0] == ""
+        assert Path(saved[1]).name == "good.pdf"
@@ -0,0 +1,93 @@
+"""Tests for server-side search helpers."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+from imap_client_lib.search_mixin import attachment_hint_criteria
+
+
+def _make_client() -> ImapClient:
+    """Create an ImapClient with a mocked IMAP backend."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    client = ImapClient(account)
+    client.client = MagicMock()
+    client.client.search.return_value = []
+    return client
+
+
+class TestAttachmentHintCriteria:
+    """Tests for attachment_hint_criteria()."""
+
+    def test_single_extension(self) -> None:
+        """One extension adds a single BODY term."""
+        assert attachment_hint_criteria('invoice', ['pdf']) == [
+            'SUBJECT', 'invoice', 'UNSEEN', 'BODY', '.pdf',
+        ]
+
+    def test_extensions_are_ored(self) -> None:
+        """Several extensions are chained with OR."""
+        criteria = attachment_hint_criteria(
+            None, ['.xlsx', 'xls', 'CSV'], unseen=False,
+        )
+        assert criteria == [
+            'OR', 'BODY', '.xlsx',
+            'OR', 'BODY', '.xls',
+            'BODY', '.csv',
+        ]
+
+    def test_gmail_raw(self) -> None:
+        """gmail_raw builds a single X-GM-RAW query."""
+        criteria = attachment_hint_criteria(
+            'invoice', ['pdf', 'zip'], gmail_raw=True,
+        )
+        assert criteria == [
+            'X-GM-RAW',
+            'subject:"invoice" has:attachment '
+            '(filename:pdf OR filename:zip) is:unread',
+        ]
+
+
+class TestSearchWithAttachmentHint:
+    """Tests for ImapClient.search_with_attachment_hint()."""
+
+    def test_searches_with_hint(self) -> None:
+        """The generic criteria are sent to SEARCH."""
+        client = _make_client()
+
+        client.search_with_attachment_hint('invoice', ['pdf'])
+
+        client.client.search.assert_called_once_with(
+            ['SUBJECT', 'invoice', 'UNSEEN', 'BODY', '.pdf']
+        )
+
+    def test_gmail_raw_falls_back(self) -> None:
+        """Without X-GM-EXT-1 the generic search is used."""
+        client = _make_client()
+        client.client.capabilities.return_value = (b'IMAP4REV1',)
+
+        client.search_with_attachment_hint(
+            'invoice', ['pdf'], gmail_raw=True,
+        )
+
+        criteria = client.client.search.call_args[0][0]
+        assert criteria[0] == 'SUBJECT'
+
+    def test_gmail_raw_when_supported(self) -> None:
+        """With X-GM-EXT-1 the X-GM-RAW query is used."""
+        client = _make_client()
+        client.client.capabilities.return_value = (b'X-GM-EXT-1',)
+
+        client.search_with_attachment_hint(
+            'invoice', ['pdf'], gmail_raw=True,
+        )
+
+        criteria = client.client.search.call_args[0][0]
+        assert criteria[0] == 'X-GM-RAW'
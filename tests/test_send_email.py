@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import email
+import smtplib
+import threading
 from unittest.mock import MagicMock, patch
 
+from imap_client_lib import smtp_mixin
 from imap_client_lib.account import Account
 from imap_client_lib.client import ImapClient
-from imap_client_lib.email_message import Attachment
+from imap_client_lib.email_message import Attachment, EmailMessage
 
 
 def _make_client() -> ImapClient:
@@ -160,6 +164,27 @@ class TestSendEmail:
 
         assert result is True
 
+    @patch("imap_client_lib.smtp_mixin.smtplib.SMTP")
+    def test_custom_header_replaces_existing(
+        self, mock_smtp_cls: MagicMock,
+    ) -> None:
+        """A custom header replaces a standard one of any case."""
+        client = _make_client()
+
+        mock_server = MagicMock()
+        mock_smtp_cls.return_value.__enter__ = MagicMock(return_value=mock_server)
+        mock_smtp_cls.return_value.__exit__ = MagicMock(return_value=False)
+
+        client.send_email(
+            to_addresses=["to@example.com"],
+            subject="Test",
+            body="Body",
+            custom_headers={"subject": "Override"},
+        )
+
+        sent = mock_server.send_message.call_args[0][0]
+        assert sent.get_all("Subject") == ["Override"]
+
     @patch("imap_client_lib.smtp_mixin.smtplib.SMTP")
     def test_send_with_attachment(self, mock_smtp_cls: MagicMock) -> None:
         """Email with attachment sends successfully."""
@@ -237,3 +262,332 @@ class TestSendEmail:
         assert result is True
         sent_msg = mock_server.send_message.call_args[0][0]
         assert sent_msg["From"] == "sender@other.com"
+
+
+def _make_message() -> EmailMessage:
+    """Parse a small message with one attachment."""
+    raw = (
+        b"From: sender@example.com\r\n"
+        b"Subject: Report\r\n"
+        b"MIME-Version: 1.0\r\n"
+        b"Content-Type: multipart/mixed; boundary=XX\r\n\r\n"
+        b"--XX\r\nContent-Type: text/plain\r\n\r\nHello\r\n"
+        b"--XX\r\nContent-Type: application/pdf\r\n"
+        b"Content-Disposition: attachment; filename=r.pdf\r\n"
+        b"Content-Transfer-Encoding: base64\r\n\r\ncGRm\r\n"
+        b"--XX--\r\n"
+    )
+    return EmailMessage.from_bytes("1", raw)
+
+
+class TestForwardBody:
+    """Tests for the forwarded body built by forward_email()."""
+
+    def test_html_header_fields_are_escaped(self) -> None:
+        """Sender and subject cannot inject markup into the HTML part."""
+        client = _make_client()
+        message = MagicMock()
+        message.from_address = "Jane <jane@example.com>"
+        message.date = "Mon, 1 Jan 2024"
+        message.subject = "a < b & c"
+        message.get_body.side_effect = lambda kind: (
+            "<b>hi</b>" if kind == "text/html" else "hi"
+        )
+        msg = MagicMock()
+
+        client._build_forward_body(msg, False, message, "See\nbelow")
+
+        plain, html_part = [c[0][0] for c in msg.attach.call_args_list]
+        text = plain.get_payload(decode=True).decode()
+        markup = html_part.get_payload(decode=True).decode()
+        assert text.startswith("See\nbelow\n\n\n---------- Forwarded")
+        assert "From: Jane <jane@example.com>\n" in text
+        assert "From: Jane &lt;jane@example.com&gt;<br>" in markup
+        assert "Subject: a &lt; b &amp; c</p>" in markup
+        assert markup.startswith("<p>See<br>below</p>\n<div><p>")
+        assert "<div><b>hi</b></div></div>" in markup
+
+    def test_plain_only_original(self) -> None:
+        """Without an HTML original only a plain part is attached."""
+        client = _make_client()
+        message = MagicMock()
+        message.get_body.side_effect = lambda kind: (
+            None if kind == "text/html" else "hi"
+        )
+        msg = MagicMock()
+
+        client._build_forward_body(msg, False, message, "")
+
+        assert msg.attach.call_count == 1
+
+
+class TestForwardEmailToEach:
+    """Tests for ImapClient.forward_email_to_each()."""
+
+    @patch("imap_client_lib.smtp_mixin.smtplib.SMTP")
+    def test_one_session_one_build(self, mock_smtp_cls: MagicMock) -> None:
+        """Each recipient gets its own send over a single login."""
+        client = _make_client()
+        mock_server = MagicMock()
+        mock_smtp_cls.return_value.__enter__ = MagicMock(return_value=mock_server)
+        mock_smtp_cls.return_value.__exit__ = MagicMock(return_value=False)
+        recipients = ["a@example.com", "b@example.com"]
+        sent_data = []
+        mock_server.sendmail.side_effect = (
+            lambda from_addr, to_addrs, data: sent_data.append(
+                (from_addr, to_addrs, data)
+            )
+        )
+
+        with patch.object(
+            client, "_attach_files", wraps=client._attach_files,
+        ) as attach:
+            sent = client.forward_email_to_each(_make_message(), recipients)
+
+        assert sent == 2
+        assert mock_smtp_cls.call_count == 1
+        mock_server.login.assert_called_once()
+        assert attach.call_count == 1
+        assert [d[:2] for d in sent_data] == [
+            ("user@example.com", ["a@example.com"]),
+            ("user@example.com", ["b@example.com"]),
+        ]
+        first, second = (d[2] for d in sent_data)
+        assert first.startswith(b"To: a@example.com\r\n")
+        assert second.startswith(b"To: b@example.com\r\n")
+        assert first.split(b"\r\n", 1)[1] == second.split(b"\r\n", 1)[1]
+        parsed = email.message_from_bytes(first)
+        assert parsed.get_all("To") == ["a@example.com"]
+        assert parsed["Subject"] == "Fwd: Report"
+
+    @patch("imap_client_lib.smtp_mixin.smtplib.SMTP")
+    def test_refused_recipient_is_skipped(
+        self, mock_smtp_cls: MagicMock,
+    ) -> None:
+        """A refused recipient does not stop the rest."""
+        client = _make_client()
+        mock_server = MagicMock()
+        mock_smtp_cls.return_value.__enter__ = MagicMock(return_value=mock_server)
+        mock_smtp_cls.return_value.__exit__ = MagicMock(return_value=False)
+        mock_server.sendmail.side_effect = [
+            smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"no")}),
+            None,
+        ]
+
+        sent = client.forward_email_to_each(
+            _make_message(), ["a@example.com", "b@example.com"],
+        )
+
+        assert sent == 1
+
+    def test_empty_recipients(self) -> None:
+        """No recipients means no SMTP connection."""
+        client = _make_client()
+        assert client.forward_email_to_each(_make_message(), []) == 0
+
+
+class TestKeepSmtpOpen:
+    """Tests for reusing one SMTP session with keep_smtp_open."""
+
+    def _make_reusing_client(self) -> ImapClient:
+        """Create a client that keeps its SMTP session open."""
+        client = _make_client()
+        client.keep_smtp_open = True
+        return client
+
+    @patch("imap_client_lib.smtp_mixin.smtplib.SMTP")
+    def test_session_reused_across_sends(
+        self, mock_smtp_cls: MagicMock,
+    ) -> None:
+        """A live session is NOOP-checked and reused."""
+        client = self._make_reusing_client()
+        server = mock_smtp_cls.return_value
+        server.noop.return_value = (250, b"OK")
+
+        for _ in range(3):
+            assert client.send_email(["to@example.com"], "Hi", "Body")
+
+        assert mock_smtp_cls.call_count == 1
+        server.login.assert_called_once()
+        assert server.send_message.call_count == 3
+        assert server.noop.call_count == 2
+
+    @patch("imap_client_lib.smtp_mixin.smtplib.SMTP")
+    def test_dead_session_replaced(self, mock_smtp_cls: MagicMock) -> None:
+        """A session failing NOOP is closed and a new one opened."""
+        client = self._make_reusing_client()
+        first, second = MagicMock(), MagicMock()
+        mock_smtp_cls.side_effect = [first, second]
+        first.noop.side_effect = smtplib.SMTPServerDisconnected()
+
+        client.send_email(["to@example.com"], "Hi", "Body")
+        client.send_email(["to@example.com"], "Hi", "Body")
+
+        assert mock_smtp_cls.call_count == 2
+        first.quit.assert_called_once()
+        second.send_message.assert_called_once()
+
+    @patch("imap_client_lib.smtp_mixin.smtplib.SMTP")
+    def test_refusal_keeps_session(self, mock_smtp_cls: MagicMock) -> None:
+        """An SMTP-level error does not close the kept session."""
+        client = self._make_reusing_client()
+        server = mock_smtp_cls.return_value
+        server.noop.return_value = (250, b"OK")
+        server.send_message.side_effect = [
+            smtplib.SMTPRecipientsRefused({"to@example.com": (550, b"")}),
+            None,
+        ]
+
+        assert not client.send_email(["to@example.com"], "Hi", "Body")
+        assert client.send_email(["to@example.com"], "Hi", "Body")
+
+        assert mock_smtp_cls.call_count == 1
+        server.quit.assert_not_called()
+
+    @patch("imap_client_lib.smtp_mixin.smtplib.SMTP")
+    def test_socket_error_closes_session(
+        self, mock_smtp_cls: MagicMock,
+    ) -> None:
+        """A socket failure drops the kept session."""
+        client = self._make_reusing_client()
+        server = mock_smtp_cls.return_value
+        server.send_message.side_effect = ConnectionResetError()
+
+        assert not client.send_email(["to@example.com"], "Hi", "Body")
+
+        assert client._smtp is None
+
+    @patch("imap_client_lib.smtp_mixin.smtplib.SMTP")
+    def test_disconnect_closes_session(self, mock_smtp_cls: MagicMock) -> None:
+        """disconnect() quits the kept-open session."""
+        client = self._make_reusing_client()
+        client.send_email(["to@example.com"], "Hi", "Body")
+
+        client.disconnect()
+
+        mock_smtp_cls.return_value.quit.assert_called_once()
+        assert client._smtp is None
+
+
+class TestAttachmentPartCache:
+    """Tests for the encoded attachment payload cache."""
+
+    def test_reuses_encoded_payload(self) -> None:
+        """The same attachment data is base64-encoded only once."""
+        client = _make_client()
+        attachment = Attachment(
+            filename="report.pdf",
+            content_type="application/pdf",
+            data=b"x" * 1024,
+        )
+
+        with patch(
+            "imap_client_lib.smtp_mixin._b64_encodebytes",
+            wraps=smtp_mixin._b64_encodebytes,
+        ) as mock_encode:
+            first = client._build_attachment_part(attachment)
+            second = client._build_attachment_part(attachment)
+
+        assert mock_encode.call_count == 1
+        assert first is not second
+        assert first.get_payload(decode=True) == attachment.data
+        assert second.get_payload(decode=True) == attachment.data
+
+    def test_same_object_skips_hashing(self) -> None:
+        """An attachment reuses its own encoding without rehashing."""
+        client = _make_client()
+        attachment = Attachment(
+            filename="report.pdf",
+            content_type="application/pdf",
+            data=b"x" * 1024,
+        )
+        client._build_attachment_part(attachment)
+
+        with patch(
+            "imap_client_lib.smtp_mixin.hashlib.sha256",
+        ) as mock_sha:
+            client._build_attachment_part(attachment)
+
+        mock_sha.assert_not_called()
+
+    def test_replaced_data_is_reencoded(self) -> None:
+        """Assigning new data invalidates the cached encoding."""
+        client = _make_client()
+        attachment = Attachment(
+            filename="report.pdf",
+            content_type="application/pdf",
+            data=b"old",
+        )
+        client._build_attachment_part(attachment)
+
+        attachment.data = b"new"
+        part = client._build_attachment_part(attachment)
+
+        assert part.get_payload(decode=True) == b"new"
+
+    def test_parts_get_their_own_headers(self) -> None:
+        """Cached payloads do not share per-message headers."""
+        client = _make_client()
+        attachment = Attachment(
+            filename="logo.png",
+            content_type="image/png",
+            data=b"png-bytes",
+            content_id="<logo>",
+            is_inline=True,
+        )
+        first = MagicMock()
+        second = MagicMock()
+
+        client._attach_files(first, [attachment])
+        client._attach_files(second, [attachment])
+
+        part_a = first.attach.call_args[0][0]
+        part_b = second.attach.call_args[0][0]
+        assert part_a is not part_b
+        assert part_a.get_all("Content-ID") == ["<logo>"]
+        assert part_b.get_all("Content-ID") == ["<logo>"]
+        assert part_a.get_content_type() == "image/png"
+
+    def test_cache_is_bounded(self) -> None:
+        """Least recently used payloads are evicted past the limit."""
+        client = _make_client()
+        with patch("imap_client_lib.smtp_mixin._MIME_CACHE_SIZE", 2):
+            for i in range(3):
+                client._build_attachment_part(
+                    Attachment(
+                        filename=f"{i}.bin",
+                        content_type="application/octet-stream",
+                        data=bytes([i]),
+                    )
+                )
+
+        assert len(client._mime_cache) == 2
+
+    def test_cache_is_thread_safe(self) -> None:
+        """Concurrent builds never fail or overfill the cache."""
+        client = _make_client()
+        errors = []
+
+        def build(worker: int) -> None:
+            try:
+                for i in range(200):
+                    client._build_attachment_part(Attachment(
+                        filename="a.bin",
+                        content_type="application/octet-stream",
+                        data=bytes([worker, i % 50]),
+                    ))
+            except Exception as e:
+                errors.append(e)
+
+        with patch("imap_client_lib.smtp_mixin._MIME_CACHE_SIZE", 4):
+            threads = [
+                threading.Thread(target=build, args=(n,))
+                for n in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert errors == []
+        assert len(client._mime_cache) <= 4
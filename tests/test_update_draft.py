@@ -0,0 +1,60 @@
+"""Tests for ImapClient.update_draft()."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+
+
+def _make_client() -> ImapClient:
+    """Create an ImapClient with a mocked IMAP backend."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    client = ImapClient(account)
+    client.client = MagicMock()
+    client._folder_cache = {"Drafts"}
+    return client
+
+
+class TestUpdateDraft:
+    """Tests for replacing a draft."""
+
+    def test_replaces_and_expunges_old_uid(self) -> None:
+        """The new draft is appended and only the old UID expunged."""
+        client = _make_client()
+        client.client.fetch.return_value = {
+            5: {b'FLAGS': (b'\\Draft',)},
+        }
+
+        assert client.update_draft(5, ["to@example.com"], "S", "B")
+
+        client.client.append.assert_called_once()
+        client.client.delete_messages.assert_called_once_with([5])
+        client.client.uid_expunge.assert_called_once_with([5])
+        client.client.expunge.assert_not_called()
+
+    def test_missing_draft_is_not_replaced(self) -> None:
+        """Nothing is appended when the old draft does not exist."""
+        client = _make_client()
+        client.client.fetch.return_value = {}
+
+        assert not client.update_draft(5, ["to@example.com"], "S", "B")
+
+        client.client.append.assert_not_called()
+
+    def test_verify_false_skips_fetch(self) -> None:
+        """verify=False saves the new draft without a FLAGS FETCH."""
+        client = _make_client()
+
+        assert client.update_draft(
+            5, ["to@example.com"], "S", "B", verify=False,
+        )
+
+        client.client.fetch.assert_not_called()
+        client.client.append.assert_called_once()
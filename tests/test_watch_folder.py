@@ -0,0 +1,161 @@
+"""Tests for ImapClient.watch_folder() IDLE processing."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock, patch
+
+from imap_client_lib.account import Account
+from imap_client_lib.client import ImapClient
+
+
+def _make_client() -> ImapClient:
+    """Create an ImapClient with a mocked IMAP backend."""
+    account = Account(
+        name="test",
+        server="imap.example.com",
+        username="user@example.com",
+        password="secret",
+    )
+    client = ImapClient(account)
+    client.client = MagicMock()
+    client.client.select_folder.return_value = {b'UIDNEXT': 5}
+    client.client.fetch.side_effect = lambda uids, spec: {
+        uid: {
+            b'BODY[]': b"Subject: New " + str(uid).encode() + b"\r\n\r\nx",
+            b'FLAGS': (),
+        }
+        for uid in uids
+    }
+    return client
+
+
+class TestWatchFolder:
+    """Tests for ImapClient.watch_folder()."""
+
+    def test_processes_only_new_messages(self) -> None:
+        """Only UIDs above the starting UIDNEXT reach the callback."""
+        client = _make_client()
+        client.client.idle_check.side_effect = [[], [(6, b'EXISTS')]]
+        client.client.search.return_value = [4, 5, 6]
+        stop = threading.Event()
+        seen = []
+
+        def callback(msg):
+            seen.append(msg.subject)
+            stop.set()
+            return True
+
+        count = client.watch_folder(callback, stop_event=stop)
+
+        assert count == 2
+        assert seen == ["New 5", "New 6"]
+        client.client.search.assert_called_once_with(['UID', '5:*'])
+        client.client.idle_done.assert_called_once()
+        client.client.add_flags.assert_called_once_with(
+            [5, 6], [b'\\Seen'],
+        )
+
+    @patch("imap_client_lib.watch_mixin.time.monotonic")
+    def test_idle_is_reissued_after_timeout(
+        self, monotonic: MagicMock,
+    ) -> None:
+        """Without events, IDLE is cycled after idle_timeout."""
+        client = _make_client()
+        client.client.search.return_value = []
+        stop = threading.Event()
+        clock = iter(range(0, 1000, 40))
+        monotonic.side_effect = lambda: next(clock)
+        checks = []
+
+        def idle_check(timeout):
+            checks.append(timeout)
+            if len(checks) == 4:
+                stop.set()
+            return []
+
+        client.client.idle_check.side_effect = idle_check
+
+        count = client.watch_folder(
+            lambda msg: True, idle_timeout=100, check_interval=50,
+            stop_event=stop,
+        )
+
+        assert count == 0
+        assert client.client.idle.call_count == 2
+        assert client.client.idle_done.call_count == 2
+        assert checks == [50, 20, 50, 20]
+
+    @patch("imap_client_lib.watch_mixin._RECONNECT_DELAY", 0)
+    def test_reconnects_after_drop(self) -> None:
+        """A dropped session is reconnected and watching resumes."""
+        client = _make_client()
+        stop = threading.Event()
+        dropped = client.client
+        client.client.idle.side_effect = OSError("reset")
+        fresh = MagicMock()
+        fresh.select_folder.return_value = {}
+        fresh.idle_check.side_effect = lambda timeout: stop.set() or []
+
+        def connect():
+            client.client = fresh
+            return True
+
+        client.connect = connect
+
+        client.watch_folder(lambda msg: True, stop_event=stop)
+
+        fresh.select_folder.assert_called_once_with('INBOX')
+        fresh.idle.assert_called_once()
+        dropped.logout.assert_called_once()
+
+    def test_backs_off_and_gives_up(self) -> None:
+        """Persistent failures back off exponentially, then stop."""
+        client = _make_client()
+        client.client.select_folder.side_effect = OSError("down")
+        client.connect = MagicMock(return_value=False)
+        stop = MagicMock()
+        stop.is_set.return_value = False
+        stop.wait.return_value = False
+
+        count = client.watch_folder(
+            lambda msg: True, stop_event=stop, max_retries=4,
+        )
+
+        assert count == 0
+        assert [c.args[0] for c in stop.wait.call_args_list] == [
+            1, 2, 4, 8,
+        ]
+        assert client.connect.call_count == 4
+
+    def test_stop_during_backoff(self) -> None:
+        """Setting stop_event ends the wait before reconnecting."""
+        client = _make_client()
+        client.client.select_folder.side_effect = OSError("down")
+        client.connect = MagicMock()
+        stop = MagicMock()
+        stop.is_set.return_value = False
+        stop.wait.return_value = True
+
+        client.watch_folder(lambda msg: True, stop_event=stop)
+
+        client.connect.assert_not_called()
+
+    def test_disconnects_session_it_opened(self) -> None:
+        """A watch that connected itself disconnects on return."""
+        client = _make_client()
+        session = client.client
+        client.client = None
+        stop = threading.Event()
+        session.idle_check.side_effect = lambda timeout: stop.set() or []
+
+        def connect():
+            client.client = session
+            return True
+
+        client.connect = connect
+
+        client.watch_folder(lambda msg: True, stop_event=stop)
+
+        session.logout.assert_called_once()
+        assert client.client is None